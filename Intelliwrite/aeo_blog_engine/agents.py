@@ -1,3 +1,6 @@
+import hashlib
+import threading
+
 from agno.agent import Agent
 from agno.models.google import Gemini
 # from agno.tools.duckduckgo import DuckDuckGo # Replaced with custom tool
@@ -14,29 +17,93 @@ AEO_GEO_RULEBOOK_KB = Knowledge(vector_db=get_knowledge_base())
 
 # --- Base / Helper Functions ---
 
+class AgentRegistry:
+    """
+    Process-wide cache of model clients and agents.
+
+    Model clients (and their HTTP connection pools) and agents are built once per
+    process and shared by every thread. Each run keeps its state in its own run output
+    and session, so the stage pools can call the same agent concurrently.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models = {}
+        self._agents = {}
+
+    def get_model(self, model_id: str, api_key: str):
+        key = (model_id, key_digest(api_key))
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = Gemini(id=model_id, api_key=api_key)
+                # Build the underlying client now so every agent shares the same one
+                model.get_client()
+                self._models[key] = model
+            return model
+
+    def get_agent(self, key, build):
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                agent = self._agents[key] = build()
+            return agent
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._agents.clear()
+
+
+def key_digest(api_key):
+    # Cache keys show up in reprs and debuggers, so they never hold the raw key
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+
+
+registry = AgentRegistry()
+
+
 def get_base_model():
-    return Gemini(
-        id=Config.MODEL_NAME,
-        api_key=Config.GEMINI_API_KEY
-    )
+    return registry.get_model(Config.MODEL_NAME, Config.GEMINI_API_KEY)
 
 def get_model(provider: str, model_id: str, api_key: str):
     # Regardless of provider, we now standardize on Gemini
-    return Gemini(
-        id=model_id,
-        api_key=api_key
-    )
+    return registry.get_model(model_id, api_key)
 
 def create_agent(name: str, system_instruction: str, tools: list = None, knowledge=None, model=None) -> Agent:
-    agent = Agent(
-        name=name,
-        model=model if model else get_base_model(),
-        instructions=[system_instruction],
-        tools=tools if tools else [],
-        knowledge=knowledge,
-        markdown=True,
+    model = model if model else get_base_model()
+    # Everything the agent is built from is part of the key, so two roles sharing a name
+    # (or a changed KB_RETRIEVAL_MODE) never get each other's agent. Tools are rebuilt on
+    # every call, so they are keyed by type; knowledge objects are long-lived singletons.
+    key = (
+        name,
+        model.id,
+        key_digest(model.api_key),
+        system_instruction,
+        tuple(type(tool).__qualname__ for tool in tools or []),
+        id(knowledge) if knowledge is not None else None,
+    )
+    return registry.get_agent(
+        key,
+        lambda: Agent(
+            name=name,
+            model=model,
+            instructions=[system_instruction],
+            tools=tools if tools else [],
+            knowledge=knowledge,
+            markdown=True,
+        ),
     )
-    return agent
+
+
+def get_stage_knowledge():
+    """
+    Knowledge for the planner, writer and optimizer agents. By default the pipeline retrieves
+    rulebook passages once per run and puts them in the prompt (see pipeline/kb_context.py),
+    so the agents only search the KB themselves when KB_RETRIEVAL_MODE=agent.
+    """
+    return AEO_GEO_RULEBOOK_KB if Config.KB_RETRIEVAL_MODE == "agent" else None
+
 # --- Agents ---
 
 def get_researcher_agent():
@@ -89,7 +156,7 @@ def get_planner_agent():
     Clear
     Minimal
     Strategic""",
-        knowledge=AEO_GEO_RULEBOOK_KB,
+        knowledge=get_stage_knowledge(),
         )
 def get_writer_agent():
     model = get_model(Config.WRITER_PROVIDER, Config.WRITER_MODEL, Config.WRITER_API_KEY)
@@ -137,7 +204,7 @@ def get_writer_agent():
                     Direct
                     Helpful
                     Easy to understand""",
-                        knowledge=AEO_GEO_RULEBOOK_KB,        )
+                        knowledge=get_stage_knowledge(),        )
 def get_optimizer_agent():
     model = get_model(Config.OPTIMIZER_PROVIDER, Config.OPTIMIZER_MODEL, Config.OPTIMIZER_API_KEY)
     return create_agent(
@@ -185,7 +252,7 @@ def get_optimizer_agent():
     Precise
     Minimal
     AEO-focused""",
-        knowledge=AEO_GEO_RULEBOOK_KB,
+        knowledge=get_stage_knowledge(),
         )
 def get_qa_agent():
     model = get_model(Config.QA_PROVIDER, Config.QA_MODEL, Config.QA_API_KEY)
@@ -444,3 +511,12 @@ def get_topic_generator_agent():
     """
     )
 
+def get_finalizer_agent():
+    return create_agent(
+        name="Final Editor Agent",
+        system_instruction="""You are the Final Editor. Your goal is to produce the final, publish-ready markdown file.
+            1. Take the Draft and apply the improvements from the Optimization Report.
+            2. Ensure the formatting is perfect Markdown.
+            3. STRICTLY output ONLY the blog content. No \"Here is the blog\" conversation.
+            """
+    )
@@ -1,4 +1,5 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+import json
 import os
 from werkzeug.utils import secure_filename
 
@@ -15,12 +16,17 @@ def root():
         "status": "AEO Blog Engine API is running",
         "endpoints": [
             "POST /blogs",
+            "POST /blogs/stream",
+            "POST /blogs/batch",
+            "GET /jobs/<id>",
             "GET /blogs/<id>",
+            "POST /blogs/<id>/resume",
             "GET /blogs/latest",
             "GET /blogs/latest/topic",
             "GET /blogs/latest/social",
             "POST /ingest",
-            "POST /generate-social"
+            "POST /generate-social",
+            "GET /cache/stats"
         ]
     })
 
@@ -47,9 +53,9 @@ def get_latest_blog_full():
     return jsonify(blog)
 
 
-@app.route("/blogs/latest/topic", methods=["GET"])
-def get_latest_blog_topic():
-    from aeo_blog_engine.services import fetch_blog_by_user
+def _latest_history(kinds):
+    """Shared body of the projected /blogs/latest/* endpoints; accepts optional `limit` and `since`."""
+    from aeo_blog_engine.services import fetch_blog_history
 
     user_id = request.args.get("user_id")
     company_url = request.args.get("company_url")
@@ -57,31 +63,42 @@ def get_latest_blog_topic():
     if not user_id or not company_url:
         return jsonify({"error": "Missing user_id or company_url parameters"}), 400
 
-    blog = fetch_blog_by_user(user_id, company_url)
-    if not blog:
+    limit = request.args.get("limit")
+    if limit is not None:
+        if not limit.isdigit():
+            return jsonify({"error": "'limit' must be a non-negative integer"}), 400
+        limit = int(limit)
+
+    try:
+        history = fetch_blog_history(user_id, company_url, kinds, limit=limit, since=request.args.get("since"))
+    except ValueError:
+        return jsonify({"error": "'since' must be an ISO-8601 date or time"}), 400
+    if history is None:
         return jsonify({"error": "Blog not found"}), 404
 
-    return jsonify({"topic": blog.get("topic", [])})
+    return jsonify(history)
+
+
+@app.route("/blogs/latest/topic", methods=["GET"])
+def get_latest_blog_topic():
+    return _latest_history(("topic",))
 
 
 @app.route("/blogs/latest/social", methods=["GET"])
 def get_latest_blog_social():
-    from aeo_blog_engine.services import fetch_blog_by_user
+    return _latest_history(("twitter_post", "linkedin_post", "reddit_post"))
 
-    user_id = request.args.get("user_id")
-    company_url = request.args.get("company_url")
 
-    if not user_id or not company_url:
-        return jsonify({"error": "Missing user_id or company_url parameters"}), 400
-
-    blog = fetch_blog_by_user(user_id, company_url)
-    if not blog:
-        return jsonify({"error": "Blog not found"}), 404
+@app.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    from aeo_blog_engine.knowledge.embedding_cache import get_query_embedding_cache
+    from aeo_blog_engine.pipeline.research_cache import get_research_cache
 
+    research_cache = get_research_cache()
+    query_embedding_cache = get_query_embedding_cache()
     return jsonify({
-        "twitter_post": blog.get("twitter_post", []),
-        "linkedin_post": blog.get("linkedin_post", []),
-        "reddit_post": blog.get("reddit_post", [])
+        "research": research_cache.stats() if research_cache else None,
+        "query_embeddings": query_embedding_cache.stats() if query_embedding_cache else None
     })
 
 
@@ -100,11 +117,12 @@ def ingest_knowledge():
                 file.save(path)
                 uploaded_files.append(filename)
 
-    ingest_docs()
+    summary = ingest_docs()
 
     return jsonify({
         "status": "success",
-        "uploaded_files": uploaded_files
+        "uploaded_files": uploaded_files,
+        "ingest": summary
     }), 200
 
 
@@ -113,18 +131,153 @@ def create_blog():
     from aeo_blog_engine.services import generate_and_store_blog
 
     data = request.get_json(force=True)
+
+    # Async mode: queue the job and return immediately with the PENDING blog id
+    if data.get("async") or request.args.get("async", "").lower() in ("1", "true"):
+        from aeo_blog_engine.config.settings import Config
+        from aeo_blog_engine.jobs import get_worker_pool
+        from aeo_blog_engine.services import submit_blog_job
+
+        job = submit_blog_job(data)
+        if Config.JOB_INLINE_WORKERS:
+            pool = get_worker_pool()
+            pool.start()
+            pool.notify()
+
+        job["status_url"] = f"/jobs/{job['job_id']}"
+        return jsonify(job), 202
+
     result = generate_and_store_blog(data)
     return jsonify(result), 201
 
 
+@app.route("/blogs/batch", methods=["POST"])
+def create_blogs_batch():
+    from aeo_blog_engine.services import generate_and_store_blogs, submit_blog_jobs
+
+    data = request.get_json(force=True)
+
+    # Accepts a list of payloads, or {"items": [...], ...shared fields}.
+    # Items may be plain topic strings when the shared fields carry user_id/company_url.
+    if isinstance(data, list):
+        items, shared, max_concurrency, wait = data, {}, None, False
+    else:
+        items = data.get("items", [])
+        max_concurrency = data.get("max_concurrency")
+        wait = bool(data.get("wait"))
+        shared = {k: v for k, v in data.items() if k not in ("items", "max_concurrency", "wait")}
+
+    if max_concurrency is not None and (
+        isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int) or max_concurrency < 1
+    ):
+        return jsonify({"error": "'max_concurrency' must be a positive integer"}), 400
+
+    wait = wait or request.args.get("wait", "").lower() in ("1", "true")
+    if max_concurrency is not None and not wait:
+        # Queued jobs are paced by JOB_WORKERS and BATCH_PER_USER_LIMIT instead
+        return jsonify({"error": "'max_concurrency' is only supported with 'wait': true"}), 400
+
+    payloads = [
+        {**shared, **(item if isinstance(item, dict) else {"topic": item})}
+        for item in items
+    ]
+    if not payloads:
+        return jsonify({"error": "No items provided"}), 400
+
+    # Synchronous mode runs every pipeline inside this request; only for small batches
+    if wait:
+        try:
+            results = generate_and_store_blogs(payloads, max_concurrency=max_concurrency)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        return jsonify({
+            "completed": sum(1 for r in results if r["status"] == "COMPLETED"),
+            "failed": sum(1 for r in results if r["status"] == "FAILED"),
+            "results": results
+        }), 200
+
+    # Default: queue one job per item, like POST /blogs with "async": true
+    from aeo_blog_engine.config.settings import Config
+    from aeo_blog_engine.jobs import get_worker_pool
+
+    try:
+        jobs = submit_blog_jobs(payloads)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if Config.JOB_INLINE_WORKERS:
+        pool = get_worker_pool()
+        pool.start()
+        pool.notify()
+
+    for job in jobs:
+        if "job_id" in job:
+            job["status_url"] = f"/jobs/{job['job_id']}"
+    return jsonify({
+        "queued": sum(1 for job in jobs if "job_id" in job),
+        "failed": sum(1 for job in jobs if job["status"] == "FAILED"),
+        "jobs": jobs
+    }), 202
+
+
+@app.route("/blogs/stream", methods=["POST"])
+def stream_blog():
+    from aeo_blog_engine.services import stream_and_store_blog
+
+    data = request.get_json(force=True)
+    events = stream_and_store_blog(data)
+
+    def generate():
+        for event in events:
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.route("/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    from aeo_blog_engine.services import fetch_blog_job
+
+    job = fetch_blog_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
 @app.route("/generate-social", methods=["POST"])
 def generate_social_post():
     from aeo_blog_engine.pipeline.blog_workflow import AEOBlogPipeline
-    from aeo_blog_engine.services import store_social_post
+    from aeo_blog_engine.services import store_social_post, store_social_posts
 
     data = request.get_json(force=True)
 
     pipeline = AEOBlogPipeline()
+
+    # Bundle mode: {"platforms": ["reddit", "linkedin", ...]} shares one research pass
+    if data.get("platforms"):
+        posts = pipeline.run_social_bundle(data["topic"], data["platforms"])
+
+        saved = store_social_posts(
+            data["user_id"],
+            data["company_url"],
+            data["topic"],
+            posts
+        )
+
+        return jsonify({
+            "status": "success",
+            "content": posts,
+            "blog": saved
+        }), 200
+
     post_content = pipeline.run_social_post(
         data["topic"], data["platform"]
     )
@@ -153,3 +306,26 @@ def get_blog(blog_id):
         if not blog:
             return jsonify({"error": "Blog not found"}), 404
         return jsonify(blog.to_dict())
+
+
+@app.route("/blogs/<int:blog_id>/resume", methods=["POST"])
+def resume_blog(blog_id):
+    from aeo_blog_engine.pipeline.stages import PROFILES
+    from aeo_blog_engine.services import BlogNotResumable, resume_blog as resume_blog_run
+
+    data = request.get_json(silent=True) or {}
+    profile = data.get("profile")
+    if profile and profile not in PROFILES:
+        return jsonify({"error": f"Unknown pipeline profile: '{profile}'"}), 400
+    # Optional: which of the blog's topics to resume; defaults to the latest unfinished run
+    topic = data.get("topic")
+    if topic is not None and (not isinstance(topic, str) or not topic.strip()):
+        return jsonify({"error": "'topic' must be a non-empty string"}), 400
+
+    try:
+        result = resume_blog_run(blog_id, profile=profile, topic=topic.strip() if topic else None)
+    except BlogNotResumable as exc:
+        return jsonify({"error": str(exc)}), 409
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 404
+    return jsonify(result), 200
@@ -0,0 +1,67 @@
+"""
+Measures per-stage agent setup time with and without the agent registry.
+
+Only construction is timed (model, HTTP client and Agent objects); no LLM calls are made,
+so the savings from reused TLS connections come on top of these numbers.
+
+Usage:
+    python -m aeo_blog_engine.benchmarks.agent_registry --iterations 50
+"""
+import argparse
+import os
+import statistics
+import time
+
+# Construction needs a key but never talks to the API
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+os.environ.setdefault("QDRANT_URL", ":memory:")
+
+from aeo_blog_engine import agents  # noqa: E402
+
+STAGE_FACTORIES = {
+    "research": agents.get_researcher_agent,
+    "plan": agents.get_planner_agent,
+    "write": agents.get_writer_agent,
+    "optimize": agents.get_optimizer_agent,
+    "finalize": agents.get_finalizer_agent,
+}
+
+
+def _time_stages(iterations: int, cold: bool):
+    timings = {stage: [] for stage in STAGE_FACTORIES}
+    for _ in range(iterations):
+        for stage, factory in STAGE_FACTORIES.items():
+            if cold:
+                # Equivalent to the old behaviour: every stage builds its own model and client
+                agents.registry.clear()
+            start = time.perf_counter()
+            factory()
+            timings[stage].append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent registry setup-time benchmark")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    # Prime imports and lazy module state so the first cold run is not penalized
+    _time_stages(1, cold=True)
+
+    cold = _time_stages(args.iterations, cold=True)
+    agents.registry.clear()
+    warm = _time_stages(args.iterations, cold=False)
+
+    print(f"{'stage':<10} {'cold ms':>10} {'registry ms':>12} {'saved ms':>10}")
+    total_cold = total_warm = 0.0
+    for stage in STAGE_FACTORIES:
+        cold_ms = statistics.median(cold[stage])
+        warm_ms = statistics.median(warm[stage])
+        total_cold += cold_ms
+        total_warm += warm_ms
+        print(f"{stage:<10} {cold_ms:>10.3f} {warm_ms:>12.3f} {cold_ms - warm_ms:>10.3f}")
+    print(f"{'total':<10} {total_cold:>10.3f} {total_warm:>12.3f} {total_cold - total_warm:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
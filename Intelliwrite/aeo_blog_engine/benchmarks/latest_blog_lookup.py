@@ -0,0 +1,129 @@
+"""
+Measures the latest-blog lookup (get_blog_by_user_and_company) before and after the
+composite (user_id, company_url, created_at DESC) index of migration 0005.
+
+Seeds a scratch database (a temporary SQLite file unless --database-url is given), times
+random lookups without the index, applies the migrations, and times them again. Every
+table of that database is dropped first, so a non-SQLite URL also needs --i-know.
+
+Usage:
+    python -m aeo_blog_engine.benchmarks.latest_blog_lookup --rows 200000 --queries 500
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+_scratch = os.path.join(tempfile.gettempdir(), "aeo_latest_blog_benchmark.sqlite3")
+# Construction needs a key but never talks to the API
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+os.environ.setdefault("QDRANT_URL", ":memory:")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from aeo_blog_engine.database import migrations  # noqa: E402
+from aeo_blog_engine.database.models import Base, Blog  # noqa: E402
+from aeo_blog_engine.database.repository import get_blog_by_user_and_company  # noqa: E402
+
+INDEX_NAME = "ix_blogs_user_company_created"
+
+
+def _seed(engine, rows: int, users: int, companies: int):
+    base = datetime.now(timezone.utc) - timedelta(days=365)
+    batch = []
+    with engine.begin() as connection:
+        for index in range(rows):
+            batch.append({
+                "user_id": f"user-{index % users}",
+                "company_url": f"https://company-{(index // users) % companies}.example",
+                "created_at": base + timedelta(seconds=index),
+                "blog": [],
+                "topic": [],
+                "status": "COMPLETED",
+            })
+            if len(batch) == 10000:
+                connection.execute(Blog.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(Blog.__table__.insert(), batch)
+
+
+def _plan(engine) -> str:
+    query = (
+        "SELECT id FROM blogs WHERE user_id = 'user-1' AND company_url = 'https://company-0.example' "
+        "ORDER BY created_at DESC LIMIT 1"
+    )
+    explain = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as connection:
+        return "\n".join("    " + " ".join(str(value) for value in row) for row in connection.execute(text(explain + query)))
+
+
+def _time_lookups(engine, keys, queries: int):
+    Session = sessionmaker(bind=engine)
+    timings = []
+    with Session() as session:
+        for user_id, company_url in random.Random(7).choices(keys, k=queries):
+            start = time.perf_counter()
+            get_blog_by_user_and_company(session, user_id=user_id, company_url=company_url)
+            timings.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latest-blog lookup benchmark")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--companies", type=int, default=3, help="Companies per user")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument(
+        "--database-url",
+        help="Scratch database to use; ALL of its application tables are dropped and the blogs table reseeded",
+    )
+    parser.add_argument(
+        "--i-know", action="store_true",
+        help="Allow a non-SQLite --database-url (its tables are dropped)",
+    )
+    args = parser.parse_args()
+
+    if args.database_url and not args.database_url.startswith("sqlite") and not args.i_know:
+        parser.error(
+            "--database-url is not SQLite; every application table in it will be dropped. "
+            "Pass --i-know if it is a scratch database."
+        )
+
+    if not args.database_url and os.path.exists(_scratch):
+        os.remove(_scratch)
+    engine = create_engine(args.database_url or f"sqlite:///{_scratch}")
+
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        # create_all adds the index for new tables; start from a table that predates it
+        connection.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+
+    print(f"Seeding {args.rows} blogs...")
+    _seed(engine, args.rows, args.users, args.companies)
+    keys = [(f"user-{u}", f"https://company-{c}.example") for u in range(args.users) for c in range(args.companies)]
+
+    before = _time_lookups(engine, keys, args.queries)
+    print(f"\nWithout index:\n{_plan(engine)}")
+    migrations.upgrade(engine)
+    after = _time_lookups(engine, keys, args.queries)
+    print(f"\nWith {INDEX_NAME}:\n{_plan(engine)}")
+
+    print(f"\n{'':<14} {'median ms':>10} {'p95 ms':>10}")
+    print(f"{'without index':<14} {before[0]:>10.3f} {before[1]:>10.3f}")
+    print(f"{'with index':<14} {after[0]:>10.3f} {after[1]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import warnings
 from dotenv import load_dotenv
 from pathlib import Path
@@ -87,3 +88,123 @@ class Config:
     QA_PROVIDER = DEFAULT_LLM_PROVIDER
     QA_MODEL = _normalize_gemini_model(os.getenv("QA_MODEL", DEFAULT_LLM_MODEL))
     QA_API_KEY = DEFAULT_LLM_API_KEY
+
+    # Research cache (shared by blog and social pipelines)
+    # Backend: "memory" (per process), "sqlite" (shared across workers on one box) or "none"
+    RESEARCH_CACHE_BACKEND = os.getenv("RESEARCH_CACHE_BACKEND", "memory").lower()
+    RESEARCH_CACHE_TTL = int(os.getenv("RESEARCH_CACHE_TTL", "3600"))
+    RESEARCH_CACHE_MAX_ENTRIES = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "256"))
+    RESEARCH_CACHE_PATH = os.getenv(
+        "RESEARCH_CACHE_PATH", os.path.join(tempfile.gettempdir(), "aeo_research_cache.sqlite3")
+    )
+
+    # Where blog history (blog bodies, topics, social posts) is kept: "columns" (JSON lists in
+    # the blogs row) or "table" (one blog_entries row per item; run migrate_blog_entries.py
+    # first, then again with --clear-columns once the mode is switched)
+    BLOG_ENTRY_STORAGE = os.getenv("BLOG_ENTRY_STORAGE", "columns").lower()
+    # Seconds the blogs column types are cached for; a migration run by another process is
+    # picked up within this interval
+    SCHEMA_CACHE_TTL = float(os.getenv("SCHEMA_CACHE_TTL", "300"))
+
+    # Compression of stored blog bodies, in either BLOG_ENTRY_STORAGE mode: "none", "zlib" or
+    # "zstd" (needs zstandard). Existing rows keep decoding either way; recompress_blogs.py
+    # rewrites them in the current mode.
+    BLOG_COMPRESSION = os.getenv("BLOG_COMPRESSION", "none").lower()
+    BLOG_COMPRESSION_LEVEL = int(os.getenv("BLOG_COMPRESSION_LEVEL", "0")) or None
+    BLOG_COMPRESSION_MIN_CHARS = int(os.getenv("BLOG_COMPRESSION_MIN_CHARS", "512"))
+
+    # Asynchronous blog jobs (POST /blogs with "async": true)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+    # RUNNING jobs with no progress for this many seconds are assumed orphaned and re-queued
+    JOB_STALE_AFTER = int(os.getenv("JOB_STALE_AFTER", "1800"))
+    # Run workers inside the API process; disable when using `python -m aeo_blog_engine.jobs`
+    JOB_INLINE_WORKERS = os.getenv("JOB_INLINE_WORKERS", "true").lower() == "true"
+
+    # Batch blog generation (POST /blogs/batch)
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    # Pipelines a single user may have running at once: across all synchronous batches in this
+    # process, and across all queued jobs claimed by the workers
+    BATCH_PER_USER_LIMIT = int(os.getenv("BATCH_PER_USER_LIMIT", "2"))
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+
+    # Token budgets for the variable context pasted into each stage prompt
+    CONTEXT_BUDGET_ENABLED = os.getenv("CONTEXT_BUDGET_ENABLED", "true").lower() == "true"
+    CONTEXT_BUDGETS = {
+        "plan": int(os.getenv("CONTEXT_BUDGET_PLAN", "3000")),
+        "write": int(os.getenv("CONTEXT_BUDGET_WRITE", "4000")),
+        "optimize": int(os.getenv("CONTEXT_BUDGET_OPTIMIZE", "6000")),
+        "qa": int(os.getenv("CONTEXT_BUDGET_QA", "7000")),
+        "finalize": int(os.getenv("CONTEXT_BUDGET_FINALIZE", "7000")),
+    }
+    # Shrinking never takes a part below this, even when the fixed parts (the draft) alone
+    # exceed the budget; what is left over is reported as the stage's overflow
+    CONTEXT_PART_MIN_TOKENS = int(os.getenv("CONTEXT_PART_MIN_TOKENS", "400"))
+
+    # Rulebook retrieval for blog stages: "shared" searches the knowledge base once per run
+    # (per distinct need) and injects the passages into stage prompts; "agent" lets the
+    # planner, writer and optimizer agents search it themselves
+    KB_RETRIEVAL_MODE = os.getenv("KB_RETRIEVAL_MODE", "shared").lower()
+    KB_PASSAGES_PER_NEED = int(os.getenv("KB_PASSAGES_PER_NEED", "3"))
+
+    # Default blog pipeline profile: fast | standard | thorough (see pipeline/stages.py)
+    PIPELINE_PROFILE = os.getenv("PIPELINE_PROFILE", "standard")
+
+    # Writer mode: "single" writes the blog in one call; "sections" writes each H2 of the
+    # outline with concurrent writer calls and stitches them in outline order
+    WRITER_MODE = os.getenv("WRITER_MODE", "single")
+    WRITER_SECTION_CONCURRENCY = int(os.getenv("WRITER_SECTION_CONCURRENCY", "6"))
+
+    # Knowledge-base ingestion: documents are split into chunks of at most CHUNK_SIZE
+    # characters, consecutive chunks of a section sharing about CHUNK_OVERLAP characters
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1500"))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+    # PDF text extraction runs in a process pool, split into page ranges for large files
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "25"))
+    # Seconds before a single PDF is given up on (it is retried on the next ingest)
+    PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "120"))
+    # Chunks embedded and upserted per batch; bounds ingestion memory
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "256"))
+    # Where ingestion records what is already embedded; defaults to <tmp>/aeo_ingest_manifest.<collection>.json
+    INGEST_MANIFEST_PATH = os.getenv("INGEST_MANIFEST_PATH")
+
+    # Batched embedding during ingestion
+    EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+    EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+    # Embedding requests started per minute across all batches; 0 disables the limiter
+    EMBED_REQUESTS_PER_MINUTE = int(os.getenv("EMBED_REQUESTS_PER_MINUTE", "100"))
+    EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "5"))
+    EMBED_RETRY_BASE_DELAY = float(os.getenv("EMBED_RETRY_BASE_DELAY", "1"))
+
+    # On-disk cache of the BM25 index used by the in-memory knowledge fallback
+    LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", os.path.join(tempfile.gettempdir(), "aeo_bm25_index.npz"))
+    # Seconds between checks of knowledge/docs for changes that need the index rebuilt
+    LEXICAL_INDEX_CHECK_INTERVAL = float(os.getenv("LEXICAL_INDEX_CHECK_INTERVAL", "10"))
+
+    # Vector backend: "qdrant" or "local" (NumPy store on disk, see knowledge/vector_store.py)
+    VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "qdrant").lower()
+    # Directory of the local vector store
+    LOCAL_VECTOR_STORE_PATH = os.getenv(
+        "LOCAL_VECTOR_STORE_PATH", os.path.join(tempfile.gettempdir(), "aeo_vector_store")
+    )
+    # Also write ingested embeddings to the local store, which then serves search when Qdrant is down
+    LOCAL_VECTOR_MIRROR = os.getenv("LOCAL_VECTOR_MIRROR", "true").lower() == "true"
+
+    # Hybrid retrieval: dense hits fused with BM25 hits by reciprocal-rank fusion, then reranked
+    # locally. KB_RERANKER: "phrase" (term/phrase overlap), "cross-encoder" (needs
+    # sentence-transformers) or "none"
+    KB_HYBRID_ENABLED = os.getenv("KB_HYBRID_ENABLED", "true").lower() == "true"
+    KB_HYBRID_CANDIDATES = int(os.getenv("KB_HYBRID_CANDIDATES", "20"))
+    KB_RRF_K = int(os.getenv("KB_RRF_K", "60"))
+    KB_RERANKER = os.getenv("KB_RERANKER", "phrase").lower()
+    KB_RERANKER_MODEL = os.getenv("KB_RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+    # Cache of query -> embedding for knowledge-base searches: a per-process LRU of
+    # QUERY_EMBEDDING_CACHE_SIZE entries over a shared SQLite store (empty path = memory only)
+    QUERY_EMBEDDING_CACHE_ENABLED = os.getenv("QUERY_EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", "20000"))
+    QUERY_EMBEDDING_CACHE_PATH = os.getenv(
+        "QUERY_EMBEDDING_CACHE_PATH", os.path.join(tempfile.gettempdir(), "aeo_query_embeddings.sqlite3")
+    )
@@ -1,19 +1,47 @@
-from aeo_blog_engine.database.session import get_session
-from aeo_blog_engine.database.models import Blog
+from aeo_blog_engine.database.session import get_session, init_db
+from aeo_blog_engine.database.models import Blog, BlogEntry, BlogJob, PipelineCheckpoint
 from aeo_blog_engine.database.repository import (
+    add_blog_entry,
+    add_topic_if_new,
     append_social_post,
+    claim_blog_for_resume,
+    claim_next_blog_job,
     create_blog_entry,
+    create_blog_job,
+    delete_pipeline_checkpoints,
     get_blog_by_id,
     get_blog_by_user_and_company,
+    get_blog_history,
+    get_blog_job,
+    get_pipeline_checkpoints,
+    requeue_stale_blog_jobs,
+    save_pipeline_checkpoint,
+    update_blog_job,
     update_blog_status,
 )
 
 __all__ = [
     "get_session",
+    "init_db",
     "Blog",
+    "BlogEntry",
+    "BlogJob",
+    "PipelineCheckpoint",
+    "add_blog_entry",
+    "add_topic_if_new",
     "append_social_post",
+    "claim_blog_for_resume",
+    "claim_next_blog_job",
     "create_blog_entry",
+    "create_blog_job",
+    "delete_pipeline_checkpoints",
     "get_blog_by_id",
     "get_blog_by_user_and_company",
+    "get_blog_history",
+    "get_blog_job",
+    "get_pipeline_checkpoints",
+    "requeue_stale_blog_jobs",
+    "save_pipeline_checkpoint",
+    "update_blog_job",
     "update_blog_status",
 ]
@@ -0,0 +1,75 @@
+import base64
+import zlib
+from typing import Dict, Optional
+
+from aeo_blog_engine.config.settings import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compressed history items carry this key instead of "content". Its value is
+# "<format version>:<codec>:<base85 payload>", so plain items and rows written before
+# compression was enabled decode unchanged.
+COMPRESSED_KEY = "zcontent"
+FORMAT_VERSION = "1"
+CODECS = ("zlib", "zstd")
+
+
+def storage_codec() -> Optional[str]:
+    """The codec new blog bodies are written with (BLOG_COMPRESSION), or None when off."""
+    codec = Config.BLOG_COMPRESSION
+    if codec == "none":
+        return None
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported BLOG_COMPRESSION: {codec}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("BLOG_COMPRESSION=zstd needs the zstandard package")
+    return codec
+
+
+def compress_text(content: str, codec: str) -> str:
+    data = content.encode("utf-8")
+    if codec == "zstd":
+        payload = zstandard.ZstdCompressor(level=Config.BLOG_COMPRESSION_LEVEL or 3).compress(data)
+    else:
+        payload = zlib.compress(data, Config.BLOG_COMPRESSION_LEVEL or 6)
+    return f"{FORMAT_VERSION}:{codec}:{base64.b85encode(payload).decode('ascii')}"
+
+
+def decompress_text(value: str) -> str:
+    version, codec, payload = value.split(":", 2)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unknown compressed content format: {version}")
+    data = base64.b85decode(payload)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed blogs needs the zstandard package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        data = zlib.decompress(data)
+    else:
+        raise ValueError(f"Unknown compression codec: {codec}")
+    return data.decode("utf-8")
+
+
+def compress_entry(entry: Dict, codec: Optional[str]) -> Dict:
+    """Swaps a long string content for its compressed form, when that is actually smaller."""
+    content = entry.get("content")
+    if codec is None or not isinstance(content, str) or len(content) < Config.BLOG_COMPRESSION_MIN_CHARS:
+        return entry
+    compressed = compress_text(content, codec)
+    if len(compressed) >= len(content.encode("utf-8")):
+        return entry
+    packed = {key: value for key, value in entry.items() if key != "content"}
+    packed[COMPRESSED_KEY] = compressed
+    return packed
+
+
+def decompress_entry(item):
+    if isinstance(item, dict) and COMPRESSED_KEY in item:
+        entry = {key: value for key, value in item.items() if key != COMPRESSED_KEY}
+        entry["content"] = decompress_text(item[COMPRESSED_KEY])
+        return entry
+    return item
@@ -0,0 +1,6 @@
+"""Creates any tables of the current models that do not exist yet (what init_db() does)."""
+from aeo_blog_engine.database.models import Base
+
+
+def upgrade(connection):
+    Base.metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,12 @@
+"""Adds the social post columns to blogs tables created before they existed (was migrate_db.py)."""
+from sqlalchemy import text
+
+from aeo_blog_engine.database.migrations import columns
+
+
+def upgrade(connection):
+    existing = columns(connection, "blogs")
+    for column in ("twitter_post", "linkedin_post", "reddit_post"):
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE blogs ADD COLUMN {column} TEXT"))
+            print(f"Added {column} column.")
@@ -0,0 +1,12 @@
+"""Adds blogs.user_id, backfilling existing rows with 'legacy_user' (was force_migration.py)."""
+from sqlalchemy import text
+
+from aeo_blog_engine.database.migrations import columns
+
+
+def upgrade(connection):
+    if "user_id" in columns(connection, "blogs"):
+        return
+    connection.execute(text("ALTER TABLE blogs ADD COLUMN user_id TEXT"))
+    connection.execute(text("UPDATE blogs SET user_id = 'legacy_user' WHERE user_id IS NULL"))
+    print("Added user_id column and backfilled existing rows.")
@@ -0,0 +1,13 @@
+"""Drops NOT NULL from blogs.blog on Postgres (was relax_column.py); SQLite tables are left as they are."""
+from sqlalchemy import text
+
+from aeo_blog_engine.database.migrations import columns
+
+
+def upgrade(connection):
+    if connection.dialect.name != "postgresql":
+        return
+    column = columns(connection, "blogs").get("blog")
+    if column is not None and not column["nullable"]:
+        connection.execute(text("ALTER TABLE blogs ALTER COLUMN blog DROP NOT NULL"))
+        print("Dropped NOT NULL on blogs.blog.")
@@ -0,0 +1,36 @@
+"""
+Composite index for the latest-blog lookup (get_blog_by_user_and_company): equality on
+user_id + company_url, newest created_at first, so the query reads one index entry instead
+of scanning and sorting every blog of the table.
+"""
+from sqlalchemy import text
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction
+TRANSACTIONAL = False
+
+
+INDEX_NAME = "ix_blogs_user_company_created"
+
+
+def _drop_invalid_index(connection):
+    """
+    A CREATE INDEX CONCURRENTLY that failed or was interrupted leaves an INVALID index
+    behind, which IF NOT EXISTS would then keep forever; drop it so it is rebuilt.
+    """
+    valid = connection.execute(text(
+        "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND pg_catalog.pg_table_is_visible(c.oid)"
+    ), {"name": INDEX_NAME}).scalar()
+    if valid is False:
+        print(f"Rebuilding invalid index {INDEX_NAME}.")
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}"))
+
+
+def upgrade(connection):
+    concurrently = "CONCURRENTLY " if connection.dialect.name == "postgresql" else ""
+    if connection.dialect.name == "postgresql":
+        _drop_invalid_index(connection)
+    connection.execute(text(
+        f"CREATE INDEX {concurrently}IF NOT EXISTS {INDEX_NAME} "
+        "ON blogs (user_id, company_url, created_at DESC)"
+    ))
@@ -0,0 +1,44 @@
+"""
+Converts the blog history columns to JSONB on Postgres, so entries can be appended with one
+UPDATE (`col || jsonb_build_array(...)`) instead of a read-modify-write. Values that are not
+JSON lists are wrapped the way JSONList reads them. SQLite keeps its JSON text columns.
+"""
+from sqlalchemy import text
+
+from aeo_blog_engine.database.migrations import columns
+
+HISTORY_COLUMNS = ("blog", "topic", "twitter_post", "linkedin_post", "reddit_post")
+
+TO_JSONB_LIST = """
+CREATE FUNCTION pg_temp.aeo_jsonb_list(value text) RETURNS jsonb AS $$
+DECLARE
+    parsed jsonb;
+BEGIN
+    IF value IS NULL OR value = '' THEN
+        RETURN '[]'::jsonb;
+    END IF;
+    BEGIN
+        parsed := value::jsonb;
+    EXCEPTION WHEN others THEN
+        RETURN jsonb_build_array(jsonb_build_object('content', value, 'timestamp', NULL));
+    END;
+    IF jsonb_typeof(parsed) <> 'array' THEN
+        RETURN jsonb_build_array(parsed);
+    END IF;
+    RETURN parsed;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade(connection):
+    if connection.dialect.name != "postgresql":
+        return
+    existing = columns(connection, "blogs")
+    pending = [name for name in HISTORY_COLUMNS if name in existing and "JSON" not in str(existing[name]["type"]).upper()]
+    if not pending:
+        return
+    connection.execute(text(TO_JSONB_LIST))
+    for name in pending:
+        connection.execute(text(f"ALTER TABLE blogs ALTER COLUMN {name} TYPE jsonb USING pg_temp.aeo_jsonb_list({name})"))
+        print(f"Converted blogs.{name} to JSONB.")
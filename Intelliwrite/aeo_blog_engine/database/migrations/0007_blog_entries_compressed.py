@@ -0,0 +1,11 @@
+"""Adds blog_entries.compressed, which marks blog bodies stored with BLOG_COMPRESSION in "table" mode."""
+from sqlalchemy import text
+
+from aeo_blog_engine.database.migrations import columns
+
+
+def upgrade(connection):
+    existing = columns(connection, "blog_entries")
+    if existing and "compressed" not in existing:
+        connection.execute(text("ALTER TABLE blog_entries ADD COLUMN compressed BOOLEAN NOT NULL DEFAULT FALSE"))
+        print("Added blog_entries.compressed column.")
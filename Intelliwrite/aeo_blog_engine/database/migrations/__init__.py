@@ -0,0 +1,96 @@
+"""
+Versioned schema migrations.
+
+Each module in this package named `NNNN_description.py` defines `upgrade(connection)`, and
+may set `TRANSACTIONAL = False` when its statements cannot run inside a transaction (e.g.
+Postgres CREATE INDEX CONCURRENTLY). Applied versions are recorded in `schema_migrations`,
+so running
+
+    python -m aeo_blog_engine.database.migrations upgrade
+
+applies only what is pending. Migrations check the schema before changing it, so databases
+set up by the old ad-hoc scripts or by init_db() upgrade cleanly.
+"""
+import importlib
+import pkgutil
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, MetaData, String, Table, TIMESTAMP, func, inspect, select
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", TIMESTAMP(timezone=True), nullable=False, server_default=func.now()),
+)
+
+
+def available() -> List[Tuple[str, str, object]]:
+    """(version, name, module) of every migration in this package, in version order."""
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        version, _, name = info.name.partition("_")
+        if version.isdigit():
+            migrations.append((version, name, importlib.import_module(f"{__name__}.{info.name}")))
+    return sorted(migrations, key=lambda item: item[0])
+
+
+def _engine(engine):
+    if engine is not None:
+        return engine
+    from aeo_blog_engine.database.session import engine as default_engine
+    return default_engine
+
+
+def applied(engine=None) -> set:
+    engine = _engine(engine)
+    with engine.begin() as connection:
+        _metadata.create_all(connection)
+        return {row.version for row in connection.execute(select(schema_migrations.c.version))}
+
+
+def upgrade(engine=None, target: Optional[str] = None) -> List[str]:
+    """Applies pending migrations up to `target` (inclusive; default all). Returns the versions applied."""
+    engine = _engine(engine)
+    done = applied(engine)
+    ran = []
+    for version, name, module in available():
+        if target is not None and version > target:
+            break
+        if version in done:
+            continue
+        print(f"Applying migration {version}_{name}...")
+        if getattr(module, "TRANSACTIONAL", True):
+            with engine.begin() as connection:
+                module.upgrade(connection)
+                connection.execute(schema_migrations.insert().values(version=version, name=name))
+        else:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                module.upgrade(connection)
+                connection.execute(schema_migrations.insert().values(version=version, name=name))
+        ran.append(version)
+    if ran:
+        from aeo_blog_engine.database.repository import clear_schema_cache
+        clear_schema_cache()
+    print(f"Schema is up to date ({len(ran)} migration(s) applied).")
+    return ran
+
+
+def status(engine=None) -> List[Tuple[str, str, bool]]:
+    done = applied(engine)
+    return [(version, name, version in done) for version, name, _ in available()]
+
+
+# --- Helpers for migration modules ---
+
+def has_table(connection, table: str) -> bool:
+    return inspect(connection).has_table(table)
+
+
+def columns(connection, table: str) -> dict:
+    """Column name -> column info for `table` ({} when the table does not exist)."""
+    if not has_table(connection, table):
+        return {}
+    return {column["name"]: column for column in inspect(connection).get_columns(table)}
@@ -0,0 +1,20 @@
+import argparse
+
+from aeo_blog_engine.database.migrations import status, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or inspect database schema migrations")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status"], default="upgrade")
+    parser.add_argument("--target", help="Stop after this migration version (e.g. 0003)")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for version, name, is_applied in status():
+            print(f"{version}  {'applied' if is_applied else 'pending':<8} {name}")
+        return
+    upgrade(target=args.target)
+
+
+if __name__ == "__main__":
+    main()
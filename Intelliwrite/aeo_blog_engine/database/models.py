@@ -1,10 +1,21 @@
 import json
+from collections import Counter
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, func
-from sqlalchemy.orm import declarative_base, validates
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text, TIMESTAMP, false, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import declarative_base, relationship, validates
 from sqlalchemy.types import TypeDecorator
 
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.database.compression import (
+    COMPRESSED_KEY,
+    compress_entry,
+    decompress_entry,
+    decompress_text,
+    storage_codec,
+)
+
 Base = declarative_base()
 
 
@@ -53,23 +64,84 @@ class JSONList(TypeDecorator):
     impl = Text
     cache_ok = True
 
-    def process_bind_param(self, value, dialect):
+    def __init__(self, *args, compress: bool = False, **kwargs):
+        # compress: store long item contents compressed with the BLOG_COMPRESSION codec
+        self.compress = compress
+        super().__init__(*args, **kwargs)
+
+    def encode_entry(self, entry):
+        """An item as it is stored (compressed when enabled for this column)."""
+        return compress_entry(entry, storage_codec()) if self.compress else entry
+
+    def _to_entries(self, value):
         if value is None:
             value = []
         if not isinstance(value, (list, tuple)):
             value = [value]
-        value = _ensure_entries(value)
-        return json.dumps(list(value))
+        return [self.encode_entry(entry) for entry in _ensure_entries(value)]
+
+    def process_bind_param(self, value, dialect):
+        return json.dumps(self._to_entries(value))
 
     def process_result_value(self, value, dialect):
         if not value:
             return []
-        try:
-            parsed = json.loads(value)
-            parsed = parsed if isinstance(parsed, list) else [parsed]
-        except json.JSONDecodeError:
-            parsed = [value]
-        return _ensure_entries(parsed)
+        if isinstance(value, (list, dict)):
+            # Already decoded by a native JSON column
+            parsed = value
+        else:
+            try:
+                parsed = json.loads(value)
+            except json.JSONDecodeError:
+                parsed = [value]
+        parsed = parsed if isinstance(parsed, list) else [parsed]
+        # Compressed items decode wherever they appear, whatever the current setting
+        return _ensure_entries([decompress_entry(item) for item in parsed])
+
+
+class JSONBList(JSONList):
+    """
+    JSONList for the blog history columns, which migration 0006 turns into JSONB on Postgres
+    so entries can be appended server-side in a single UPDATE (see repository._atomic_update).
+    On Postgres values are bound as JSONB, which columns not yet migrated store as text.
+    """
+
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == "postgresql":
+            # The JSONB type serializes the list itself
+            return self._to_entries(value)
+        return super().process_bind_param(value, dialect)
+
+
+# Blog history lists, by attribute name; in "table" storage mode each item is a BlogEntry row of that kind
+ENTRY_KINDS = ("blogs", "topic", "twitter_post", "linkedin_post", "reddit_post")
+
+
+def entry_table_enabled() -> bool:
+    return Config.BLOG_ENTRY_STORAGE == "table"
+
+
+def merge_legacy_entries(column_items, rows):
+    """
+    Column items followed by table rows, skipping column items that migrate_blog_entries.py
+    has already copied into blog_entries (same content and timestamp) but not yet cleared.
+    """
+    copied = Counter((entry["content"], entry.get("timestamp")) for entry in rows)
+    legacy = []
+    for entry in column_items:
+        key = (entry["content"], entry.get("timestamp"))
+        if copied[key]:
+            copied[key] -= 1
+        else:
+            legacy.append(entry)
+    return legacy + list(rows)
 
 
 class Blog(Base):
@@ -80,15 +152,18 @@ class Blog(Base):
     company_url = Column(Text, nullable=False)
     email_id = Column(Text)
     brand_name = Column(Text)
-    blogs = Column("blog", JSONList, nullable=False, default=list)
+    blogs = Column("blog", JSONBList(compress=True), nullable=False, default=list)
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
-    topic = Column(JSONList, nullable=True, default=list)
+    topic = Column(JSONBList, nullable=True, default=list)
     status = Column(String, nullable=False, server_default="PENDING")
 
     # Social Media Content
-    twitter_post = Column("twitter_post", JSONList, nullable=True, default=list)
-    linkedin_post = Column("linkedin_post", JSONList, nullable=True, default=list)
-    reddit_post = Column("reddit_post", JSONList, nullable=True, default=list)
+    twitter_post = Column("twitter_post", JSONBList, nullable=True, default=list)
+    linkedin_post = Column("linkedin_post", JSONBList, nullable=True, default=list)
+    reddit_post = Column("reddit_post", JSONBList, nullable=True, default=list)
+
+    # Append-only history rows (BLOG_ENTRY_STORAGE=table); queried on demand, never loaded whole for a write
+    entries = relationship("BlogEntry", lazy="dynamic", order_by="BlogEntry.id")
 
     @staticmethod
     def make_entry(content, timestamp=None, is_prompt=None):
@@ -120,18 +195,128 @@ class Blog(Base):
             return [entry]
         return []
 
+    def history(self, kinds=ENTRY_KINDS):
+        """
+        Compatibility layer over both storage modes: kind -> list of entries, oldest first.
+        In table mode, items still in the legacy JSON columns (not yet migrated) come first.
+        """
+        result = {kind: self.ensure_entries(getattr(self, kind)) for kind in kinds}
+        if entry_table_enabled() and self.id is not None:
+            rows = self.entries
+            if len(kinds) == 1:
+                rows = rows.filter(BlogEntry.kind == kinds[0])
+            by_kind = {kind: [] for kind in kinds}
+            for row in rows:
+                if row.kind in by_kind:
+                    by_kind[row.kind].append(row.to_entry())
+            result = {kind: merge_legacy_entries(result[kind], by_kind[kind]) for kind in kinds}
+        return result
+
+    def entries_for(self, kind: str):
+        return self.history((kind,))[kind]
+
     def to_dict(self):
+        history = self.history()
         return {
             "id": self.id,
             "user_id": self.user_id,
             "company_url": self.company_url,
             "email_id": self.email_id,
             "brand_name": self.brand_name,
-            "blogs": self.ensure_entries(self.blogs),
+            "blogs": history["blogs"],
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "topic": self.ensure_entries(self.topic),
+            "topic": history["topic"],
             "status": self.status,
-            "twitter_post": self.ensure_entries(self.twitter_post),
-            "linkedin_post": self.ensure_entries(self.linkedin_post),
-            "reddit_post": self.ensure_entries(self.reddit_post),
+            "twitter_post": history["twitter_post"],
+            "linkedin_post": history["linkedin_post"],
+            "reddit_post": history["reddit_post"],
         }
+
+
+# Backs get_blog_by_user_and_company (migration 0005 adds it to existing databases)
+Index("ix_blogs_user_company_created", Blog.user_id, Blog.company_url, Blog.created_at.desc())
+
+
+class BlogEntry(Base):
+    """One item of a blog's history (a blog body, topic or social post), stored as its own row."""
+
+    __tablename__ = "blog_entries"
+    __table_args__ = (Index("ix_blog_entries_blog_kind", "blog_id", "kind", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id"), nullable=False)
+    kind = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    # ISO-8601 string, exactly as in the JSON entries
+    timestamp = Column(Text)
+    is_prompt = Column(String)
+    # True when `content` holds the "1:<codec>:<payload>" form of database/compression.py
+    compressed = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    # Like the "columns" mode, only blog bodies are compressed, so topics stay comparable in SQL
+    COMPRESSED_KINDS = ("blogs",)
+
+    @classmethod
+    def build(cls, *, kind: str, content: str, **fields) -> "BlogEntry":
+        """A row for one history item, its content compressed with BLOG_COMPRESSION when that pays off."""
+        row = cls(kind=kind, **fields)
+        row.set_content(content)
+        return row
+
+    def set_content(self, content: str):
+        packed = compress_entry({"content": content}, storage_codec()) if self.kind in self.COMPRESSED_KINDS else {}
+        self.compressed = COMPRESSED_KEY in packed
+        self.content = packed[COMPRESSED_KEY] if self.compressed else content
+
+    def get_content(self) -> str:
+        return decompress_text(self.content) if self.compressed else self.content
+
+    def to_entry(self):
+        entry = {"content": self.get_content(), "timestamp": self.timestamp}
+        if self.is_prompt is not None:
+            entry["is_prompt"] = self.is_prompt
+        return entry
+
+
+class BlogJob(Base):
+    """Queue row for an asynchronous blog generation request."""
+
+    __tablename__ = "blog_jobs"
+
+    id = Column(Integer, primary_key=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id"), nullable=False)
+    payload = Column(Text, nullable=False)
+    status = Column(String, nullable=False, server_default="QUEUED")
+    stage = Column(String)
+    # Stage history: one entry per stage, timestamped when the stage started
+    stages = Column(JSONList, nullable=True, default=list)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "blog_id": self.blog_id,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": _ensure_entries(self.stages),
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class PipelineCheckpoint(Base):
+    """Output of one completed pipeline stage, kept until the blog is stored successfully."""
+
+    __tablename__ = "pipeline_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id"), nullable=False, index=True)
+    topic = Column(Text, nullable=False)
+    stage = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
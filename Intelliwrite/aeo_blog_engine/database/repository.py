@@ -1,6 +1,16 @@
-from typing import Optional
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from .models import Blog
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.orm.util import identity_key
+
+from aeo_blog_engine.config.settings import Config
+
+from .models import Blog, BlogEntry, BlogJob, PipelineCheckpoint, entry_table_enabled, merge_legacy_entries
+
+SOCIAL_KINDS = {"twitter": "twitter_post", "linkedin": "linkedin_post", "reddit": "reddit_post"}
 
 
 def get_blog_by_user_and_company(session, *, user_id: str, company_url: str) -> Optional[Blog]:
@@ -12,6 +22,209 @@ def get_blog_by_user_and_company(session, *, user_id: str, company_url: str) ->
     )
 
 
+def _since_key(since: Union[str, datetime, None]) -> Optional[str]:
+    """Normalises `since` to the UTC ISO-8601 form entry timestamps are stored in, so they compare as strings."""
+    if since is None or since == "":
+        return None
+    if isinstance(since, str):
+        since = datetime.fromisoformat(since.strip().replace("Z", "+00:00"))
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since.astimezone(timezone.utc).isoformat()
+
+
+def _select_entries(entries: List[Dict], limit: Optional[int], since: Optional[str]) -> List[Dict]:
+    if since is not None:
+        entries = [entry for entry in entries if entry.get("timestamp") and entry["timestamp"] >= since]
+    if limit is not None:
+        entries = entries[-limit:] if limit else []
+    return entries
+
+
+def get_blog_history(
+    session,
+    *,
+    user_id: str,
+    company_url: str,
+    kinds: Iterable[str],
+    limit: Optional[int] = None,
+    since: Union[str, datetime, None] = None,
+) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Projected read of the latest blog's history: kind -> entries (oldest first) for the
+    requested kinds only, without loading or decoding the rest of the row. `limit` keeps the
+    newest N entries per kind and `since` drops entries older than that time; in table mode
+    both are applied in SQL. Returns None when the user has no blog for the company.
+    """
+    kinds = list(kinds)
+    since_key = _since_key(since)
+    row = (
+        session.query(Blog.id, *[getattr(Blog, kind) for kind in kinds])
+        .filter(Blog.user_id == user_id, Blog.company_url == company_url)
+        .order_by(Blog.created_at.desc())
+        .first()
+    )
+    if row is None:
+        return None
+
+    history = {kind: Blog.ensure_entries(items) for kind, items in zip(kinds, row[1:])}
+    if entry_table_enabled():
+        for kind in kinds:
+            query = session.query(BlogEntry).filter(BlogEntry.blog_id == row.id, BlogEntry.kind == kind)
+            if since_key is not None:
+                query = query.filter(BlogEntry.timestamp >= since_key)
+            query = query.order_by(BlogEntry.id.desc())
+            if limit is not None:
+                query = query.limit(limit)
+            history[kind] = merge_legacy_entries(history[kind], [entry.to_entry() for entry in reversed(query.all())])
+    return {kind: _select_entries(entries, limit, since_key) for kind, entries in history.items()}
+
+
+def add_blog_entry(session, *, blog_id: int, kind: str, content: str, timestamp: str = None, is_prompt: Optional[str] = None) -> Optional[BlogEntry]:
+    """Appends one history item to the blog_entries table: a single-row INSERT."""
+    entry = Blog.make_entry(content, timestamp, is_prompt)
+    if entry is None:
+        return None
+    row = BlogEntry.build(blog_id=blog_id, kind=kind, content=entry["content"], timestamp=entry["timestamp"], is_prompt=is_prompt)
+    session.add(row)
+    return row
+
+
+def _column_name(kind: str) -> str:
+    return Blog.__mapper__.attrs[kind].columns[0].name
+
+
+def _append_sql(dialect: str, column: str, kind: str, unique: bool) -> Tuple[str, Optional[str]]:
+    """
+    SQL that appends the bound entry `:entry_<kind>` to a JSON list column, plus the WHERE
+    guard the row needs for it to be safe. With `unique`, nothing is appended when an item
+    with content `:content_<kind>` is already in the list.
+    """
+    if dialect == "postgresql":
+        current = f"COALESCE({column}, '[]'::jsonb)"
+        appended = f"{current} || jsonb_build_array(CAST(:entry_{kind} AS jsonb))"
+        if unique:
+            appended = (
+                f"CASE WHEN {current} @> jsonb_build_array(jsonb_build_object('content', CAST(:content_{kind} AS text))) "
+                f"THEN {column} ELSE {appended} END"
+            )
+        return appended, None
+
+    # SQLite (JSON1). Legacy rows holding something other than a JSON array are left to the
+    # Python path, which knows how to wrap them.
+    current = f"COALESCE(NULLIF({column}, ''), '[]')"
+    appended = f"json_insert({current}, '$[#]', json(:entry_{kind}))"
+    if unique:
+        appended = (
+            f"CASE WHEN EXISTS (SELECT 1 FROM json_each({current}) WHERE json_extract(value, '$.content') = :content_{kind}) "
+            f"THEN {column} ELSE {appended} END"
+        )
+    guard = f"({column} IS NULL OR {column} = '' OR (json_valid({column}) AND json_type({column}) = 'array'))"
+    return appended, guard
+
+
+# Database URL -> (checked at, history columns that are JSONB); Postgres only appends in SQL
+# once migration 0006 ran, which may happen in another process while this one is serving
+_jsonb_columns: Dict[str, Tuple[float, frozenset]] = {}
+
+
+def clear_schema_cache():
+    """Forgets the column types read by _native_json_columns, e.g. after running migrations."""
+    _jsonb_columns.clear()
+
+
+def _native_json_columns(session) -> frozenset:
+    bind = session.get_bind()
+    key = str(bind.url)
+    cached = _jsonb_columns.get(key)
+    if cached is None or time.monotonic() - cached[0] >= Config.SCHEMA_CACHE_TTL:
+        cached = _jsonb_columns[key] = (
+            time.monotonic(),
+            frozenset(
+                column["name"] for column in inspect(session.connection()).get_columns("blogs")
+                if "JSON" in str(column["type"]).upper()
+            ),
+        )
+    return cached[1]
+
+
+def _atomic_update(session, blog_id: int, values: Dict, appends: Dict[str, Tuple[Dict, bool]]) -> bool:
+    """
+    Sets `values` and appends entries to history columns ({kind: (entry, unique)}) in one
+    UPDATE, without reading the row first, so concurrent appends to the same blog cannot
+    overwrite each other. Returns False when the database cannot do it (no JSON support, a
+    legacy value in one of the columns, Postgres columns still TEXT because migration 0006
+    has not run, or no such row); the caller then falls back to a locked read-modify-write.
+    """
+    dialect = session.get_bind().dialect.name
+    if appends and dialect not in ("postgresql", "sqlite"):
+        return False
+    if appends and dialect == "postgresql":
+        native = _native_json_columns(session)
+        if any(_column_name(kind) not in native for kind in appends):
+            return False
+
+    assignments = [f"{name} = :value_{name}" for name in values]
+    params = {f"value_{name}": value for name, value in values.items()}
+    guards = []
+    for kind, (entry, unique) in appends.items():
+        column = _column_name(kind)
+        appended, guard = _append_sql(dialect, column, kind, unique)
+        assignments.append(f"{column} = {appended}")
+        params[f"entry_{kind}"] = json.dumps(Blog.__table__.c[column].type.encode_entry(entry))
+        params[f"content_{kind}"] = entry["content"]
+        if guard:
+            guards.append(guard)
+
+    statement = f"UPDATE blogs SET {', '.join(assignments)} WHERE {' AND '.join(['id = :blog_id'] + guards)}"
+    result = session.execute(text(statement), {**params, "blog_id": blog_id})
+    if result.rowcount != 1:
+        return False
+
+    # Loaded copies of the row are now stale for the columns written here
+    blog = session.identity_map.get(identity_key(Blog, blog_id))
+    if blog is not None:
+        session.expire(blog, [*values, *appends])
+    return True
+
+
+def _append_entry(session, blog: Blog, kind: str, content: str, is_prompt: Optional[str] = None, unique: bool = False):
+    """
+    Appends to one of the blog's history lists: a row in table mode, otherwise a single
+    server-side UPDATE of its JSON column (read-modify-write only where that is unsupported).
+    """
+    if entry_table_enabled():
+        add_blog_entry(session, blog_id=blog.id, kind=kind, content=content, is_prompt=is_prompt)
+        return
+    entry = Blog.make_entry(content, is_prompt=is_prompt)
+    if entry is None:
+        return
+    if _atomic_update(session, blog.id, {}, {kind: (entry, unique)}):
+        return
+    items = Blog.ensure_entries(getattr(blog, kind))
+    if unique and entry["content"] in Blog.entry_contents(items):
+        return
+    items.append(entry)
+    setattr(blog, kind, items)
+
+
+def add_topic_if_new(session, blog: Blog, topic: str, is_prompt: str = "false") -> bool:
+    """Tracks `topic` on the blog unless it is already there; returns whether it was added."""
+    known = topic in Blog.entry_contents(blog.topic)
+    if not known and entry_table_enabled():
+        session.flush()  # topics added earlier in this session count too
+        known = (
+            session.query(BlogEntry.id)
+            .filter(BlogEntry.blog_id == blog.id, BlogEntry.kind == "topic", BlogEntry.content == topic)
+            .first()
+        ) is not None
+    if known:
+        return False
+    # Re-checked in the UPDATE itself in case another request added it meanwhile
+    _append_entry(session, blog, "topic", topic, is_prompt, unique=True)
+    return True
+
+
 def create_blog_entry(
     session,
     *,
@@ -27,6 +240,16 @@ def create_blog_entry(
     reddit_post: Optional[str] = None,
     is_prompt: str = "false",
 ):
+    if entry_table_enabled():
+        entry = Blog(user_id=user_id, company_url=company_url, email_id=email_id, brand_name=brand_name, status=status)
+        session.add(entry)
+        session.flush()  # the entries reference the new id
+        add_blog_entry(session, blog_id=entry.id, kind="topic", content=topic or None, is_prompt=is_prompt)
+        for kind, content in (("blogs", blog), ("twitter_post", twitter_post), ("linkedin_post", linkedin_post), ("reddit_post", reddit_post)):
+            add_blog_entry(session, blog_id=entry.id, kind=kind, content=content or None)
+        session.flush()
+        return entry
+
     entry = Blog(
         user_id=user_id,
         topic=[Blog.make_entry(topic, is_prompt=is_prompt)] if topic else [],
@@ -44,28 +267,36 @@ def create_blog_entry(
     return entry
 
 
-def get_blog_by_id(session, blog_id):
-    return session.query(Blog).filter(Blog.id == blog_id).one_or_none()
+def get_blog_by_id(session, blog_id, for_update: bool = False):
+    query = session.query(Blog).filter(Blog.id == blog_id)
+    if for_update:
+        # Row lock so concurrent writers to the same blog append instead of overwriting
+        query = query.with_for_update()
+    return query.one_or_none()
 
 
 def update_blog_status(session, blog_id, *, status, blog_content=None, topic: Optional[str] = None, is_prompt: str = "false"):
-    blog = get_blog_by_id(session, blog_id)
+    if not entry_table_enabled():
+        appends = {}
+        if blog_content is not None:
+            entry = Blog.make_entry(blog_content)
+            if entry is not None:
+                appends["blogs"] = (entry, False)
+        if topic:
+            appends["topic"] = (Blog.make_entry(topic, is_prompt=is_prompt), True)
+        if _atomic_update(session, blog_id, {"status": status}, appends):
+            return session.get(Blog, blog_id)
+
+    blog = get_blog_by_id(session, blog_id, for_update=True)
     if not blog:
         raise ValueError(f"Blog with id {blog_id} not found")
 
     blog.status = status
     if blog_content is not None:
-        blogs = Blog.ensure_entries(blog.blogs)
-        entry = Blog.make_entry(blog_content)
-        blogs.append(entry)
-        blog.blogs = blogs
+        _append_entry(session, blog, "blogs", blog_content)
 
     if topic:
-        topics = Blog.ensure_entries(blog.topic)
-        contents = Blog.entry_contents(topics)
-        if topic not in contents:
-            topics.append(Blog.make_entry(topic, is_prompt=is_prompt))
-            blog.topic = topics
+        add_topic_if_new(session, blog, topic, is_prompt)
 
     session.add(blog)
     session.flush()
@@ -73,23 +304,158 @@ def update_blog_status(session, blog_id, *, status, blog_content=None, topic: Op
 
 
 def append_social_post(session, blog: Blog, platform: str, content: str):
-    platform = platform.lower()
-    entry = Blog.make_entry(content)
-    if platform == "twitter":
-        posts = Blog.ensure_entries(blog.twitter_post)
-        posts.append(entry)
-        blog.twitter_post = posts
-    elif platform == "linkedin":
-        posts = Blog.ensure_entries(blog.linkedin_post)
-        posts.append(entry)
-        blog.linkedin_post = posts
-    elif platform == "reddit":
-        posts = Blog.ensure_entries(blog.reddit_post)
-        posts.append(entry)
-        blog.reddit_post = posts
-    else:
+    kind = SOCIAL_KINDS.get(platform.lower())
+    if kind is None:
         raise ValueError(f"Unsupported platform for saving: {platform}")
+    _append_entry(session, blog, kind, content)
 
     session.add(blog)
     session.flush()
     return blog
+
+
+def create_blog_job(session, *, blog_id: int, payload: Dict) -> BlogJob:
+    job = BlogJob(blog_id=blog_id, payload=json.dumps(payload), status="QUEUED", attempts=0)
+    session.add(job)
+    session.flush()
+    return job
+
+
+def get_blog_job(session, job_id) -> Optional[BlogJob]:
+    return session.query(BlogJob).filter(BlogJob.id == job_id).one_or_none()
+
+
+def claim_blog_for_resume(session, blog_id: int, statuses: Iterable[str] = ("FAILED",)) -> bool:
+    """
+    Moves a blog in one of `statuses` to RUNNING for a resumed run. The conditional UPDATE
+    lets only one caller win, and refuses blogs that are still generating.
+    """
+    claimed = (
+        session.query(Blog)
+        .filter(Blog.id == blog_id, Blog.status.in_(tuple(statuses)))
+        .update({Blog.status: "RUNNING"}, synchronize_session=False)
+    )
+    if claimed:
+        blog = session.identity_map.get(identity_key(Blog, blog_id))
+        if blog is not None:
+            session.expire(blog, ["status"])
+    return bool(claimed)
+
+
+def _busy_users(per_user_limit: int):
+    """Users with at least `per_user_limit` RUNNING jobs."""
+    # Never correlated: the outer queries read the same tables
+    return (
+        select(Blog.user_id)
+        .join(BlogJob, BlogJob.blog_id == Blog.id)
+        .where(BlogJob.status == "RUNNING")
+        .group_by(Blog.user_id)
+        .having(func.count(BlogJob.id) >= per_user_limit)
+        .correlate(None)
+    )
+
+
+def _running_job_count(user_id: str):
+    return (
+        select(func.count(BlogJob.id))
+        .join(Blog, Blog.id == BlogJob.blog_id)
+        .where(Blog.user_id == user_id, BlogJob.status == "RUNNING")
+        .correlate(None)
+        .scalar_subquery()
+    )
+
+
+def claim_next_blog_job(session, per_user_limit: Optional[int] = None) -> Optional[BlogJob]:
+    """
+    Marks the oldest QUEUED job as RUNNING and returns it, or None when the queue is empty.
+    The conditional UPDATE makes the claim safe across concurrent workers on any backend.
+    With `per_user_limit`, jobs of users who already have that many RUNNING jobs are skipped.
+    """
+    while True:
+        query = (
+            session.query(BlogJob.id, Blog.user_id)
+            .join(Blog, Blog.id == BlogJob.blog_id)
+            .filter(BlogJob.status == "QUEUED")
+        )
+        if per_user_limit:
+            query = query.filter(Blog.user_id.notin_(_busy_users(per_user_limit)))
+        candidate = query.order_by(BlogJob.id).first()
+        if candidate is None:
+            return None
+
+        conditions = [BlogJob.id == candidate.id, BlogJob.status == "QUEUED"]
+        if per_user_limit:
+            # Re-checked in the UPDATE, so a slot taken since the SELECT is not overbooked
+            conditions.append(_running_job_count(candidate.user_id) < per_user_limit)
+        claimed = (
+            session.query(BlogJob)
+            .filter(*conditions)
+            .update(
+                {BlogJob.status: "RUNNING", BlogJob.attempts: BlogJob.attempts + 1},
+                synchronize_session=False,
+            )
+        )
+        if claimed:
+            session.flush()
+            return get_blog_job(session, candidate.id)
+
+
+def update_blog_job(session, job_id, *, status: Optional[str] = None, stage: Optional[str] = None, error: Optional[str] = None) -> BlogJob:
+    job = get_blog_job(session, job_id)
+    if not job:
+        raise ValueError(f"Job with id {job_id} not found")
+
+    if status is not None:
+        job.status = status
+    if stage is not None:
+        job.stage = stage
+        stages = Blog.ensure_entries(job.stages)
+        stages.append(Blog.make_entry(stage))
+        job.stages = stages
+    if error is not None:
+        job.error = error
+
+    session.add(job)
+    session.flush()
+    return job
+
+
+def requeue_stale_blog_jobs(session, *, older_than) -> int:
+    """Puts RUNNING jobs whose worker stopped reporting progress back on the queue."""
+    return (
+        session.query(BlogJob)
+        .filter(BlogJob.status == "RUNNING", BlogJob.updated_at < older_than)
+        .update({BlogJob.status: "QUEUED"}, synchronize_session=False)
+    )
+
+
+def save_pipeline_checkpoint(session, *, blog_id: int, topic: str, stage: str, content: str) -> PipelineCheckpoint:
+    checkpoint = (
+        session.query(PipelineCheckpoint)
+        .filter(
+            PipelineCheckpoint.blog_id == blog_id,
+            PipelineCheckpoint.topic == topic,
+            PipelineCheckpoint.stage == stage,
+        )
+        .one_or_none()
+    )
+    if checkpoint is None:
+        checkpoint = PipelineCheckpoint(blog_id=blog_id, topic=topic, stage=stage)
+    checkpoint.content = content
+    session.add(checkpoint)
+    session.flush()
+    return checkpoint
+
+
+def get_pipeline_checkpoints(session, *, blog_id: int, topic: Optional[str] = None):
+    query = session.query(PipelineCheckpoint).filter(PipelineCheckpoint.blog_id == blog_id)
+    if topic is not None:
+        query = query.filter(PipelineCheckpoint.topic == topic)
+    return query.order_by(PipelineCheckpoint.id).all()
+
+
+def delete_pipeline_checkpoints(session, *, blog_id: int, topic: Optional[str] = None) -> int:
+    query = session.query(PipelineCheckpoint).filter(PipelineCheckpoint.blog_id == blog_id)
+    if topic is not None:
+        query = query.filter(PipelineCheckpoint.topic == topic)
+    return query.delete(synchronize_session=False)
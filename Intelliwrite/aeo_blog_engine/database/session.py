@@ -4,6 +4,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.database.models import Base
 
 if not Config.DATABASE_URL:
     raise ValueError("DATABASE_URL must be set in environment variables")
@@ -23,3 +24,18 @@ def get_session():
         raise
     finally:
         session.close()
+
+
+_db_initialized = False
+
+
+def init_db():
+    """
+    Creates any missing tables (e.g. blog_jobs). Existing tables are left untouched; upgrade
+    them with `python -m aeo_blog_engine.database.migrations`.
+    """
+    global _db_initialized
+    if _db_initialized:
+        return
+    Base.metadata.create_all(bind=engine)
+    _db_initialized = True
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.database import claim_next_blog_job, get_session, init_db, requeue_stale_blog_jobs
+from aeo_blog_engine.services import run_blog_job
+
+
+class BlogJobWorkerPool:
+    """
+    Thread-based workers that drain the `blog_jobs` table.
+    Several processes may run a pool against the same database; claims are atomic.
+    A user's jobs are only claimed while they have fewer than BATCH_PER_USER_LIMIT running.
+    """
+
+    def __init__(self, workers: int = None, poll_interval: float = None):
+        self.workers = workers or Config.JOB_WORKERS
+        self.poll_interval = poll_interval or Config.JOB_POLL_INTERVAL
+        self._threads = []
+        self._lock = threading.Lock()
+        # One claim at a time per process, so two workers never both take a user's last slot
+        self._claim_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            init_db()
+            with get_session() as session:
+                stale_before = datetime.now(timezone.utc) - timedelta(seconds=Config.JOB_STALE_AFTER)
+                requeued = requeue_stale_blog_jobs(session, older_than=stale_before)
+            if requeued:
+                print(f"Re-queued {requeued} stale blog job(s).")
+
+            self._stopping.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"blog-job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            print(f"Started {self.workers} blog job worker(s).")
+
+    def notify(self):
+        """Wakes idle workers so a freshly queued job does not wait for the next poll."""
+        self._wakeup.set()
+
+    def stop(self, timeout: float = None):
+        self._stopping.set()
+        self._wakeup.set()
+        with self._lock:
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = []
+
+    def _claim(self):
+        with self._claim_lock, get_session() as session:
+            job = claim_next_blog_job(session, per_user_limit=Config.BATCH_PER_USER_LIMIT)
+            if job is None:
+                return None
+            return job.id, json.loads(job.payload), job.blog_id
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            try:
+                claimed = self._claim()
+            except Exception as e:
+                print(f"Error claiming blog job: {e}")
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            job_id, payload, blog_id = claimed
+            print(f"--- Running blog job {job_id} (blog {blog_id}) ---")
+            try:
+                run_blog_job(job_id, payload, blog_id)
+            except Exception as e:
+                print(f"Blog job {job_id} failed: {e}")
+
+
+_worker_pool: Optional[BlogJobWorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> BlogJobWorkerPool:
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = BlogJobWorkerPool()
+        return _worker_pool
+
+
+if __name__ == "__main__":
+    # Standalone worker process, e.g. next to a serverless API that cannot keep threads alive
+    pool = get_worker_pool()
+    pool.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        print("Stopping blog job workers...")
+        pool.stop()
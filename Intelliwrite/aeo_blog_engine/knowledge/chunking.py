@@ -0,0 +1,125 @@
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aeo_blog_engine.config.settings import Config
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]?\s")
+_WHITESPACE_RE = re.compile(r"\s")
+
+
+@dataclass
+class Chunk:
+    text: str
+    index: int
+    # Character offset of the chunk within its source text (within the page for PDFs)
+    offset: int
+    heading: Optional[str] = None
+    page: Optional[int] = None
+
+    def meta(self) -> Dict:
+        meta = {"chunk_index": self.index, "offset": self.offset, "length": len(self.text)}
+        if self.heading:
+            meta["heading"] = self.heading
+        if self.page is not None:
+            meta["page"] = self.page
+        return meta
+
+
+def _last_match_end(pattern: re.Pattern, text: str, start: int, end: int) -> Optional[int]:
+    last = None
+    for match in pattern.finditer(text, start, end):
+        last = match.end()
+    return last
+
+
+def _break_point(text: str, start: int, limit: int) -> int:
+    """Latest natural break in text[start:limit]: paragraph, then sentence, then word boundary."""
+    floor = start + (limit - start) // 2
+    for pattern in (_PARAGRAPH_BREAK_RE, _SENTENCE_END_RE, _WHITESPACE_RE):
+        end = _last_match_end(pattern, text, floor, limit)
+        if end:
+            return end
+    return limit
+
+
+def _only_headings(text: str) -> bool:
+    lines = [line for line in text.splitlines() if line.strip()]
+    return all(_HEADING_RE.match(line) for line in lines)
+
+
+def _split(text: str, size: int, overlap: int, section_starts: List[int]) -> List[tuple]:
+    """
+    Returns (start, end) windows of at most `size` chars. Windows end at the next section
+    start (a markdown heading) or at the best natural break before the size limit; windows
+    cut inside a section overlap the previous one by about `overlap` chars.
+    """
+    windows = []
+    start = 0
+    while start < len(text):
+        limit = min(start + size, len(text))
+        forced = None
+        for section_start in section_starts[bisect.bisect_right(section_starts, start):]:
+            if section_start >= limit:
+                break
+            # Don't leave a heading on its own: keep it with the section it introduces
+            if not _only_headings(text[start:section_start]):
+                forced = section_start
+                break
+
+        if forced is not None:
+            end = forced
+        elif limit == len(text):
+            end = limit
+        else:
+            end = _break_point(text, start, limit)
+        windows.append((start, end))
+        if end >= len(text):
+            break
+
+        if forced is not None or overlap <= 0:
+            start = end
+        else:
+            # Start the overlap on a word boundary, and always make progress
+            next_start = max(end - overlap, start + 1)
+            boundary = _WHITESPACE_RE.search(text, next_start, end)
+            start = boundary.end() if boundary else end
+    return windows
+
+
+def chunk_text(text: str, size: int = None, overlap: int = None, markdown: bool = True, page: int = None) -> List[Chunk]:
+    """
+    Splits a document into overlapping chunks of at most `size` characters. Markdown
+    headings always start a new chunk and are recorded on the chunks beneath them.
+    """
+    size = size or Config.CHUNK_SIZE
+    overlap = Config.CHUNK_OVERLAP if overlap is None else overlap
+    overlap = min(overlap, size // 2)
+
+    headings = [(match.start(), match.group(2).strip()) for match in _HEADING_RE.finditer(text)] if markdown else []
+    heading_starts = [position for position, _ in headings]
+
+    chunks = []
+    for start, end in _split(text, size, overlap, heading_starts):
+        raw = text[start:end]
+        body = raw.strip()
+        if not body:
+            continue
+        offset = start + (len(raw) - len(raw.lstrip()))
+        position = bisect.bisect_right(heading_starts, offset) - 1
+        heading = headings[position][1] if position >= 0 else None
+        chunks.append(Chunk(text=body, index=len(chunks), offset=offset, heading=heading, page=page))
+    return chunks
+
+
+def chunk_pages(pages: List[str], size: int = None, overlap: int = None) -> List[Chunk]:
+    """Chunks each PDF page on its own, so every chunk can be traced back to a page (1-based)."""
+    chunks = []
+    for number, page_text in enumerate(pages, start=1):
+        for chunk in chunk_text(page_text or "", size, overlap, markdown=False, page=number):
+            chunk.index = len(chunks)
+            chunks.append(chunk)
+    return chunks
@@ -0,0 +1,48 @@
+from pathlib import Path
+from typing import List, Optional
+
+from aeo_blog_engine.knowledge.chunking import Chunk, chunk_pages, chunk_text
+from aeo_blog_engine.knowledge.pdf_extract import PdfExtractor
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+# Document types read from knowledge/docs, by both ingestion and the BM25 index
+SUPPORTED_EXTENSIONS = (".md", ".txt", ".pdf")
+
+
+def read_chunks(file_path: Path, extractor: PdfExtractor = None, pdf_job=None) -> Optional[List[Chunk]]:
+    """
+    Extracts and chunks one document; returns None for unsupported or unreadable files.
+    PDFs already submitted to `extractor` are collected from it instead of parsed here.
+    """
+    file_name = file_path.name
+    if file_name.endswith(".md") or file_name.endswith(".txt"):
+        try:
+            content = file_path.read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"Error reading text file {file_path}: {e}")
+            return None
+        return chunk_text(content, markdown=file_name.endswith(".md"))
+
+    if file_name.endswith(".pdf"):
+        if PdfReader is None:
+            print(f"Skipping PDF {file_path}: pypdf not installed.")
+            return None
+        try:
+            if pdf_job is not None:
+                pages = extractor.result(pdf_job)
+            else:
+                reader = PdfReader(str(file_path))
+                pages = [page.extract_text() or "" for page in reader.pages]
+        except TimeoutError as e:
+            print(f"Skipping PDF file {file_path}: {e}")
+            return None
+        except Exception as e:
+            print(f"Error reading PDF file {file_path}: {e}")
+            return None
+        return chunk_pages(pages)
+
+    return None
@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from agno.knowledge.embedder.google import GeminiEmbedder
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.tokens import estimate_tokens
+
+# HTTP statuses worth retrying: timeouts, rate limiting and server-side hiccups
+_TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def _is_transient(exc: Exception) -> bool:
+    status = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status in _TRANSIENT_STATUS
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    name = type(exc).__name__.lower()
+    message = str(exc).lower()
+    return "timeout" in name or "connect" in name or "resource_exhausted" in message or "unavailable" in message
+
+
+class RateLimiter:
+    """Spaces calls evenly so that at most `requests_per_minute` start in any minute."""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BatchEmbedder:
+    """
+    Embeds many texts with batched requests: up to `max_concurrency` batches in flight,
+    request starts limited to `requests_per_minute`, and transient failures retried with
+    exponential backoff. Works with any agno embedder; Gemini embedders get true batch
+    requests, others fall back to one call per text inside each batch.
+    """
+
+    def __init__(self, embedder, batch_size: int = None, max_concurrency: int = None,
+                 requests_per_minute: int = None, max_retries: int = None):
+        self.embedder = embedder
+        self.batch_size = batch_size or Config.EMBED_BATCH_SIZE
+        self.max_concurrency = max_concurrency or Config.EMBED_MAX_CONCURRENCY
+        self.max_retries = Config.EMBED_MAX_RETRIES if max_retries is None else max_retries
+        self.limiter = RateLimiter(Config.EMBED_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute)
+        self._lock = threading.Lock()
+        self._stats = {"texts": 0, "tokens": 0, "batches": 0, "requests": 0, "retries": 0, "failed": 0, "seconds": 0.0}
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self._stats[name] += amount
+
+    def _request(self, texts: List[str]) -> List[List[float]]:
+        self.limiter.acquire()
+        self._count(requests=1)
+        if isinstance(self.embedder, GeminiEmbedder):
+            return self._gemini_batch(texts)
+        return [self.embedder.get_embedding(text) for text in texts]
+
+    def _gemini_batch(self, texts: List[str]) -> List[List[float]]:
+        # Mirrors GeminiEmbedder._response, with a list of contents in one request
+        model_id = self.embedder.id.split("/")[-1]
+        config = {}
+        if self.embedder.dimensions:
+            config["output_dimensionality"] = self.embedder.dimensions
+        if self.embedder.task_type:
+            config["task_type"] = self.embedder.task_type
+        if self.embedder.title:
+            config["title"] = self.embedder.title
+        params = {"contents": texts, "model": model_id}
+        if config:
+            params["config"] = config
+        if self.embedder.request_params:
+            params.update(self.embedder.request_params)
+        response = self.embedder.client.models.embed_content(**params)
+        return [embedding.values or [] for embedding in (response.embeddings or [])]
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                vectors = self._request(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"Embedding batch returned {len(vectors)} vectors for {len(texts)} texts")
+                return [vector or None for vector in vectors]
+            except Exception as e:
+                if attempt == self.max_retries or not _is_transient(e):
+                    print(f"Embedding batch of {len(texts)} failed: {e}")
+                    return [None] * len(texts)
+                delay = min(Config.EMBED_RETRY_BASE_DELAY * (2 ** attempt), 60) * (1 + random.random() / 2)
+                self._count(retries=1)
+                print(f"Transient embedding error ({e}); retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Returns one vector per text, in order; None for texts whose batch ultimately failed."""
+        if not texts:
+            return []
+        started = time.perf_counter()
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(batches)))) as executor:
+            results = list(executor.map(self._embed_batch, batches))
+
+        vectors = [vector for batch in results for vector in batch]
+        self._count(
+            texts=len(texts),
+            tokens=sum(estimate_tokens(text) for text in texts),
+            batches=len(batches),
+            failed=sum(1 for vector in vectors if vector is None),
+            seconds=time.perf_counter() - started,
+        )
+        return vectors
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        seconds = stats["seconds"]
+        stats["docs_per_second"] = round(stats["texts"] / seconds, 2) if seconds else 0.0
+        stats["tokens_per_second"] = round(stats["tokens"] / seconds, 2) if seconds else 0.0
+        stats["seconds"] = round(seconds, 3)
+        return stats
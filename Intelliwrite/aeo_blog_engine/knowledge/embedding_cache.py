@@ -0,0 +1,180 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from aeo_blog_engine.config.settings import Config
+
+
+def _normalize_query(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip())
+
+
+class SQLiteEmbeddingStore:
+    """On-disk query -> embedding store, shared by every worker process on a box and kept across restarts."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE query_embeddings SET last_access = ? WHERE key = ?", (time.time(), key))
+        return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def set(self, key: str, vector: List[float]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                (key, np.asarray(vector, dtype=np.float32).tobytes(), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM query_embeddings WHERE key IN ("
+                "SELECT key FROM query_embeddings ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+
+
+class CachedEmbedder:
+    """
+    Sits in front of the embedder used for knowledge-base searches and caches query -> embedding
+    in a per-process LRU backed by an optional SQLite store. Keys include the embedder's model
+    and dimensions, so switching models never serves stale vectors. Anything other than
+    query embedding is passed through to the wrapped embedder.
+    """
+
+    def __init__(self, embedder, max_entries: int = None, store: Optional[SQLiteEmbeddingStore] = None):
+        self.embedder = embedder
+        self.max_entries = max_entries or Config.QUERY_EMBEDDING_CACHE_SIZE
+        self.store = store
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0}
+        self._scope = f"{getattr(embedder, 'id', type(embedder).__name__)}:{getattr(embedder, 'dimensions', None)}"
+
+    def __getattr__(self, name):
+        if name == "embedder":
+            raise AttributeError(name)
+        return getattr(self.embedder, name)
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self._scope}:{_normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, key: str, vector: List[float]):
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return vector
+        if self.store is not None:
+            try:
+                vector = self.store.get(key)
+            except sqlite3.Error as e:
+                print(f"Query embedding cache read failed: {e}")
+                vector = None
+            if vector is not None:
+                self._remember(key, vector)
+                self._count("disk_hits")
+                return vector
+        self._count("misses")
+        return None
+
+    def _store(self, key: str, vector: List[float]):
+        if not vector:
+            return
+        self._remember(key, vector)
+        if self.store is not None:
+            try:
+                self.store.set(key, vector)
+            except sqlite3.Error as e:
+                print(f"Query embedding cache write failed: {e}")
+
+    def get_embedding(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = self.embedder.get_embedding(text)
+            self._store(key, vector)
+        return vector
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = await self.embedder.async_get_embedding(text)
+            self._store(key, vector)
+        return vector
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["size"] = len(self._entries)
+        lookups = counters["hits"] + counters["disk_hits"] + counters["misses"]
+        counters["hit_rate"] = round((counters["hits"] + counters["disk_hits"]) / lookups, 4) if lookups else 0.0
+        counters["disk_size"] = self.store.size() if self.store is not None else None
+        return counters
+
+
+_cached_query_embedder: Optional[CachedEmbedder] = None
+
+
+def cached_query_embedder(embedder):
+    """
+    Wraps `embedder` in the process-wide query-embedding cache (created on first use), or
+    returns it unchanged when QUERY_EMBEDDING_CACHE_ENABLED is off.
+    """
+    global _cached_query_embedder
+    if not Config.QUERY_EMBEDDING_CACHE_ENABLED:
+        return embedder
+    if _cached_query_embedder is None or _cached_query_embedder.embedder is not embedder:
+        store = None
+        if Config.QUERY_EMBEDDING_CACHE_PATH:
+            try:
+                store = SQLiteEmbeddingStore(Config.QUERY_EMBEDDING_CACHE_PATH, Config.QUERY_EMBEDDING_CACHE_MAX_ENTRIES)
+            except sqlite3.Error as e:
+                print(f"Query embedding cache is memory-only, could not open {Config.QUERY_EMBEDDING_CACHE_PATH}: {e}")
+        _cached_query_embedder = CachedEmbedder(embedder, store=store)
+    return _cached_query_embedder
+
+
+def get_query_embedding_cache() -> Optional[CachedEmbedder]:
+    return _cached_query_embedder
@@ -0,0 +1,149 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from agno.knowledge.document import Document
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.lexical import BM25Index, CachedLexicalIndex, tokenize
+from aeo_blog_engine.knowledge.manifest import chunk_hash
+
+try:
+    from sentence_transformers import CrossEncoder
+except ImportError:
+    CrossEncoder = None
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> Dict[str, float]:
+    """Fuses several rankings of keys (best first) into key -> sum of 1 / (k + rank)."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class PhraseReranker:
+    """
+    Cheap local reranker: boosts passages that cover more of the query's terms and contain
+    its adjacent term pairs verbatim ("faq schema", "50 word"), which is exactly where
+    dense retrieval is weakest. Added to the normalised fused score.
+    """
+
+    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        terms = tokenize(query)
+        if not terms or not documents:
+            return documents
+        query_terms = set(terms)
+        query_pairs = set(zip(terms, terms[1:]))
+        top = max(document.reranking_score or 0.0 for document in documents) or 1.0
+        for document in documents:
+            tokens = tokenize(document.content)
+            coverage = len(query_terms & set(tokens)) / len(query_terms)
+            phrases = len(query_pairs & set(zip(tokens, tokens[1:]))) / len(query_pairs) if query_pairs else 0.0
+            document.reranking_score = (document.reranking_score or 0.0) / top + coverage + phrases
+        return sorted(documents, key=lambda document: -document.reranking_score)
+
+
+class CrossEncoderReranker:
+    """Scores (query, passage) pairs with a small local cross-encoder (needs sentence-transformers)."""
+
+    def __init__(self, model_name: str):
+        self.model = CrossEncoder(model_name)
+
+    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        if not documents:
+            return documents
+        scores = self.model.predict([(query, document.content) for document in documents])
+        for document, score in zip(documents, scores):
+            document.reranking_score = float(score)
+        return sorted(documents, key=lambda document: -document.reranking_score)
+
+
+def get_reranker(name: str = None):
+    name = (name or Config.KB_RERANKER).lower()
+    if name == "none":
+        return None
+    if name == "cross-encoder":
+        if CrossEncoder is not None:
+            return CrossEncoderReranker(Config.KB_RERANKER_MODEL)
+        print("Note: sentence-transformers is not installed; using the phrase reranker instead.")
+    elif name != "phrase":
+        raise ValueError(f"Unsupported KB_RERANKER: {name}")
+    return PhraseReranker()
+
+
+def _matches(meta: Dict, filters: Optional[Dict]) -> bool:
+    return not filters or all(meta.get(key) == value for key, value in filters.items())
+
+
+class HybridKnowledge:
+    """
+    Wraps a dense vector DB (Qdrant or the local vector store) with hybrid retrieval: the top
+    `candidates` dense hits and the top BM25 hits over the same chunked docs are fused by
+    reciprocal-rank fusion, optionally reranked, and cut to `limit`. Passages are matched
+    across the two by content hash. Everything other than search goes to the wrapped DB.
+    """
+
+    def __init__(self, vector_db, docs_dir: str = None, candidates: int = None, rrf_k: int = None, reranker=None):
+        self.vector_db = vector_db
+        self.docs_dir = docs_dir or os.path.join(os.path.dirname(__file__), "docs")
+        self.candidates = candidates or Config.KB_HYBRID_CANDIDATES
+        self.rrf_k = rrf_k or Config.KB_RRF_K
+        self.reranker = reranker
+        self._index = CachedLexicalIndex(self.docs_dir)
+
+    def __getattr__(self, name):
+        if name == "vector_db":
+            raise AttributeError(name)
+        return getattr(self.vector_db, name)
+
+    def _lexical_index(self) -> BM25Index:
+        # Reloaded when /ingest has changed the docs since the last search
+        return self._index.get()
+
+    def _sparse_search(self, query: str, limit: int, filters: Optional[Dict]) -> List[Document]:
+        index = self._lexical_index()
+        documents = []
+        for position, score in index.search(query, limit * 2 if filters else limit):
+            passage = index.passages[position]
+            if _matches(passage["meta"], filters):
+                documents.append(Document(
+                    content=passage["text"], name=passage["name"], meta_data=passage["meta"], reranking_score=score,
+                ))
+        return documents[:limit]
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict] = None, **_) -> List[Document]:
+        candidates = max(self.candidates, limit)
+        try:
+            dense = self.vector_db.search(query=query, limit=candidates, filters=filters) or []
+        except Exception as e:
+            # Lexical results still answer the query while the vector DB is unavailable
+            print(f"Note: Dense search failed, using lexical results only: {e}")
+            dense = []
+        sparse = self._sparse_search(query, candidates, filters)
+
+        by_key: Dict[str, Document] = {}
+        rankings = []
+        for documents in (dense, sparse):
+            ranking = []
+            for document in documents:
+                key = chunk_hash(document.content or "")
+                # Dense hits carry the vector DB's ids and metadata, so they win on overlap
+                by_key.setdefault(key, document)
+                ranking.append(key)
+            rankings.append(ranking)
+
+        fused = reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        documents = []
+        for key in sorted(fused, key=lambda key: -fused[key]):
+            document = by_key[key]
+            document.reranking_score = fused[key]
+            documents.append(document)
+
+        if self.reranker is not None:
+            documents = self.reranker.rerank(query, documents)
+        return documents[:limit]
+
+    async def async_search(self, query: str, limit: int = 5, filters: Optional[Dict] = None, **_) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
@@ -1,107 +1,369 @@
 import os
+import shutil
 import sys
 # import asyncio # No longer needed
+from contextlib import closing, nullcontext
 from pathlib import Path
-from uuid import uuid4
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.chunking import Chunk
+from aeo_blog_engine.knowledge.documents import SUPPORTED_EXTENSIONS, read_chunks
+from aeo_blog_engine.knowledge.embedding import BatchEmbedder
 from aeo_blog_engine.knowledge.knowledge_base import get_knowledge_base
+from aeo_blog_engine.knowledge.manifest import IngestManifest, chunk_hash, file_hash, point_id
+from aeo_blog_engine.knowledge.pdf_extract import PdfExtractor
+from aeo_blog_engine.knowledge.vector_store import LocalVectorStore, MirroredVectorClient
 from qdrant_client.http.models import PointStruct, models # Import Qdrant models
-try:
-    from pypdf import PdfReader
-except ImportError:
-    PdfReader = None
+def _read_chunks(file_path: Path, extractor: PdfExtractor = None, pdf_job=None) -> Optional[List[Chunk]]:
+    print(f"Found {'PDF' if file_path.name.endswith('.pdf') else 'text'} file: {file_path}")
+    return read_chunks(file_path, extractor, pdf_job)
+
+
+def _chunk_points(file_key: str, file_path: Path, chunks: List[Chunk]):
+    """Returns (point_id, chunk_hash, payload) for each chunk of a file, in chunk order."""
+    occurrences = {}
+    for chunk in chunks:
+        content_hash = chunk_hash(chunk.text)
+        # Identical passages within a file still get distinct points
+        occurrence = occurrences.get(content_hash, 0)
+        occurrences[content_hash] = occurrence + 1
+        payload = {
+            "name": file_path.name,
+            "meta_data": {"file_path": str(file_path), **chunk.meta()}, # Required by agno
+            "content": chunk.text, # Often expected by agno
+            "content_preview": chunk.text[:200]
+        }
+        yield point_id(file_key, content_hash, occurrence), content_hash, payload
+
+
+def _untracked_point_ids(qdrant_client, collection_name: str, keep: set) -> List:
+    """Ids of points in the collection that no manifest entry accounts for (e.g. left by an older ingest)."""
+    untracked = []
+    offset = None
+    while True:
+        records, offset = qdrant_client.scroll(
+            collection_name=collection_name, limit=256, offset=offset, with_payload=False, with_vectors=False
+        )
+        untracked.extend(record.id for record in records if str(record.id) not in keep)
+        if offset is None:
+            return untracked
+
+
+def _changed_files(docs_dir: Path, manifest: IngestManifest, summary: Dict, seen: set) -> Iterator[tuple]:
+    """Yields (file_path, file_key, content_hash, manifest_entry) for new or modified documents."""
+    for root, _, files in os.walk(docs_dir):
+        for file_name in files:
+            if not file_name.endswith(SUPPORTED_EXTENSIONS):
+                continue
+            file_path = Path(root) / file_name
+            file_key = file_path.relative_to(docs_dir).as_posix()
+            try:
+                content_hash = file_hash(file_path)
+            except OSError as e:
+                print(f"Error reading file {file_path}: {e}")
+                continue
+
+            entry = manifest.get(file_key)
+            if entry and entry["hash"] == content_hash:
+                seen.add(file_key)
+                summary["unchanged"] += 1
+                continue
+            yield file_path, file_key, content_hash, entry
+
+
+def _scan_changes(docs_dir: Path, manifest: IngestManifest, summary: Dict, seen: set) -> Iterator[Dict]:
+    """
+    Walks docs/ and yields one change per new or modified file, lazily, so only the file
+    being chunked is held in memory. Unchanged files are just recorded in `seen`.
+    PDF text extraction runs ahead in a process pool while earlier files are embedded.
+    """
+    with PdfExtractor() as extractor:
+        candidates = _changed_files(docs_dir, manifest, summary, seen)
+        for (file_path, file_key, content_hash, entry), pdf_job in extractor.prefetch(candidates):
+            file_name = file_path.name
+            chunks = _read_chunks(file_path, extractor, pdf_job)
+            if chunks is None:
+                if entry:
+                    # Keep what is already indexed rather than dropping it on a read error
+                    seen.add(file_key)
+                continue
+            if not chunks:
+                print(f"Skipping empty file: {file_path}")
+                continue
+
+            previous_ids = set(IngestManifest.point_ids(entry))
+            change = {
+                "file_key": file_key, "entry": entry, "hash": content_hash, "records": [],
+                "new": [], "reused": [], "upserted": [], "remaining": 0, "failed": False,
+            }
+            for pid, chunk_digest, payload in _chunk_points(file_key, file_path, chunks):
+                change["records"].append({"id": pid, "hash": chunk_digest})
+                # Same passage as before: only its position in the file may have moved
+                change["reused" if pid in previous_ids else "new"].append((pid, payload))
+            change["remaining"] = len(change["new"])
+            print(f"{file_name}: {len(change['new'])} chunks to embed, {len(change['reused'])} unchanged.")
+            seen.add(file_key)
+            yield change
+
+
+def _mirror_client(qdrant_client, collection_name: str, collection_exists: bool):
+    """
+    Wraps the Qdrant client so ingestion also writes to the local vector store. A missing
+    store is seeded from the collection first, and a store left over from a dropped
+    collection is cleared, so the mirror holds the same points as Qdrant.
+    """
+    store = LocalVectorStore()
+    if store.exists() and not collection_exists:
+        shutil.rmtree(store.path, ignore_errors=True)
+        store = LocalVectorStore()
+    elif collection_exists and not store.exists():
+        print(f"Seeding local vector store from Qdrant collection '{collection_name}'...")
+        try:
+            offset = None
+            while True:
+                records, offset = qdrant_client.scroll(
+                    collection_name=collection_name, limit=Config.INGEST_BATCH_SIZE, offset=offset,
+                    with_payload=True, with_vectors=True,
+                )
+                if records:
+                    store.write(upserts={str(record.id): (record.vector, record.payload) for record in records})
+                if offset is None:
+                    break
+        except Exception as e:
+            # A half-seeded mirror would silently miss points; try again next ingest instead
+            print(f"Could not seed local vector store, skipping the mirror this run: {e}")
+            shutil.rmtree(store.path, ignore_errors=True)
+            return qdrant_client
+    return MirroredVectorClient(qdrant_client, store.client)
+
+
+class _StreamingIngest:
+    """
+    Consumes file changes and writes them to Qdrant in fixed-size batches: chunks are
+    embedded and upserted INGEST_BATCH_SIZE at a time, so memory is bounded by the batch
+    rather than the corpus. A file is committed to the manifest once all of its chunks
+    are stored, so an ingest that dies part-way keeps every file it finished. Each batch
+    refreshes reused chunks in one request and, for the local vector store, is written
+    as one new version.
+    """
+
+    def __init__(self, qdrant_client, collection_name: str, embedder, manifest: IngestManifest,
+                 summary: Dict, collection_exists: bool, batch_size: int = None):
+        self.client = qdrant_client
+        self.collection_name = collection_name
+        self.embedder = BatchEmbedder(embedder)
+        self.manifest = manifest
+        self.summary = summary
+        self.collection_exists = collection_exists
+        self.batch_size = batch_size or Config.INGEST_BATCH_SIZE
+        self.pending: List[Tuple[Dict, str, Dict]] = []
+        # Files whose chunks are all stored, committed together at the end of the batch
+        self.ready: List[Dict] = []
+        self.writes = 0
+
+    def add(self, change: Dict):
+        if not change["new"]:
+            self.ready.append(change)
+            if len(self.ready) >= self.batch_size:
+                self.flush()
+            return
+        for pid, payload in change["new"]:
+            self.pending.append((change, pid, payload))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+        # The file's chunks are now queued or stored; drop the copies held by the change
+        change["new"] = []
+
+    def _batch(self):
+        # Clients over the local store collect a batch's writes into a single version
+        return getattr(self.client, "batch", nullcontext)()
+
+    def flush(self):
+        with self._batch():
+            self._store_pending()
+            self._commit_ready()
+        self.manifest.save()
+
+    def _store_pending(self):
+        batch = [item for item in self.pending if not item[0]["failed"]]
+        self.pending = []
+        if not batch:
+            return
+
+        # One point per chunk, so retrieval returns small passages rather than whole files
+        vectors = self.embedder.embed([payload["content"] for _, _, payload in batch])
+        points = []
+        for (change, pid, payload), vector in zip(batch, vectors):
+            if vector is None:
+                self._fail(change)
+                continue
+            points.append((change, PointStruct(id=pid, vector=vector, payload=payload)))
+        points = [(change, point) for change, point in points if not change["failed"]]
+
+        if points:
+            self._ensure_collection(len(points[0][1].vector))
+            print(f"Upserting {len(points)} points to Qdrant collection '{self.collection_name}'...")
+            self.client.upsert(
+                collection_name=self.collection_name,
+                wait=True,
+                points=[point for _, point in points]
+            )
+            self.writes += 1
+            self.summary["chunks_embedded"] += len(points)
+
+        for change, point in points:
+            change["upserted"].append(point.id)
+            change["remaining"] -= 1
+            if change["remaining"] == 0:
+                self.ready.append(change)
+
+    def _ensure_collection(self, vector_size: int):
+        if self.collection_exists:
+            return
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+        )
+        self.collection_exists = True
+
+    def delete_points(self, point_ids: List):
+        if not point_ids or not self.collection_exists:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=list(point_ids)),
+            wait=True,
+        )
+        self.writes += 1
+
+    def _commit_ready(self):
+        """Files with all new chunks stored: refresh moved chunks, drop dropped ones, record them."""
+        ready = [change for change in self.ready if not change["failed"]]
+        self.ready = []
+        if not ready:
+            return
+
+        payloads = {pid: payload for change in ready for pid, payload in change["reused"]}
+        if payloads:
+            self.client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=[
+                    models.OverwritePayloadOperation(overwrite_payload=models.SetPayload(payload=payload, points=[pid]))
+                    for pid, payload in payloads.items()
+                ],
+                wait=True,
+            )
+            self.writes += 1
+
+        stale = []
+        for change in ready:
+            current_ids = {record["id"] for record in change["records"]}
+            stale.extend(pid for pid in IngestManifest.point_ids(change["entry"]) if pid not in current_ids)
+        self.delete_points(stale)
+
+        for change in ready:
+            self.manifest.set(change["file_key"], change["hash"], change["records"])
+            self.summary["chunks_reused"] += len(change["reused"])
+            self.summary["updated" if change["entry"] else "added"].append(change["file_key"])
+
+    def _fail(self, change: Dict):
+        """Abandons a file whose chunks could not be embedded; its previous points (if any) stay in place."""
+        if change["failed"]:
+            return
+        change["failed"] = True
+        print(f"Error embedding {change['file_key']}, it will be retried on the next ingest.")
+        self.summary["failed"].append(change["file_key"])
+        # New points already stored for it are not in the manifest, so remove them now
+        previous_ids = set(IngestManifest.point_ids(change["entry"]))
+        self.delete_points([pid for pid in change["upserted"] if pid not in previous_ids])
+
 
 def ingest_docs(): # No longer async
     """
-    Reads markdown/text/pdf files from the docs/ directory, embeds them, and loads them directly into Qdrant.
+    Incrementally syncs the docs/ directory (markdown/text/pdf) into Qdrant.
+    Files are split into chunks (see knowledge/chunking.py) and tracked in an ingest manifest
+    (see knowledge/manifest.py): only new or changed files are embedded, points of removed
+    files are deleted, and the collection is never dropped, so it stays queryable throughout.
+    Work streams through read -> chunk -> embed -> upsert in fixed-size batches.
+    With LOCAL_VECTOR_MIRROR, embeddings are also written to the local vector store.
+    Returns a summary of what changed.
     """
     vector_db = get_knowledge_base() # This is the agno.vectordb.qdrant.Qdrant instance
+    # Hybrid retrieval wraps the dense store; ingestion writes to the store itself
+    vector_db = getattr(vector_db, "vector_db", vector_db)
     qdrant_client = vector_db.client # Get the underlying QdrantClient
-    embedder = vector_db.embedder # Get the OpenAIEmbedder
+    # Bypass the query-embedding cache: document chunks are embedded once, in batches
+    embedder = getattr(vector_db.embedder, "embedder", vector_db.embedder)
     collection_name = vector_db.collection
 
     current_dir = os.path.dirname(os.path.abspath(__file__))
     docs_dir = Path(os.path.join(current_dir, "docs"))
     
     print(f"Scanning for documents in: {docs_dir}")
-    
-    points_to_upsert = []
 
-    for root, _, files in os.walk(docs_dir):
-        for file_name in files:
-            content = ""
-            file_path = Path(root) / file_name
+    manifest = IngestManifest(collection_name).load()
+    collection_exists = qdrant_client.collection_exists(collection_name=collection_name)
+    if not collection_exists:
+        # Nothing stored to reuse, whatever the manifest says; nothing untracked either
+        manifest.reset()
+        manifest.reconciled = True
+    if Config.LOCAL_VECTOR_MIRROR and not isinstance(vector_db, LocalVectorStore):
+        qdrant_client = _mirror_client(qdrant_client, collection_name, collection_exists)
 
-            if file_name.endswith(".md") or file_name.endswith(".txt"):
-                print(f"Found text file: {file_path}")
-                try:
-                    content = file_path.read_text(encoding='utf-8')
-                except Exception as e:
-                    print(f"Error reading text file {file_path}: {e}")
-                    continue
-            
-            elif file_name.endswith(".pdf"):
-                print(f"Found PDF file: {file_path}")
-                if PdfReader is None:
-                    print(f"Skipping PDF {file_path}: pypdf not installed.")
-                    continue
-                try:
-                    reader = PdfReader(str(file_path))
-                    for page in reader.pages:
-                        text = page.extract_text()
-                        if text:
-                            content += text + "\n"
-                except Exception as e:
-                    print(f"Error reading PDF file {file_path}: {e}")
-                    continue
-            
-            if content:
-                if not content.strip():
-                    print(f"Skipping empty file: {file_path}")
-                    continue
-
-                try:
-                    # Generate embedding for the entire file content
-                    # For larger files, a proper chunking strategy would be needed.
-                    # For now, we'll embed the whole file content.
-                    embedding = embedder.get_embedding(content) # No await
-
-                    points_to_upsert.append(PointStruct(
-                        id=str(uuid4()), # Generate a unique ID for each point
-                        vector=embedding,
-                        payload={
-                            "name": file_name,
-                            "meta_data": {"file_path": str(file_path)}, # Required by agno
-                            "content": content, # Often expected by agno
-                            "content_preview": content[:200]
-                        }
-                    ))
-                except Exception as e:
-                    print(f"Error embedding/processing file {file_path}: {e}")
-
-    if points_to_upsert:
-        print(f"Upserting {len(points_to_upsert)} points to Qdrant collection '{collection_name}'...")
-        try:
-            # Clean start: Delete collection if it exists to remove old incompatible points
-            if qdrant_client.collection_exists(collection_name=collection_name):
-                qdrant_client.delete_collection(collection_name=collection_name)
-            
-            qdrant_client.create_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(size=len(points_to_upsert[0].vector), distance=models.Distance.COSINE),
-            )
-            
-            operation_info = qdrant_client.upsert(
-                collection_name=collection_name,
-                wait=True,
-                points=points_to_upsert
+    summary = {
+        "added": [], "updated": [], "removed": [], "failed": [],
+        "unchanged": 0, "chunks_embedded": 0, "chunks_reused": 0,
+    }
+    seen = set()
+    run = _StreamingIngest(qdrant_client, collection_name, embedder, manifest, summary, collection_exists)
+
+    try:
+        # closing() shuts the PDF worker pool down even if an upsert fails mid-scan
+        with closing(_scan_changes(docs_dir, manifest, summary, seen)) as changes:
+            for change in changes:
+                run.add(change)
+        run.flush()
+
+        removed_ids = []
+        for file_key in list(manifest.files):
+            if file_key not in seen:
+                removed_ids.extend(IngestManifest.point_ids(manifest.get(file_key)))
+                manifest.remove(file_key)
+                summary["removed"].append(file_key)
+
+        if not manifest.reconciled:
+            # First complete ingest with a manifest: clear out points an earlier full ingest left behind
+            kept_ids = {pid for entry in manifest.files.values() for pid in IngestManifest.point_ids(entry)}
+            removed_ids.extend(_untracked_point_ids(qdrant_client, collection_name, kept_ids))
+
+        if removed_ids:
+            print(f"Deleting {len(removed_ids)} stale points...")
+            run.delete_points(removed_ids)
+        manifest.reconciled = True
+        manifest.save()
+    except Exception as e:
+        # Files committed before the failure stay recorded in the manifest
+        print(f"Error during Qdrant upsert: {e}")
+        summary["error"] = str(e)
+
+    summary["embedding"] = run.embedder.stats()
+    embedded = summary["embedding"]
+    if embedded["texts"]:
+        print(
+            f"Embedded {embedded['texts'] - embedded['failed']} of {embedded['texts']} chunks in {embedded['seconds']}s "
+            f"({embedded['docs_per_second']} docs/s, {embedded['tokens_per_second']} tokens/s)."
+        )
+
+    if "error" not in summary:
+        if run.writes:
+            print(
+                f"Ingestion complete: {len(summary['added'])} added, {len(summary['updated'])} updated, "
+                f"{len(summary['removed'])} removed, {summary['unchanged']} unchanged."
             )
-            print(f"Upsert operation info: {operation_info}")
-            print("Ingestion complete.")
-        except Exception as e:
-            print(f"Error during Qdrant upsert: {e}")
-    else:
-        print("No documents found to ingest.")
+        else:
+            print("Nothing to update; failed files will be retried on the next ingest." if summary["failed"] else "Knowledge base is up to date.")
+    return summary
 
 if __name__ == "__main__":
     ingest_docs() # Call directly, no asyncio.run
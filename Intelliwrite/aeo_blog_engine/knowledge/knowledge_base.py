@@ -1,35 +1,41 @@
 import os
 from typing import Optional
 
+from agno.knowledge.document import Document
 from agno.vectordb.qdrant import Qdrant
 from agno.knowledge.embedder.google import GeminiEmbedder
 from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.embedding_cache import cached_query_embedder
+from aeo_blog_engine.knowledge.hybrid import HybridKnowledge, get_reranker
+from aeo_blog_engine.knowledge.lexical import CachedLexicalIndex
+from aeo_blog_engine.knowledge.vector_store import LocalVectorStore
 
 
 class _InMemoryKnowledge:
-    """Very small in-memory fallback to keep the pipeline running without Qdrant."""
+    """
+    In-memory fallback to keep the pipeline running without Qdrant: BM25 search over the
+    chunked docs, with the index cached on disk and rebuilt when the docs change.
+    """
 
     def __init__(self):
-        docs = []
         kb_path = os.path.join(os.path.dirname(__file__), "docs")
-        for root, _, files in os.walk(kb_path):
-            for file_name in files:
-                if file_name.endswith((".md", ".txt")):
-                    file_path = os.path.join(root, file_name)
-                    with open(file_path, "r", encoding="utf-8") as handle:
-                        docs.append(handle.read())
-        self._documents = docs
+        self._index = CachedLexicalIndex(kb_path)
 
     def exists(self):
         return True
 
     def search(self, query: str, limit: int = 3, **_):
-        # The pipeline expects objects with `.content`; emulate that interface
-        class _Doc:
-            def __init__(self, text: str):
-                self.content = text
-
-        return [_Doc(text) for text in self._documents[:limit]]
+        index = self._index.get()
+        passages = index.passages
+        return [
+            Document(
+                content=passages[position]["text"],
+                name=passages[position]["name"],
+                meta_data=passages[position]["meta"],
+                reranking_score=score,
+            )
+            for position, score in index.search(query, limit)
+        ]
 
 
 _cached_vector_db: Optional[object] = None
@@ -37,19 +43,31 @@ _cached_vector_db: Optional[object] = None
 
 import traceback
 
-def _use_in_memory_fallback(reason: str):
-    print(f"\n[WARNING] Falling back to in-memory knowledge base.")
+def _use_in_memory_fallback(reason: str, embedder=None):
+    # Semantic search from the local store (mirrored during ingestion) beats lexical search
+    local_store = LocalVectorStore(embedder=embedder)
+    print(f"\n[WARNING] Falling back to {'local vector store' if local_store.exists() else 'in-memory knowledge base'}.")
     print(f"Reason: {reason}")
     if "QDRANT_URL=:memory:" not in reason:
         print("Detailed error traceback:")
         traceback.print_exc()
-    return _InMemoryKnowledge()
+    return _hybrid(local_store) if local_store.exists() else _InMemoryKnowledge()
+
+
+def _hybrid(vector_db):
+    """Adds BM25 fusion and reranking on top of a dense vector DB when KB_HYBRID_ENABLED is on."""
+    if not Config.KB_HYBRID_ENABLED:
+        return vector_db
+    return HybridKnowledge(vector_db, reranker=get_reranker())
 
 
 def get_knowledge_base():
     """
-    Initializes and returns the vector DB instance.
-    Falls back to an in-memory KB when Qdrant cannot be reached.
+    Initializes and returns the vector DB instance: Qdrant, or the local NumPy store when
+    VECTOR_BACKEND=local. When Qdrant cannot be reached it falls back to the local store if
+    one has been built, else to an in-memory KB. Query embeddings go through the
+    query-embedding cache (see knowledge/embedding_cache.py), and dense search is combined
+    with BM25 (see knowledge/hybrid.py).
     """
     global _cached_vector_db
     if _cached_vector_db:
@@ -58,21 +76,28 @@ def get_knowledge_base():
     if not Config.GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY must be configured")
 
+    embedder = cached_query_embedder(GeminiEmbedder(api_key=Config.GEMINI_API_KEY))
+
+    if Config.VECTOR_BACKEND == "local":
+        _cached_vector_db = _hybrid(LocalVectorStore(embedder=embedder))
+        return _cached_vector_db
+
     if Config.QDRANT_URL == ":memory:":
-        _cached_vector_db = _use_in_memory_fallback("QDRANT_URL=:memory:")
+        _cached_vector_db = _use_in_memory_fallback("QDRANT_URL=:memory:", embedder)
         return _cached_vector_db
 
     try:
-        _cached_vector_db = Qdrant(
+        vector_db = Qdrant(
             collection=Config.COLLECTION_NAME,
             url=Config.QDRANT_URL,
             api_key=Config.QDRANT_API_KEY,
-            embedder=GeminiEmbedder(api_key=Config.GEMINI_API_KEY),
+            embedder=embedder,
         )
         # Trigger a lightweight call to surface connection issues early
-        if hasattr(_cached_vector_db, "client"):
-            _cached_vector_db.client.get_collections()
+        if hasattr(vector_db, "client"):
+            vector_db.client.get_collections()
+        _cached_vector_db = _hybrid(vector_db)
         return _cached_vector_db
     except Exception as exc:
-        _cached_vector_db = _use_in_memory_fallback(str(exc))
+        _cached_vector_db = _use_in_memory_fallback(str(exc), embedder)
         return _cached_vector_db
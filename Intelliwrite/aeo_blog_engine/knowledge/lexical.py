@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.documents import SUPPORTED_EXTENSIONS, read_chunks
+from aeo_blog_engine.knowledge.manifest import file_hash
+from aeo_blog_engine.knowledge.pdf_extract import PdfExtractor
+
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "how", "i", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "which", "why",
+    "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in _STOPWORDS:
+            continue
+        # Light plural folding so "answers" matches "answer"
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed set of passages. Postings are stored CSR-style in flat NumPy
+    arrays (term offsets -> doc ids / term frequencies), so queries are a few vectorized
+    scatter-adds and the whole index saves to / loads from a single .npz file.
+    """
+
+    def __init__(self, passages: List[Dict], vocabulary: Dict[str, int], offsets: np.ndarray,
+                 doc_ids: np.ndarray, term_freqs: np.ndarray, doc_lengths: np.ndarray,
+                 k1: float = 1.5, b: float = 0.75, signature: str = ""):
+        self.passages = passages
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        self.signature = signature
+
+        n_docs = len(passages)
+        doc_freqs = np.diff(offsets).astype(np.float32)
+        self.idf = np.log(1 + (n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        average = float(doc_lengths.mean()) if n_docs else 1.0
+        # Per-document part of the BM25 denominator, precomputed once
+        self._length_norm = (self.k1 * (1 - self.b + self.b * doc_lengths / (average or 1.0))).astype(np.float32)
+
+    @classmethod
+    def build(cls, passages: List[Dict], signature: str = "") -> "BM25Index":
+        """`passages` are dicts with at least a "text" key."""
+        vocabulary: Dict[str, int] = {}
+        postings: List[List[Tuple[int, int]]] = []
+        doc_lengths = np.zeros(len(passages), dtype=np.float32)
+
+        for doc_id, passage in enumerate(passages):
+            counts = Counter(tokenize(passage["text"]))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, count in counts.items():
+                term_id = vocabulary.setdefault(term, len(vocabulary))
+                if term_id == len(postings):
+                    postings.append([])
+                postings[term_id].append((doc_id, count))
+
+        lengths = [len(items) for items in postings]
+        offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        doc_ids = np.fromiter((doc for items in postings for doc, _ in items), dtype=np.int32, count=int(offsets[-1]))
+        term_freqs = np.fromiter((tf for items in postings for _, tf in items), dtype=np.float32, count=int(offsets[-1]))
+        return cls(passages, vocabulary, offsets, doc_ids, term_freqs, doc_lengths, signature=signature)
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            scores[docs] += self.idf[term_id] * tf * (self.k1 + 1) / (tf + self._length_norm[docs])
+        return scores
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """Returns (passage_index, score) for the top `limit` passages with a non-zero score."""
+        scores = self.scores(query)
+        if not len(scores):
+            return []
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(index), float(scores[index])) for index in top if scores[index] > 0]
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            term_freqs=self.term_freqs,
+            doc_lengths=self.doc_lengths,
+            meta=np.array(json.dumps({
+                "version": INDEX_VERSION,
+                "signature": self.signature,
+                "k1": self.k1,
+                "b": self.b,
+                "vocabulary": self.vocabulary,
+                "passages": self.passages,
+            })),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != INDEX_VERSION:
+                return None
+            return cls(
+                meta["passages"], meta["vocabulary"], data["offsets"], data["doc_ids"],
+                data["term_freqs"], data["doc_lengths"], k1=meta["k1"], b=meta["b"], signature=meta["signature"],
+            )
+
+
+def _doc_files(docs_dir: Path) -> List[Path]:
+    return sorted(
+        Path(root) / name
+        for root, _, files in os.walk(docs_dir)
+        for name in files
+        if name.endswith(SUPPORTED_EXTENSIONS)
+    )
+
+
+def docs_signature(docs_dir: Path) -> str:
+    """Changes whenever a document, or the chunking setup, changes."""
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{Config.CHUNK_SIZE}:{Config.CHUNK_OVERLAP}".encode())
+    for path in _doc_files(docs_dir):
+        digest.update(f"{path.relative_to(docs_dir).as_posix()}:{file_hash(path)}".encode())
+    return digest.hexdigest()
+
+
+def load_passages(docs_dir: Path) -> List[Dict]:
+    """Chunks every document the same way ingestion does, PDFs included."""
+    passages = []
+    files = _doc_files(docs_dir)
+    with PdfExtractor() as extractor:
+        for (path,), pdf_job in extractor.prefetch((path,) for path in files):
+            for chunk in read_chunks(path, extractor, pdf_job) or []:
+                passages.append({
+                    "name": path.name,
+                    "text": chunk.text,
+                    "meta": {"file_path": str(path), **chunk.meta()},
+                })
+    return passages
+
+
+def load_or_build_index(docs_dir, cache_path: str = None) -> BM25Index:
+    """Loads the cached index for docs_dir, rebuilding (and re-caching) it when the docs changed."""
+    docs_dir = Path(docs_dir)
+    cache_path = cache_path or Config.LEXICAL_INDEX_PATH
+    signature = docs_signature(docs_dir)
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            index = BM25Index.load(cache_path)
+            if index is not None and index.signature == signature:
+                return index
+        except Exception as e:
+            print(f"Ignoring unreadable lexical index {cache_path}: {e}")
+
+    index = BM25Index.build(load_passages(docs_dir), signature=signature)
+    if cache_path:
+        try:
+            index.save(cache_path)
+        except OSError as e:
+            print(f"Could not cache lexical index to {cache_path}: {e}")
+    return index
+
+
+class CachedLexicalIndex:
+    """
+    Keeps one loaded index for docs_dir and reloads it when the docs change (e.g. after
+    /ingest saves new uploads). The docs are stat-ed at most once per `check_interval`
+    seconds, not on every search; contents are only hashed (by load_or_build_index) once
+    something changed.
+    """
+
+    def __init__(self, docs_dir, cache_path: str = None, check_interval: float = None):
+        self.docs_dir = Path(docs_dir)
+        self.cache_path = cache_path
+        self.check_interval = Config.LEXICAL_INDEX_CHECK_INTERVAL if check_interval is None else check_interval
+        self._index: Optional[BM25Index] = None
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current_stamp(self) -> Tuple:
+        stamp = [Config.CHUNK_SIZE, Config.CHUNK_OVERLAP]
+        for path in _doc_files(self.docs_dir):
+            stat = path.stat()
+            stamp.append((path.relative_to(self.docs_dir).as_posix(), stat.st_size, stat.st_mtime_ns))
+        return tuple(stamp)
+
+    def get(self) -> BM25Index:
+        if self._index is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._index
+        stamp = self._current_stamp()
+        self._checked_at = time.monotonic()
+        if self._index is not None and stamp == self._stamp:
+            return self._index
+        with self._lock:
+            if self._index is None or stamp != self._stamp:
+                self._index = load_or_build_index(self.docs_dir, self.cache_path)
+                self._stamp = stamp
+            return self._index
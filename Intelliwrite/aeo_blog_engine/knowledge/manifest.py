@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+from uuid import NAMESPACE_URL, uuid5
+
+from aeo_blog_engine.config.settings import Config
+
+MANIFEST_VERSION = 1
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def point_id(file_key: str, content_hash: str, occurrence: int = 0) -> str:
+    """
+    Deterministic Qdrant point id for a chunk: the same passage of the same file always maps
+    to the same point, so re-ingesting upserts in place instead of adding duplicates.
+    """
+    return str(uuid5(NAMESPACE_URL, f"aeo-kb:{file_key}:{content_hash}:{occurrence}"))
+
+
+def default_manifest_path(collection: str) -> str:
+    if Config.INGEST_MANIFEST_PATH:
+        return Config.INGEST_MANIFEST_PATH
+    # Kept out of the package directory, next to the other caches (see RESEARCH_CACHE_PATH)
+    return os.path.join(tempfile.gettempdir(), f"aeo_ingest_manifest.{collection}.json")
+
+
+class IngestManifest:
+    """
+    Records what is in the vector collection: file path -> content hash -> chunk point ids
+    (and chunk hashes). A manifest written for a different collection, chunking setup or
+    format version is ignored, which makes the next ingest a full one.
+    """
+
+    def __init__(self, collection: str, path: str = None):
+        self.collection = collection
+        self.path = path or default_manifest_path(collection)
+        self.chunking = {"size": Config.CHUNK_SIZE, "overlap": Config.CHUNK_OVERLAP}
+        self.files: Dict[str, Dict] = {}
+        self.loaded = False
+        # False until points not tracked by any manifest (e.g. from an older full ingest) are cleared out
+        self.reconciled = False
+
+    def load(self) -> "IngestManifest":
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return self
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable ingest manifest {self.path}: {e}")
+            return self
+
+        if (
+            data.get("version") == MANIFEST_VERSION
+            and data.get("collection") == self.collection
+            and data.get("chunking") == self.chunking
+        ):
+            self.files = data.get("files", {})
+            self.reconciled = data.get("reconciled", False)
+            self.loaded = True
+        return self
+
+    def save(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "collection": self.collection,
+            "chunking": self.chunking,
+            "files": self.files,
+            "reconciled": self.reconciled,
+        }
+        # Write-then-rename so a crash never leaves a half-written manifest behind
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.files = {}
+        self.loaded = False
+        self.reconciled = False
+
+    def get(self, file_key: str) -> Optional[Dict]:
+        return self.files.get(file_key)
+
+    def set(self, file_key: str, content_hash: str, chunks: List[Dict]):
+        self.files[file_key] = {"hash": content_hash, "chunks": chunks}
+
+    def remove(self, file_key: str):
+        self.files.pop(file_key, None)
+
+    @staticmethod
+    def point_ids(entry: Optional[Dict]) -> List[str]:
+        return [chunk["id"] for chunk in entry["chunks"]] if entry else []
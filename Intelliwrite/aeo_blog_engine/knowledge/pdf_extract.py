@@ -0,0 +1,147 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aeo_blog_engine.config.settings import Config
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+
+# --- Worker-side functions (run in pool processes; must stay importable top-level) ---
+
+def _extract_pages(path: str, start: int, end: int) -> List[str]:
+    reader = PdfReader(path)
+    return [reader.pages[index].extract_text() or "" for index in range(start, min(end, len(reader.pages)))]
+
+
+def _extract_head(path: str, pages_per_task: int) -> Tuple[int, List[str]]:
+    """First task for a file: returns its page count along with the text of its first page range."""
+    reader = PdfReader(path)
+    total = len(reader.pages)
+    return total, [reader.pages[index].extract_text() or "" for index in range(min(pages_per_task, total))]
+
+
+class _PdfJob:
+    def __init__(self, path: str, deadline: float):
+        self.path = path
+        # The per-file timeout runs from submission, not from when the result is asked for
+        self.deadline = deadline
+        self.head = None
+        self.ranges = []
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def done(self) -> bool:
+        with self.lock:
+            return self.head.ready() and all(pending.ready() for pending in self.ranges)
+
+
+class PdfExtractor:
+    """
+    Extracts PDF text in a process pool, in parallel across files and across page ranges
+    of large files. Use as a context manager; `prefetch` streams files back in their
+    original order while later PDFs are already being extracted. A file still unfinished
+    `timeout` seconds after it was submitted is given up on: the pool is terminated (which
+    kills the stuck worker) and the other in-flight files are resubmitted to a fresh one.
+    """
+
+    def __init__(self, workers: int = None, pages_per_task: int = None, timeout: float = None):
+        self.workers = workers or Config.PDF_WORKERS
+        self.pages_per_task = pages_per_task or Config.PDF_PAGES_PER_TASK
+        self.timeout = timeout or Config.PDF_EXTRACT_TIMEOUT
+        self._pool = None
+        # Submitted jobs whose result has not been collected yet, in submission order
+        self._pending: Dict[_PdfJob, None] = {}
+
+    def __enter__(self) -> "PdfExtractor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._pool is None:
+            return
+        if self._pending or exc_type is not None:
+            # Abandoned work; don't wait for it
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+        self._pool = None
+        self._pending.clear()
+
+    def _get_pool(self):
+        if self._pool is None:
+            # "spawn" keeps workers independent of the threads running in the API process
+            self._pool = multiprocessing.get_context("spawn").Pool(processes=self.workers)
+        return self._pool
+
+    def _start(self, job: _PdfJob):
+        pool = self._get_pool()
+        with job.lock:
+            job.pool = pool
+            job.ranges = []
+
+        def on_head(result):
+            # Runs in the pool's result thread: fan the remaining page ranges out right away
+            total, _ = result
+            with job.lock:
+                if job.pool is not pool:
+                    return
+                for start in range(self.pages_per_task, total, self.pages_per_task):
+                    job.ranges.append(
+                        pool.apply_async(_extract_pages, (job.path, start, start + self.pages_per_task))
+                    )
+
+        job.head = pool.apply_async(_extract_head, (job.path, self.pages_per_task), callback=on_head)
+
+    def _recycle(self):
+        """Replaces a pool with a hung worker, restarting every unfinished job on the new one."""
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+        for job in self._pending:
+            if not job.done():
+                job.deadline = time.monotonic() + self.timeout
+                self._start(job)
+
+    def submit(self, path) -> _PdfJob:
+        job = _PdfJob(str(path), time.monotonic() + self.timeout)
+        self._pending[job] = None
+        self._start(job)
+        return job
+
+    def result(self, job: _PdfJob) -> List[str]:
+        """Page texts of a submitted file, in page order. Raises TimeoutError past the per-file timeout."""
+        try:
+            _, pages = job.head.get(timeout=max(job.deadline - time.monotonic(), 0))
+            with job.lock:
+                ranges = list(job.ranges)
+            for pending in ranges:
+                pages.extend(pending.get(timeout=max(job.deadline - time.monotonic(), 0)))
+        except multiprocessing.TimeoutError:
+            self._pending.pop(job, None)
+            self._recycle()
+            raise TimeoutError(f"PDF extraction exceeded {self.timeout}s")
+        finally:
+            self._pending.pop(job, None)
+        return pages
+
+    def prefetch(self, items: Iterable[tuple], lookahead: int = None) -> Iterator[Tuple[tuple, Optional[_PdfJob]]]:
+        """
+        Yields (item, job) in input order, where item[0] is a file path and job is the
+        extraction already running for it (None for non-PDF files). Up to `lookahead`
+        items are submitted ahead of the one being consumed.
+        """
+        lookahead = lookahead or self.workers * 2
+        window = deque()
+        for item in items:
+            is_pdf = PdfReader is not None and str(item[0]).lower().endswith(".pdf")
+            window.append((item, self.submit(item[0]) if is_pdf else None))
+            if len(window) > lookahead:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
@@ -0,0 +1,406 @@
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+from agno.knowledge.document import Document
+
+from aeo_blog_engine.config.settings import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def default_store_path() -> str:
+    return Config.LOCAL_VECTOR_STORE_PATH
+
+
+@contextmanager
+def _exclusive_lock(path: str):
+    """Cross-process exclusive lock on `path` (created if missing), held for the block."""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class _Snapshot:
+    """One opened version of the store; searches use a single snapshot throughout."""
+
+    def __init__(self, version_dir: Optional[str]):
+        self.version_dir = version_dir
+        self.ids: Optional[List[str]] = None
+        if not version_dir:
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            return
+        self.vectors = np.load(os.path.join(version_dir, "vectors.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(version_dir, "offsets.npy"))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def point_ids(self) -> List[str]:
+        if self.ids is None:
+            self.ids = [record["id"] for record in self.records(range(len(self)))] if self.version_dir else []
+        return self.ids
+
+    def records(self, rows) -> List[Dict]:
+        records = []
+        with open(os.path.join(self.version_dir, "payloads.jsonl"), "rb") as handle:
+            for row in rows:
+                handle.seek(int(self.offsets[row]))
+                records.append(json.loads(handle.read(int(self.offsets[row + 1] - self.offsets[row]))))
+        return records
+
+
+class LocalVectorStore:
+    """
+    File-backed vector store with the search interface of agno's `Qdrant`.
+
+    Layout: `<path>/CURRENT` names the live version directory, which holds
+    `vectors.npy` (L2-normalised float32 rows, memory-mapped), `payloads.jsonl` (one
+    {"id", "payload"} record per row) and `offsets.npy` (byte offset of each record).
+    Opening the store only maps files, so startup stays near-instant however many chunks
+    it holds; payloads are read for the top-k hits only. Writes build a new version and
+    swap `CURRENT`, so readers never see a half-written store. Writers hold `<path>/LOCK`
+    from reading the current version to swapping in the next, so writes from several
+    processes apply one after another. Readers in other processes pick up the swap on
+    their next search; superseded versions are kept for RETIRED_VERSION_TTL seconds so
+    searches already under way can finish.
+    """
+
+    RETIRED_VERSION_TTL = 300
+
+    def __init__(self, path: str = None, embedder=None):
+        self.path = path or default_store_path()
+        self.embedder = embedder
+        self.collection = "local"
+        self._lock = threading.Lock()
+        self._batch = threading.local()
+        self._pointer = None
+        self._snapshot = _Snapshot(None)
+        self._refresh()
+
+    # --- Reading ---
+
+    def _read_pointer(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, "CURRENT"), "r", encoding="utf-8") as handle:
+                return handle.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self, force: bool = False) -> _Snapshot:
+        """The current snapshot, reopened first if another writer has swapped CURRENT."""
+        pointer = self._read_pointer()
+        if force or pointer != self._pointer:
+            self._snapshot = _Snapshot(os.path.join(self.path, pointer) if pointer else None)
+            self._pointer = pointer
+        return self._snapshot
+
+    def _read(self, read):
+        """Runs `read(snapshot)`, reopening once if the version was removed under it."""
+        try:
+            return read(self._refresh())
+        except FileNotFoundError:
+            return read(self._refresh(force=True))
+
+    def ids(self) -> List[str]:
+        return self._read(lambda snapshot: snapshot.point_ids())
+
+    def __len__(self) -> int:
+        return len(self._refresh())
+
+    def exists(self) -> bool:
+        return len(self) > 0
+
+    def search_vector(self, vector, limit: int = 5, filters: Optional[Dict] = None) -> List[Document]:
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        return self._read(lambda snapshot: self._search_snapshot(snapshot, query, limit, filters))
+
+    @staticmethod
+    def _search_snapshot(snapshot: _Snapshot, query, limit: int, filters: Optional[Dict]) -> List[Document]:
+        if not len(snapshot):
+            return []
+        scores = np.asarray(snapshot.vectors @ query)
+        # Over-fetch when filtering, since filters are applied to the top hits
+        k = min(len(scores), limit * 5 if filters else limit)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        documents = []
+        for row, record in zip(top, snapshot.records(top)):
+            payload = record["payload"]
+            meta = payload.get("meta_data", {})
+            if filters and any(meta.get(key, payload.get(key)) != value for key, value in filters.items()):
+                continue
+            documents.append(Document(
+                id=record["id"],
+                content=payload.get("content", ""),
+                name=payload.get("name"),
+                meta_data=meta,
+                reranking_score=float(scores[row]),
+            ))
+            if len(documents) == limit:
+                break
+        return documents
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict] = None, **_) -> List[Document]:
+        return self.search_vector(self.embedder.get_embedding(query), limit, filters)
+
+    async def async_search(self, query: str, limit: int = 5, filters: Optional[Dict] = None, **_) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
+
+    # --- Writing ---
+
+    @contextmanager
+    def batch(self):
+        """
+        Collects the writes made by this thread inside the block and applies them as one
+        version when it exits, instead of rewriting the store once per call.
+        """
+        if getattr(self._batch, "changes", None) is not None:
+            yield
+            return
+        self._batch.changes = changes = {"upserts": {}, "payloads": {}, "deletes": set()}
+        try:
+            yield
+        finally:
+            self._batch.changes = None
+            if changes["upserts"] or changes["payloads"] or changes["deletes"]:
+                self._write(**changes)
+
+    def write(self, upserts: Dict[str, tuple] = None, payloads: Dict[str, Dict] = None, deletes=None):
+        """
+        Applies one change set: `upserts` maps id -> (vector, payload), `payloads` maps
+        id -> replacement payload, `deletes` is a collection of ids. Inside `batch()` the
+        change is merged into the pending set; otherwise it is written as a new version.
+        """
+        changes = getattr(self._batch, "changes", None)
+        if changes is None:
+            self._write(upserts or {}, payloads or {}, set(deletes or ()))
+            return
+        for point_id in deletes or ():
+            changes["upserts"].pop(point_id, None)
+            changes["payloads"].pop(point_id, None)
+            changes["deletes"].add(point_id)
+        for point_id, (vector, payload) in (upserts or {}).items():
+            changes["upserts"][point_id] = (vector, payload)
+            changes["payloads"].pop(point_id, None)
+            changes["deletes"].discard(point_id)
+        for point_id, payload in (payloads or {}).items():
+            if point_id in changes["upserts"]:
+                changes["upserts"][point_id] = (changes["upserts"][point_id][0], payload)
+            elif point_id not in changes["deletes"]:
+                changes["payloads"][point_id] = payload
+
+    def _versions(self) -> List[int]:
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[1:]) for name in names if name.startswith("v") and name[1:].isdigit())
+
+    def _write(self, upserts: Dict[str, tuple], payloads: Dict[str, Dict], deletes: set):
+        # Existing rows are streamed across, so memory is bounded by the change set
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock, _exclusive_lock(os.path.join(self.path, "LOCK")):
+            snapshot = self._refresh()
+            ids = snapshot.point_ids()
+            keep = [row for row, point_id in enumerate(ids) if point_id not in deletes]
+            existing = set(ids)
+            appended = [point_id for point_id in upserts if point_id not in existing and point_id not in deletes]
+
+            dim = snapshot.vectors.shape[1] if len(snapshot) else (len(next(iter(upserts.values()))[0]) if upserts else 0)
+            versions = self._versions()
+            version = f"v{(versions[-1] if versions else 0) + 1}"
+            version_dir = os.path.join(self.path, version)
+            os.makedirs(version_dir, exist_ok=True)
+
+            total = len(keep) + len(appended)
+            vectors = np.lib.format.open_memmap(
+                os.path.join(version_dir, "vectors.npy"), mode="w+", dtype=np.float32, shape=(total, dim)
+            )
+            offsets = np.zeros(total + 1, dtype=np.int64)
+            kept_records = snapshot.records(keep) if keep else []
+            with open(os.path.join(version_dir, "payloads.jsonl"), "wb") as handle:
+                out_row = 0
+                for row, record in zip(keep, kept_records):
+                    point_id = record["id"]
+                    if point_id in upserts:
+                        vector, payload = upserts[point_id]
+                        vectors[out_row] = _normalize(np.asarray(vector, dtype=np.float32))
+                    else:
+                        vectors[out_row] = snapshot.vectors[row]
+                        payload = record["payload"]
+                    payload = payloads.get(point_id, payload)
+                    offsets[out_row + 1] = offsets[out_row] + handle.write(
+                        (json.dumps({"id": point_id, "payload": payload}) + "\n").encode("utf-8")
+                    )
+                    out_row += 1
+                for point_id in appended:
+                    vector, payload = upserts[point_id]
+                    vectors[out_row] = _normalize(np.asarray(vector, dtype=np.float32))
+                    payload = payloads.get(point_id, payload)
+                    offsets[out_row + 1] = offsets[out_row] + handle.write(
+                        (json.dumps({"id": point_id, "payload": payload}) + "\n").encode("utf-8")
+                    )
+                    out_row += 1
+            vectors.flush()
+            del vectors
+            np.save(os.path.join(version_dir, "offsets.npy"), offsets)
+
+            pointer = os.path.join(self.path, "CURRENT.tmp")
+            with open(pointer, "w", encoding="utf-8") as handle:
+                handle.write(version)
+            os.replace(pointer, os.path.join(self.path, "CURRENT"))
+            self._refresh()
+            self._prune()
+
+    def _prune(self):
+        """Removes versions superseded more than RETIRED_VERSION_TTL seconds ago (never the current one)."""
+        current = self._pointer
+        versions = self._versions()
+        now = time.time()
+        for older, newer in zip(versions, versions[1:]):
+            if f"v{older}" == current:
+                continue
+            try:
+                superseded_at = os.path.getmtime(os.path.join(self.path, f"v{newer}"))
+            except FileNotFoundError:
+                continue
+            if now - superseded_at > self.RETIRED_VERSION_TTL:
+                shutil.rmtree(os.path.join(self.path, f"v{older}"), ignore_errors=True)
+
+    @property
+    def client(self) -> "LocalVectorClient":
+        """QdrantClient-shaped facade, so ingestion can write here exactly as it writes to Qdrant."""
+        return LocalVectorClient(self)
+
+
+class LocalVectorClient:
+    """The subset of QdrantClient that knowledge/ingest.py uses, backed by a LocalVectorStore."""
+
+    def __init__(self, store: LocalVectorStore):
+        self.store = store
+
+    def get_collections(self):
+        return SimpleNamespace(collections=[SimpleNamespace(name=self.store.collection)])
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return self.store.exists()
+
+    def create_collection(self, collection_name: str, vectors_config=None, **_):
+        os.makedirs(self.store.path, exist_ok=True)
+
+    def upsert(self, collection_name: str, points, wait: bool = True, **_):
+        self.store.write(upserts={str(point.id): (point.vector, point.payload) for point in points})
+        return SimpleNamespace(status="completed")
+
+    def overwrite_payload(self, collection_name: str, payload: Dict, points, **_):
+        self.store.write(payloads={str(point_id): payload for point_id in points})
+
+    def batch_update_points(self, collection_name: str, update_operations, wait: bool = True, **_):
+        payloads = {}
+        for operation in update_operations:
+            overwrite = operation.overwrite_payload
+            payloads.update({str(point_id): overwrite.payload for point_id in overwrite.points})
+        self.store.write(payloads=payloads)
+        return []
+
+    def delete(self, collection_name: str, points_selector, wait: bool = True, **_):
+        self.store.write(deletes={str(point_id) for point_id in points_selector.points})
+
+    def batch(self):
+        return self.store.batch()
+
+    def scroll(self, collection_name: str, limit: int = 10, offset=None, **_):
+        ids = self.store.ids()
+        start = offset or 0
+        end = min(start + limit, len(ids))
+        return [SimpleNamespace(id=point_id) for point_id in ids[start:end]], (end if end < len(ids) else None)
+
+
+class MirroredVectorClient:
+    """
+    Sends every ingestion write to the primary client (Qdrant) and, best-effort, to a local
+    mirror store, so the local store can stand in for semantic search when Qdrant is down.
+    Reads come from the primary only.
+    """
+
+    def __init__(self, primary, mirror: LocalVectorClient):
+        self.primary = primary
+        self.mirror = mirror
+
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+
+    def _mirror(self, method: str, *args, **kwargs):
+        try:
+            getattr(self.mirror, method)(*args, **kwargs)
+        except Exception as e:
+            print(f"Note: Could not update local vector mirror ({method}): {e}")
+
+    def create_collection(self, *args, **kwargs):
+        result = self.primary.create_collection(*args, **kwargs)
+        self._mirror("create_collection", *args, **kwargs)
+        return result
+
+    def upsert(self, *args, **kwargs):
+        result = self.primary.upsert(*args, **kwargs)
+        self._mirror("upsert", *args, **kwargs)
+        return result
+
+    def overwrite_payload(self, *args, **kwargs):
+        result = self.primary.overwrite_payload(*args, **kwargs)
+        self._mirror("overwrite_payload", *args, **kwargs)
+        return result
+
+    def batch_update_points(self, *args, **kwargs):
+        result = self.primary.batch_update_points(*args, **kwargs)
+        self._mirror("batch_update_points", *args, **kwargs)
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = self.primary.delete(*args, **kwargs)
+        self._mirror("delete", *args, **kwargs)
+        return result
+
+    @contextmanager
+    def batch(self):
+        """Batches the mirror's writes; the primary is written call by call as before."""
+        pending = self.mirror.batch()
+        pending.__enter__()
+        try:
+            yield
+        finally:
+            # Whatever reached the primary before an error is applied to the mirror too
+            try:
+                pending.__exit__(None, None, None)
+            except Exception as e:
+                print(f"Note: Could not update local vector mirror (batch): {e}")
@@ -1,8 +1,10 @@
 import argparse
 
+from aeo_blog_engine.config.settings import Config
 from aeo_blog_engine.knowledge.ingest import ingest_docs
 from aeo_blog_engine.pipeline.blog_workflow import AEOBlogPipeline, langfuse
-from aeo_blog_engine.services import generate_and_store_blog, store_social_post
+from aeo_blog_engine.pipeline.stages import PROFILES
+from aeo_blog_engine.services import generate_and_store_blog, resume_blog, store_social_post, store_social_posts
 
 
 def main():
@@ -46,8 +48,22 @@ def main():
     parser.add_argument(
         "--platform",
         type=str,
+        nargs="+",
         choices=["reddit", "linkedin", "twitter"],
-        help="Generate a social media post for a specific platform"
+        help="Generate social media posts for one or more platforms (several share one research pass)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=int,
+        metavar="BLOG_ID",
+        help="Resume a failed blog from its last completed pipeline stage"
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        choices=list(PROFILES),
+        help=f"Blog pipeline profile (default: {Config.PIPELINE_PROFILE})"
     )
 
     args = parser.parse_args()
@@ -55,6 +71,12 @@ def main():
     if args.ingest:
         ingest_docs()
 
+    if args.resume:
+        result = resume_blog(args.resume, profile=args.profile)
+        print(result)
+        langfuse.flush()
+        return
+
     # Determine topic: use provided arg, or generate from prompt
     topic = args.topic
     
@@ -69,10 +91,27 @@ def main():
             print(f"-> Generated Topic: {topic}")
 
     if topic:
-        if args.platform:
+        if args.platform and len(args.platform) > 1:
+            # Generate several social media posts from one research pass
+            posts = pipeline.run_social_bundle(topic, args.platform)
+            for platform, post in posts.items():
+                print(f"\n--- {platform.upper()} POST ---\n")
+                print(post)
+
+            if not args.user_id or not args.company_url:
+                print("\n[WARN] Cannot store social posts without --user-id and --company-url")
+            else:
+                try:
+                    saved = store_social_posts(args.user_id, args.company_url, topic, posts)
+                    print(f"\n[DB] Saved {', '.join(posts)} posts to Blog ID: {saved['id']}")
+                except Exception as e:
+                    print(f"\n[DB Error] Could not save posts: {e}")
+
+        elif args.platform:
+            platform = args.platform[0]
             # Generate social media post
-            post = pipeline.run_social_post(topic, args.platform)
-            print(f"\n--- {args.platform.upper()} POST ---\n")
+            post = pipeline.run_social_post(topic, platform)
+            print(f"\n--- {platform.upper()} POST ---\n")
             print(post)
             
             # Save to database
@@ -80,8 +119,8 @@ def main():
                 print("\n[WARN] Cannot store social post without --user-id and --company-url")
             else:
                 try:
-                    saved = store_social_post(args.user_id, args.company_url, topic, args.platform, post)
-                    print(f"\n[DB] Saved {args.platform} post to Blog ID: {saved['id']}")
+                    saved = store_social_post(args.user_id, args.company_url, topic, platform, post)
+                    print(f"\n[DB] Saved {platform} post to Blog ID: {saved['id']}")
                 except Exception as e:
                     print(f"\n[DB Error] Could not save post: {e}")
 
@@ -94,6 +133,7 @@ def main():
                 "user_id": args.user_id,
                 "email_id": args.email,
                 "brand_name": args.brand,
+                "profile": args.profile,
             }
             # Note: generate_and_store_blog will re-run generation.
             # Since we already have the topic, we just pass it as 'topic'.
@@ -103,7 +143,7 @@ def main():
 
         else:
             # Generate blog only
-            result = pipeline.run(topic)
+            result = pipeline.run(topic, profile=args.profile)
             print("\n--- BLOG CONTENT ---\n")
             print(result)
 
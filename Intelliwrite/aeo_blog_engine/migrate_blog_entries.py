@@ -0,0 +1,82 @@
+import argparse
+from collections import Counter
+
+from aeo_blog_engine.database import Blog, BlogEntry, get_session, init_db
+from aeo_blog_engine.database.models import ENTRY_KINDS, entry_table_enabled
+
+BATCH_SIZE = 200
+
+
+def migrate(clear_columns: bool = False):
+    """
+    Copies blog history from the JSON list columns into blog_entries, one row per item.
+    Items already copied are skipped, so the script can be stopped and re-run at any point,
+    and the columns are left as they are: the default BLOG_ENTRY_STORAGE=columns keeps
+    reading them throughout, and table mode does not show copied items twice.
+
+    Once it has finished, set BLOG_ENTRY_STORAGE=table and run it again with
+    --clear-columns, which copies anything written in the meantime and empties the columns.
+    """
+    if clear_columns and not entry_table_enabled():
+        raise SystemExit("Set BLOG_ENTRY_STORAGE=table before clearing the columns; until then they are still read.")
+
+    print("Starting migration of blog history into 'blog_entries'...")
+    init_db()  # creates the blog_entries table if needed
+
+    last_id = 0
+    blogs_moved = 0
+    entries_moved = 0
+    while True:
+        with get_session() as session:
+            batch = (
+                session.query(Blog)
+                .filter(Blog.id > last_id)
+                .order_by(Blog.id)
+                .limit(BATCH_SIZE)
+                .with_for_update()
+                .all()
+            )
+            if not batch:
+                break
+
+            copied = Counter(
+                (row.blog_id, row.kind, row.get_content(), row.timestamp)
+                for row in session.query(BlogEntry).filter(BlogEntry.blog_id.in_([blog.id for blog in batch]))
+            )
+            for blog in batch:
+                moved = 0
+                for kind in ENTRY_KINDS:
+                    items = Blog.ensure_entries(getattr(blog, kind))
+                    for item in items:
+                        key = (blog.id, kind, item["content"], item.get("timestamp"))
+                        if copied[key]:
+                            copied[key] -= 1
+                            continue
+                        session.add(BlogEntry.build(
+                            blog_id=blog.id,
+                            kind=kind,
+                            content=item["content"],
+                            timestamp=item.get("timestamp"),
+                            is_prompt=item.get("is_prompt"),
+                        ))
+                        moved += 1
+                    if items and clear_columns:
+                        setattr(blog, kind, [])
+                if moved:
+                    blogs_moved += 1
+                    entries_moved += moved
+            last_id = batch[-1].id
+        print(f"Processed blogs up to id {last_id}: {entries_moved} entries copied so far.")
+
+    print(f"Migration complete: {entries_moved} entries copied from {blogs_moved} blogs.")
+    if clear_columns:
+        print("The JSON columns have been emptied.")
+    elif not entry_table_enabled():
+        print("Set BLOG_ENTRY_STORAGE=table, then re-run with --clear-columns to empty the JSON columns.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move blog history into the blog_entries table")
+    parser.add_argument("--clear-columns", action="store_true", help="Empty the JSON columns (table mode only)")
+    args = parser.parse_args()
+    migrate(clear_columns=args.clear_columns)
@@ -1,5 +1,14 @@
-from aeo_blog_engine.agents import get_researcher_agent, get_planner_agent, get_writer_agent, get_optimizer_agent, get_base_model, get_reddit_agent, get_linkedin_agent, get_twitter_agent, get_social_qa_agent, get_topic_generator_agent
-from agno.agent import Agent
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from aeo_blog_engine.agents import get_researcher_agent, get_planner_agent, get_writer_agent, get_optimizer_agent, get_qa_agent, get_finalizer_agent, get_reddit_agent, get_linkedin_agent, get_twitter_agent, get_social_qa_agent, get_topic_generator_agent
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.pipeline.context_budget import ContextBudgeter
+from aeo_blog_engine.pipeline.kb_context import RunKnowledge
+from aeo_blog_engine.pipeline.outline import OutlineSection, ensure_heading, split_sections
+from aeo_blog_engine.pipeline.research_cache import get_research_cache
+from aeo_blog_engine.pipeline.stages import execution_waves, get_profile
 from langfuse import observe, Langfuse
 
 # Initialize Langfuse client
@@ -9,12 +18,222 @@ class AEOBlogPipeline:
     def __init__(self):
         print("Initializing AEO Blog Pipeline with Agno Agents...")
 
+    @staticmethod
+    def _notify_stage(on_stage, stage: str):
+        """Reports stage progress to the caller; a failing callback never stops the run."""
+        if not on_stage:
+            return
+        try:
+            on_stage(stage)
+        except Exception as e:
+            print(f"Note: Could not report stage '{stage}': {e}")
+
     @observe()
-    def run(self, topic: str = None, prompt: str = None):
+    def run(self, topic: str = None, prompt: str = None, on_stage=None, checkpoints=None, profile: str = None):
+        """
+        Runs the blog stage graph of `profile` (fast / standard / thorough, see pipeline/stages.py)
+        and returns the final markdown.
+        `on_stage(stage)` is called as each stage starts (topic, research, plan, write, optimize, qa, finalize).
+        `checkpoints` (optional) is a store with `load() -> {stage: output}` and `save(stage, output)`;
+        stages found in it are skipped, and each newly completed stage is saved to it.
+        """
+        final_content = None
+        for event in self._run_stages(topic, prompt, checkpoints=checkpoints, profile=profile):
+            if event["event"] == "stage":
+                self._notify_stage(on_stage, event["stage"])
+            elif event["event"] == "complete":
+                final_content = event["content"]
+
+        # If run via prompt, we might want to return the topic too, but for now return content as per signature
+        # To handle saving, the caller might need the topic. 
+        # But `run` traditionally returns content. 
+        # We will attach the topic to the final string via a property or tuple if possible?
+        # Actually, let's keep it simple: return content. The Service layer handles DB updates.
+        return final_content
+
+    @observe()
+    def run_stream(self, topic: str = None, prompt: str = None, checkpoints=None, profile: str = None):
+        """
+        Same stages as `run`, but yields events as it goes:
+        {"event": "stage", "stage": ...} at each stage boundary,
+        {"event": "token", "content": ...} for each chunk of the final stage's output, and
+        {"event": "complete", "topic": ..., "content": ...} with the full blog at the end.
+        """
+        yield from self._run_stages(topic, prompt, stream_final=True, checkpoints=checkpoints, profile=profile)
+
+    @staticmethod
+    def _stage_event(stage: str, completed: Dict[str, str]) -> Dict:
+        event = {"event": "stage", "stage": stage}
+        if stage in completed:
+            event["resumed"] = True
+        return event
+
+    @staticmethod
+    def _run_agent(agent, message: str):
+        response = agent.run(message, stream=False)
+        return response.content, response
+
+    @staticmethod
+    def _save_checkpoint(checkpoints, stage: str, content: str):
+        if not checkpoints:
+            return
+        try:
+            checkpoints.save(stage, content)
+        except Exception as e:
+            print(f"Note: Could not checkpoint stage '{stage}': {e}")
+
+    def _checkpointed(self, stage: str, completed: Dict[str, str], checkpoints, compute):
+        """
+        Returns (content, response) for a stage, reusing its checkpointed output when an
+        earlier run got that far. `compute` must return the same pair; response is None on reuse.
+        """
+        if stage in completed:
+            return completed[stage], None
+        content, response = compute()
+        self._save_checkpoint(checkpoints, stage, content)
+        return content, response
+
+    STAGE_LABELS = {
+        "research": "Researching",
+        "plan": "Planning",
+        "write": "Writing",
+        "optimize": "Optimizing",
+        "qa": "Quality checking",
+        "finalize": "Finalizing",
+    }
+
+    @staticmethod
+    def _with_rules(parts: Dict[str, str], rules: str) -> Dict[str, str]:
+        # Shared rulebook passages are the most expendable part of a prompt
+        return {"rules": rules, **parts} if rules else parts
+
+    @staticmethod
+    def _rules_block(parts: Dict[str, str]) -> str:
+        return f"\n\nAEO rules from the knowledge base:\n{parts['rules']}" if parts.get("rules") else ""
+
+    def _build_stage_prompt(self, name: str, topic: str, outputs: Dict[str, str], budget: ContextBudgeter, knowledge: RunKnowledge):
+        """Returns (agent, message) for an LLM stage, built from the outputs of its dependencies."""
+        rules = knowledge.for_stage(name)
+
+        if name == "plan":
+            parts = budget.fit("plan", self._with_rules({"research": outputs["research"]}, rules), query=topic)
+            return get_planner_agent(), f"Topic: '{topic}'\n\nResearch:\n{parts['research']}{self._rules_block(parts)}"
+
+        if name == "write":
+            parts = budget.fit("write", self._with_rules({"research": outputs["research"], "outline": outputs["plan"]}, rules), query=topic)
+            return get_writer_agent(), f"Write the blog for '{topic}' using this outline:\n\n{parts['outline']}\n\nResearch:\n{parts['research']}{self._rules_block(parts)}"
+
+        if name == "optimize":
+            # The draft is what later stages edit, so it is measured but never shrunk
+            parts = budget.fit("optimize", self._with_rules({}, rules), fixed={"draft": outputs["write"]}, query=topic)
+            return get_optimizer_agent(), f"Draft:\n{outputs['write']}{self._rules_block(parts)}"
+
+        if name == "qa":
+            parts = budget.fit("qa", {"research": outputs["research"]}, fixed={"draft": outputs["write"]}, query=topic)
+            return get_qa_agent(), f"Draft blog post:\n{outputs['write']}\n\nResearch summary:\n{parts['research']}"
+
+        if name == "finalize":
+            suggestions = {"optimization_report": outputs.get("optimize", "")}
+            if "qa" in outputs:
+                suggestions["qa_findings"] = outputs["qa"]
+            parts = budget.fit("finalize", suggestions, fixed={"draft": outputs["write"]}, query=topic)
+            message = f"Draft:\n{outputs['write']}\n\nOptimization Suggestions:\n{parts['optimization_report']}"
+            if "qa_findings" in parts:
+                message += f"\n\nQA Findings (apply the recommended fixes):\n{parts['qa_findings']}"
+            return get_finalizer_agent(), message + "\n\nProduce the Final Blog Post."
+
+        raise ValueError(f"Unknown pipeline stage: '{name}'")
+
+    def _execute_stage(self, name: str, topic: str, outputs: Dict[str, str], budget: ContextBudgeter, knowledge: RunKnowledge, run_info: Dict):
+        if name == "research":
+            research_summary, research_response, cache_hit = self._research(topic)
+            run_info["research_cache"] = "hit" if cache_hit else "miss"
+            return research_summary, research_response
+        if name == "write" and Config.WRITER_MODE == "sections":
+            sections = split_sections(outputs["plan"])
+            if len(sections) >= 2:
+                return self._write_sections(topic, sections, outputs, budget, knowledge)
+            print("Outline has fewer than two H2 sections; writing it in one pass.")
+        return self._run_agent(*self._build_stage_prompt(name, topic, outputs, budget, knowledge))
+
+    def _write_sections(self, topic: str, sections: List[OutlineSection], outputs: Dict[str, str], budget: ContextBudgeter, knowledge: RunKnowledge):
+        """
+        Writes the introduction and each H2 section of the outline with concurrent writer calls
+        sharing the same research, then stitches them back in outline order.
+        Returns (content, responses).
+        """
+        rules = knowledge.for_stage("write")
+        parts = budget.fit("write", self._with_rules({"research": outputs["research"], "outline": outputs["plan"]}, rules), query=topic)
+        shared = f"Full outline, for context only:\n{parts['outline']}\n\nResearch:\n{parts['research']}{self._rules_block(parts)}"
+
+        messages = [
+            f"Write ONLY the H1 title and a short answer-first introduction for the blog '{topic}'. "
+            f"Do not write any H2 sections; they are written separately.\n\n{shared}"
+        ]
+        for index, section in enumerate(sections, start=1):
+            messages.append(
+                f"Write ONLY section {index} of {len(sections)} of the blog '{topic}': '{section.heading}'. "
+                f"Start with its H2 header, then cover this part of the outline. The other sections are "
+                f"written separately, so do not repeat them or add an introduction of your own.\n\n"
+                f"Section outline:\n{section.outline}\n\n{shared}"
+            )
+
+        def write(message: str):
+            # Resolved inside the worker so each thread uses its own writer agent
+            return self._run_agent(get_writer_agent(), message)
+
+        print(f"Writing introduction + {len(sections)} sections concurrently...")
+        with ThreadPoolExecutor(max_workers=max(1, min(Config.WRITER_SECTION_CONCURRENCY, len(messages)))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, write, message) for message in messages]
+            results = [future.result() for future in futures]
+
+        intro, _ = results[0]
+        body = [ensure_heading(content, section.heading) for section, (content, _) in zip(sections, results[1:])]
+        return "\n\n".join([intro.strip(), *body]), [response for _, response in results]
+
+    def _run_wave(self, wave, topic: str, outputs: Dict[str, str], budget: ContextBudgeter, knowledge: RunKnowledge, completed, checkpoints, run_info: Dict):
+        """Runs the stages of one wave, concurrently when there is more than one."""
+
+        def run_stage(name: str):
+            return self._checkpointed(
+                name, completed, checkpoints, lambda: self._execute_stage(name, topic, outputs, budget, knowledge, run_info)
+            )
+
+        if len(wave) == 1:
+            return {wave[0].name: run_stage(wave[0].name)}
+
+        with ThreadPoolExecutor(max_workers=len(wave)) as executor:
+            futures = {
+                stage.name: executor.submit(contextvars.copy_context().run, run_stage, stage.name)
+                for stage in wave
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def _stream_stage(self, name: str, topic: str, outputs: Dict[str, str], budget: ContextBudgeter, knowledge: RunKnowledge, result: Dict):
+        """Streams an LLM stage's output as token events; fills `result` with (content, response)."""
+        agent, message = self._build_stage_prompt(name, topic, outputs, budget, knowledge)
+        response = None
+        chunks = []
+        for chunk in agent.run(message, stream=True, stream_events=True):
+            event_name = getattr(chunk, "event", None)
+            if event_name == "RunCompleted":
+                # Carries the aggregated metrics for usage reporting
+                response = chunk
+            elif event_name == "RunContent" and isinstance(chunk.content, str) and chunk.content:
+                chunks.append(chunk.content)
+                yield {"event": "token", "content": chunk.content}
+        result[name] = ("".join(chunks), response)
+
+    def _run_stages(self, topic: str = None, prompt: str = None, stream_final: bool = False, checkpoints=None, profile: str = None):
         if not topic and not prompt:
             raise ValueError("Either 'topic' or 'prompt' must be provided.")
 
-        print(f"--- Starting AEO Blog Generation ---")
+        profile = profile or Config.PIPELINE_PROFILE
+        stages = get_profile(profile)
+        # The last stage of a profile produces the published blog
+        output_stage = stages[-1].name
+
+        print(f"--- Starting AEO Blog Generation ({profile} profile) ---")
         
         total_input_tokens = 0
         total_output_tokens = 0
@@ -22,7 +241,8 @@ class AEOBlogPipeline:
         # 0. Topic Generation (if needed)
         topic_gen_response = None
         if prompt and not topic:
-            print(f"\n[0/5] Generating Topic from Prompt: '{prompt}'...")
+            print(f"\n[0/{len(stages)}] Generating Topic from Prompt: '{prompt}'...")
+            yield {"event": "stage", "stage": "topic"}
             topic_generator = get_topic_generator_agent()
             topic_gen_response = topic_generator.run(f"Generate a blog topic for: {prompt}", stream=False)
             topic = topic_gen_response.content.strip()
@@ -30,49 +250,56 @@ class AEOBlogPipeline:
 
         print(f"Target Topic: {topic}")
 
-        # 1. Research
-        print("\n[1/5] Researching...")
-        researcher = get_researcher_agent()
-        research_response = researcher.run(f"Research key facts, statistics, and user questions about: {topic}", stream=False)
-        research_summary = research_response.content
-        
-        # 2. Plan
-        print("\n[2/5] Planning...")
-        planner = get_planner_agent()
-        plan_response = planner.run(f"Topic: '{topic}'\n\nResearch:\n{research_summary}", stream=False)
-        plan = plan_response.content
-        
-        # 3. Write
-        print("\n[3/5] Writing...")
-        writer = get_writer_agent()
-        draft_response = writer.run(f"Write the blog for '{topic}' using this outline:\n\n{plan}\n\nResearch:\n{research_summary}", stream=False)
-        draft = draft_response.content
-        
-        # 4. Optimize
-        print("\n[4/5] Optimizing...")
-        optimizer = get_optimizer_agent()
-        opt_response = optimizer.run(f"Draft:\n{draft}", stream=False)
-        optimization_report = opt_response.content
-        
-        # 5. Finalize
-        print("\n[5/5] Finalizing...")
-        finalizer = Agent(
-            model=get_base_model(),
-            instructions=["""You are the Final Editor. Your goal is to produce the final, publish-ready markdown file.
-            1. Take the Draft and apply the improvements from the Optimization Report.
-            2. Ensure the formatting is perfect Markdown.
-            3. STRICTLY output ONLY the blog content. No \"Here is the blog\" conversation.
-            """],
-            markdown=True
-        )
-        final_response = finalizer.run(f"Draft:\n{draft}\n\nOptimization Suggestions:\n{optimization_report}\n\nProduce the Final Blog Post.", stream=False)
+        # Outputs of stages completed by an earlier, failed run of this blog/topic
+        completed = checkpoints.load() if checkpoints else {}
+        budget = ContextBudgeter()
+        # Rulebook passages are retrieved once per run and shared by the stages that need them
+        knowledge = RunKnowledge(topic)
+        if completed:
+            print(f"Resuming from checkpoints: {', '.join(completed)}")
+
+        outputs: Dict[str, str] = {}
+        stage_responses = {}
+        # Research that was not run in this pass is reported as such, not as a cache hit
+        run_info = {"research_cache": "checkpoint" if "research" in completed else "skipped"}
+        step = 0
+        for wave in execution_waves(stages):
+            for stage in wave:
+                step += 1
+                print(f"\n[{step}/{len(stages)}] {self.STAGE_LABELS.get(stage.name, stage.name)}...")
+                yield self._stage_event(stage.name, completed)
+
+            stream_this_wave = (
+                stream_final
+                and [stage.name for stage in wave] == [output_stage]
+                and output_stage not in completed
+                and output_stage != "research"
+                # Section-parallel writes are stitched, so they arrive as one chunk
+                and not (output_stage == "write" and Config.WRITER_MODE == "sections")
+            )
+            if stream_this_wave:
+                results = {}
+                yield from self._stream_stage(output_stage, topic, outputs, budget, knowledge, results)
+                self._save_checkpoint(checkpoints, output_stage, results[output_stage][0])
+            else:
+                results = self._run_wave(wave, topic, outputs, budget, knowledge, completed, checkpoints, run_info)
+                if stream_final and output_stage in results:
+                    yield {"event": "token", "content": results[output_stage][0]}
+
+            for name, (content, response) in results.items():
+                outputs[name] = content
+                stage_responses[name] = response
+
+        final_content = outputs[output_stage]
         
         # --- Capture Aggregate Token Usage ---
         try:
             # Agno responses contain metadata with usage information
-            responses = [research_response, plan_response, draft_response, opt_response, final_response]
-            if topic_gen_response:
-                responses.insert(0, topic_gen_response)
+            responses = [topic_gen_response]
+            for resp in stage_responses.values():
+                # Section-parallel writes report one response per writer call
+                responses.extend(resp if isinstance(resp, list) else [resp])
+            responses = [resp for resp in responses if resp]
                 
             for resp in responses:
                 if hasattr(resp, 'metrics') and resp.metrics:
@@ -84,7 +311,7 @@ class AEOBlogPipeline:
                 name="Total_Pipeline_Usage",
                 model="gemini-flash-latest",
                 input=prompt if prompt else topic,
-                output=final_response.content,
+                output=final_content,
                 usage_details={
                     "prompt_tokens": total_input_tokens,
                     "completion_tokens": total_output_tokens,
@@ -92,7 +319,12 @@ class AEOBlogPipeline:
                 },
                 metadata={
                     "source": "agno-agent-aggregation",
-                    "generated_topic": topic if prompt else None
+                    "generated_topic": topic if prompt else None,
+                    "profile": profile,
+                    "research_cache": run_info["research_cache"],
+                    "resumed_stages": [name for name in completed if name in outputs],
+                    "context_budget": budget.report(),
+                    "kb_retrieval": knowledge.report()
                 }
             )
             generation.end()
@@ -101,12 +333,26 @@ class AEOBlogPipeline:
         except Exception as e:
             print(f"Note: Could not capture token usage: {e}")
 
-        # If run via prompt, we might want to return the topic too, but for now return content as per signature
-        # To handle saving, the caller might need the topic. 
-        # But `run` traditionally returns content. 
-        # We will attach the topic to the final string via a property or tuple if possible?
-        # Actually, let's keep it simple: return content. The Service layer handles DB updates.
-        return final_response.content
+        yield {"event": "complete", "topic": topic, "content": final_content}
+
+    def _research(self, topic: str):
+        """
+        Runs the researcher, reusing a cached summary for the same topic when available.
+        Returns (research_summary, research_response, cache_hit); the response is None on a cache hit.
+        """
+        cache = get_research_cache()
+        cached = cache.get(topic) if cache else None
+        if cached is not None:
+            print(f"Research cache hit for '{topic}' ({len(cached)} chars).")
+            return cached, None, True
+
+        researcher = get_researcher_agent()
+        research_response = researcher.run(f"Research key facts, statistics, and user questions about: {topic}", stream=False)
+        research_summary = research_response.content
+        if cache:
+            cache.set(topic, research_summary)
+        print(f"Research completed ({len(research_summary)} chars).")
+        return research_summary, research_response, False
 
     def generate_topic_only(self, prompt: str) -> str:
         """Helper to just generate a topic without running the full pipeline."""
@@ -116,31 +362,19 @@ class AEOBlogPipeline:
 
     # ----------------- Social Media Posts -----------------
 
-    @observe()
-    def run_social_post(self, topic: str, platform: str):
-        print(f"--- Starting Social Post Generation for: {topic} ({platform}) ---")
-
-        # 1. Research (Reusing the researcher from the blog flow)
-        print("\n[1/3] Researching...")
-        researcher = get_researcher_agent()
-        research_response = researcher.run(
-            f"Research key facts and trends about: {topic}",
-            stream=False
-        )
-        research_summary = research_response.content
-        print(f"Research completed ({len(research_summary)} chars).")
-
-        # 2. Write Post
-        print(f"\n[2/3] Writing {platform} post...")
-
+    def _get_social_writer(self, platform: str):
         if platform.lower() == "reddit":
-            writer = get_reddit_agent()
+            return get_reddit_agent()
         elif platform.lower() == "linkedin":
-            writer = get_linkedin_agent()
+            return get_linkedin_agent()
         elif platform.lower() == "twitter":
-            writer = get_twitter_agent()
-        else:
-            raise ValueError(f"Unsupported platform: {platform}")
+            return get_twitter_agent()
+        raise ValueError(f"Unsupported platform: {platform}")
+
+    def _write_social_post(self, topic: str, platform: str, research_summary: str):
+        """Writes and QA-checks one platform post. Returns (content, responses)."""
+        print(f"\n[2/3] Writing {platform} post...")
+        writer = self._get_social_writer(platform)
 
         # Pass the research as context to the social writer
         prompt = (
@@ -150,7 +384,7 @@ class AEOBlogPipeline:
 
         draft_response = writer.run(prompt, stream=False)
         draft_content = draft_response.content
-        
+
         # 3. QA & Refine
         print(f"\n[3/3] QA Checking for {platform} compliance...")
         qa_agent = get_social_qa_agent()
@@ -158,40 +392,113 @@ class AEOBlogPipeline:
             f"Platform: {platform}\nDraft Post:\n{draft_content}\n\nReview and fix if necessary.",
             stream=False
         )
-        final_content = qa_response.content
+        return qa_response.content, [draft_response, qa_response]
 
-        # --- Capture Aggregate Token Usage for Social ---
+    def _record_usage(self, name: str, input, output, responses, metadata):
+        """Records a Langfuse generation with the summed token usage of `responses`."""
         try:
             total_input_tokens = 0
             total_output_tokens = 0
-            
-            responses = [research_response, draft_response, qa_response]
+
             for resp in responses:
                 if hasattr(resp, 'metrics') and resp.metrics:
                     total_input_tokens += getattr(resp.metrics, "input_tokens", 0)
                     total_output_tokens += getattr(resp.metrics, "output_tokens", 0)
-            
+
             generation = langfuse.start_generation(
-                name=f"Social_Post_Usage_{platform}",
+                name=name,
                 model="gemini-flash-latest",
-                input=topic,
-                output=final_content,
+                input=input,
+                output=output,
                 usage_details={
                     "prompt_tokens": total_input_tokens,
                     "completion_tokens": total_output_tokens,
                     "total_tokens": total_input_tokens + total_output_tokens
                 },
-                metadata={
-                    "source": "agno-agent-social",
-                    "platform": platform
-                }
+                metadata=metadata
             )
             generation.end()
         except Exception as e:
             print(f"Note: Could not capture token usage: {e}")
 
+    @observe()
+    def run_social_post(self, topic: str, platform: str):
+        print(f"--- Starting Social Post Generation for: {topic} ({platform}) ---")
+        # Fail fast on an unknown platform before spending a research call
+        self._get_social_writer(platform)
+
+        # 1. Research (Reusing the researcher from the blog flow)
+        print("\n[1/3] Researching...")
+        research_summary, research_response, cache_hit = self._research(topic)
+
+        final_content, responses = self._write_social_post(topic, platform, research_summary)
+        if research_response:
+            responses.insert(0, research_response)
+
+        # --- Capture Aggregate Token Usage for Social ---
+        self._record_usage(
+            f"Social_Post_Usage_{platform}",
+            input=topic,
+            output=final_content,
+            responses=responses,
+            metadata={
+                "source": "agno-agent-social",
+                "platform": platform,
+                "research_cache": "hit" if cache_hit else "miss"
+            },
+        )
+
         return final_content
 
+    @observe()
+    def run_social_bundle(self, topic: str, platforms: List[str]) -> Dict[str, str]:
+        """
+        Generates posts for several platforms from a single research pass.
+        Writer + QA chains for each platform run concurrently.
+        Returns a dict of platform -> final post content, in request order.
+        """
+        platforms = list(dict.fromkeys(p.lower() for p in platforms or []))
+        if not platforms:
+            raise ValueError("At least one platform must be provided.")
+        for platform in platforms:
+            self._get_social_writer(platform)
+
+        print(f"--- Starting Social Bundle Generation for: {topic} ({', '.join(platforms)}) ---")
+
+        print("\n[1/3] Researching (shared across platforms)...")
+        research_summary, research_response, cache_hit = self._research(topic)
+
+        # Each task runs in a copy of the current context so Langfuse spans stay nested
+        # under this trace.
+        with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+            futures = {
+                platform: executor.submit(
+                    contextvars.copy_context().run,
+                    self._write_social_post, topic, platform, research_summary,
+                )
+                for platform in platforms
+            }
+            results = {platform: future.result() for platform, future in futures.items()}
+
+        posts = {platform: content for platform, (content, _) in results.items()}
+        responses = [research_response] if research_response else []
+        for _, platform_responses in results.values():
+            responses.extend(platform_responses)
+
+        self._record_usage(
+            "Social_Bundle_Usage",
+            input=topic,
+            output=posts,
+            responses=responses,
+            metadata={
+                "source": "agno-agent-social",
+                "platforms": platforms,
+                "research_cache": "hit" if cache_hit else "miss"
+            },
+        )
+
+        return posts
+
 if __name__ == "__main__":
     pipeline = AEOBlogPipeline()
     result = pipeline.run("What Is Answer Engine Optimization?")
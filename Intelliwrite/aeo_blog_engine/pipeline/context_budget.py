@@ -0,0 +1,159 @@
+import re
+from typing import Dict, List, Optional
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(*])")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "what", "when", "why", "with", "your", "you",
+}
+
+
+def _terms(text: str) -> set:
+    return {word for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS and len(word) > 2}
+
+
+def _normalize_line(line: str) -> str:
+    return " ".join(_WORD_RE.findall(line.lower()))
+
+
+def _units(text: str) -> List[str]:
+    """Splits text into lines, and long prose lines into sentences, keeping markdown markers."""
+    units = []
+    for line in text.splitlines():
+        if len(line) > 300 and not line.lstrip().startswith(("#", "|")):
+            units.extend(_SENTENCE_SPLIT_RE.split(line))
+        else:
+            units.append(line)
+    return units
+
+
+def deduplicate(text: str, seen: Optional[set] = None) -> str:
+    """Drops repeated lines/sentences; `seen` carries lines already present in other prompt parts."""
+    seen = seen if seen is not None else set()
+    kept = []
+    for unit in _units(text):
+        key = _normalize_line(unit)
+        if key and not unit.lstrip().startswith("#"):
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(unit)
+    return "\n".join(kept)
+
+
+def compress(text: str, max_tokens: int, query: str = "") -> str:
+    """
+    Extractive compression: keeps headings plus the lines that best match the query
+    (and carry numbers, which are usually the facts worth keeping), in original order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    query_terms = _terms(query)
+    units = _units(text)
+    scored = []
+    for index, unit in enumerate(units):
+        stripped = unit.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("#"):
+            score = float("inf")
+        else:
+            terms = _terms(stripped)
+            overlap = len(terms & query_terms) / (len(query_terms) or 1)
+            has_numbers = 0.3 if re.search(r"\d", stripped) else 0.0
+            position = 0.2 * (1 - index / len(units))
+            score = overlap + has_numbers + position
+        scored.append((score, index, unit))
+
+    budget_chars = max_tokens * CHARS_PER_TOKEN
+    selected = set()
+    used = 0
+    for score, index, unit in sorted(scored, key=lambda item: (-item[0], item[1])):
+        cost = len(unit) + 1
+        if used + cost > budget_chars:
+            continue
+        selected.add(index)
+        used += cost
+
+    return "\n".join(units[index] for index in sorted(selected))
+
+
+def trim(text: str, max_tokens: int) -> str:
+    """Hard cut at a line boundary when compression alone could not reach the budget."""
+    budget_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget_chars:
+        return text
+    cut = text.rfind("\n", 0, budget_chars)
+    return text[: cut if cut > 0 else budget_chars]
+
+
+class ContextBudgeter:
+    """
+    Fits the variable parts of each stage prompt into a per-stage token budget and keeps
+    a per-run tally of the tokens saved. One instance is used per pipeline run.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, enabled: Optional[bool] = None, min_part_tokens: Optional[int] = None):
+        self.budgets = budgets if budgets is not None else Config.CONTEXT_BUDGETS
+        self.enabled = Config.CONTEXT_BUDGET_ENABLED if enabled is None else enabled
+        self.min_part_tokens = Config.CONTEXT_PART_MIN_TOKENS if min_part_tokens is None else min_part_tokens
+        self.stages: Dict[str, Dict[str, int]] = {}
+
+    def fit(self, stage: str, parts: Dict[str, str], fixed: Optional[Dict[str, str]] = None, query: str = "") -> Dict[str, str]:
+        """
+        `parts` may be shrunk and are listed most-expendable first; `fixed` parts (e.g. the
+        draft being edited) are only counted against the budget. Each part keeps at least
+        `min_part_tokens`, so a draft longer than the budget cannot squeeze the research or
+        rules out entirely; tokens still over budget are recorded as `overflow`.
+        Returns the fitted parts.
+        """
+        fixed = fixed or {}
+        fixed_tokens = sum(estimate_tokens(text) for text in fixed.values())
+        before = fixed_tokens + sum(estimate_tokens(text or "") for text in parts.values())
+
+        fitted = dict(parts)
+        budget = self.budgets.get(stage)
+        if self.enabled and parts:
+            # Lines already present in the less expendable parts (or fixed ones) are redundant
+            seen = set()
+            for text in fixed.values():
+                seen.update(_normalize_line(line) for line in _units(text))
+            for name in reversed(list(parts)):
+                fitted[name] = deduplicate(parts[name] or "", seen)
+
+            if budget:
+                over = fixed_tokens + sum(estimate_tokens(text) for text in fitted.values()) - budget
+                for name in list(parts):
+                    if over <= 0:
+                        break
+                    current = estimate_tokens(fitted[name])
+                    target = max(current - over, min(current, self.min_part_tokens))
+                    if target >= current:
+                        continue
+                    fitted[name] = compress(fitted[name], target, query=query)
+                    fitted[name] = trim(fitted[name], target)
+                    over -= current - estimate_tokens(fitted[name])
+
+        after = fixed_tokens + sum(estimate_tokens(text or "") for text in fitted.values())
+        self.stages[stage] = {
+            "budget": budget,
+            "tokens_before": before,
+            "tokens_after": after,
+            "tokens_saved": before - after,
+            "overflow": max(after - budget, 0) if budget else 0,
+        }
+        return fitted
+
+    def report(self) -> Dict:
+        return {
+            "tokens_before": sum(s["tokens_before"] for s in self.stages.values()),
+            "tokens_after": sum(s["tokens_after"] for s in self.stages.values()),
+            "tokens_saved": sum(s["tokens_saved"] for s in self.stages.values()),
+            "overflow": sum(s["overflow"] for s in self.stages.values()),
+            "stages": self.stages,
+        }
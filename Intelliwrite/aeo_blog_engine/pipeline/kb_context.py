@@ -0,0 +1,74 @@
+import threading
+from typing import Dict, List, Optional
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.knowledge_base import get_knowledge_base
+
+# What each stage needs from the rulebook; stages sharing a need share one search
+STAGE_NEEDS = {
+    "plan": "structure",
+    "write": "style",
+    "optimize": "optimization",
+}
+
+NEED_QUERIES = {
+    "structure": "AEO blog outline structure: question-led H2 sections, answer-first hierarchy, user questions",
+    "style": "AEO writing rules: answer-first paragraphs, formatting, bold key phrases, examples",
+    "optimization": "AEO/GEO direct answers under 50 words, featured snippets, People Also Ask, keyword placement",
+}
+
+
+class RunKnowledge:
+    """
+    Run-scoped rulebook retrieval: the knowledge base is searched once per distinct need
+    (see STAGE_NEEDS) the first time a stage asks for it, and the passages are handed to
+    every stage with that need, instead of each agent running its own searches.
+    """
+
+    def __init__(self, topic: str, limit: int = None):
+        self.topic = topic
+        self.limit = limit or Config.KB_PASSAGES_PER_NEED
+        self._passages: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.searches = 0
+
+    @staticmethod
+    def enabled() -> bool:
+        return Config.KB_RETRIEVAL_MODE == "shared"
+
+    def _search(self, need: str) -> str:
+        query = f"{NEED_QUERIES[need]} ({self.topic})"
+        try:
+            documents = get_knowledge_base().search(query=query, limit=self.limit)
+        except Exception as e:
+            print(f"Note: Knowledge base search for '{need}' failed: {e}")
+            return ""
+        self.searches += 1
+        seen = set()
+        blocks: List[str] = []
+        for document in documents or []:
+            content = (document.content or "").strip()
+            if not content or content in seen:
+                continue
+            seen.add(content)
+            blocks.append(f"[{document.name}]\n{content}" if document.name else content)
+        print(f"Knowledge base: {len(blocks)} passages for '{need}'.")
+        return "\n\n".join(blocks)
+
+    def for_stage(self, stage: str) -> Optional[str]:
+        """Rulebook passages for a stage, or None when it needs none or retrieval is per-agent."""
+        need = STAGE_NEEDS.get(stage)
+        if not need or not self.enabled():
+            return None
+        # Held across the search so concurrent stages with the same need wait for one result
+        with self._lock:
+            if need not in self._passages:
+                self._passages[need] = self._search(need)
+            return self._passages[need]
+
+    def report(self) -> Dict:
+        return {
+            "mode": Config.KB_RETRIEVAL_MODE,
+            "searches": self.searches,
+            "needs": sorted(self._passages),
+        }
@@ -0,0 +1,79 @@
+import re
+from dataclasses import dataclass
+from typing import List
+
+# Planner outlines label levels either as markdown headings ("## ...") or inline
+# ("- **H2:** ...", "H2 - ..."); both forms are recognised.
+_H2_MARKER_RE = re.compile(r"^\s*(?:[-*+]\s*|\d+[.)]\s*)?(?:\*\*)?\s*H2\s*(?:\*\*)?\s*[:\-–—]\s*(?:\*\*)?\s*(.+)$", re.IGNORECASE)
+_H2_HEADING_RE = re.compile(r"^\s*##\s+(.+)$")
+_LEVEL_MARKER_RE = re.compile(r"^(?:\*\*)?\s*H[1-6]\s*(?:\*\*)?\s*[:\-–—]\s*", re.IGNORECASE)
+
+# Planner output blocks that are not part of the blog's own structure
+_META_HEADINGS = ("title options", "blog outline", "user questions", "notes for the writer", "outline")
+
+
+@dataclass
+class OutlineSection:
+    heading: str
+    outline: str
+
+
+def _clean_heading(text: str) -> str:
+    text = _LEVEL_MARKER_RE.sub("", text.strip())
+    return text.replace("**", "").strip(" #:*")
+
+
+def _is_meta(heading: str) -> bool:
+    return heading.lower().rstrip(":") in _META_HEADINGS
+
+
+def _starts_meta_block(line: str) -> bool:
+    """A top-level heading or bold label such as "## Notes for the Writer" or "**Notes for the Writer:** ..."."""
+    if not line.startswith(("#", "**")):
+        return False
+    label = _clean_heading(line.split(":", 1)[0] if line.startswith("**") else line)
+    return _is_meta(label)
+
+
+def split_sections(outline: str) -> List[OutlineSection]:
+    """
+    Splits a planner outline into its H2 sections, in outline order. Each section carries
+    the outline lines beneath its heading (H3s, questions, notes) up to the next H2.
+    Returns an empty list when the outline has no recognisable H2 structure.
+    """
+    lines = (outline or "").splitlines()
+
+    # Prefer explicit "H2:" labels; fall back to markdown "##" headings
+    marker_lines = [i for i, line in enumerate(lines) if _H2_MARKER_RE.match(line)]
+    if marker_lines:
+        pattern = _H2_MARKER_RE
+    else:
+        pattern = _H2_HEADING_RE
+        marker_lines = [
+            i for i, line in enumerate(lines)
+            if _H2_HEADING_RE.match(line) and not _is_meta(_clean_heading(_H2_HEADING_RE.match(line).group(1)))
+        ]
+
+    sections = []
+    for position, start in enumerate(marker_lines):
+        end = marker_lines[position + 1] if position + 1 < len(marker_lines) else len(lines)
+        body = []
+        for line in lines[start + 1:end]:
+            # A meta block (e.g. "Notes for the Writer") after the last section ends it
+            if _starts_meta_block(line):
+                break
+            body.append(line)
+        heading = _clean_heading(pattern.match(lines[start]).group(1))
+        sections.append(OutlineSection(heading=heading, outline="\n".join([lines[start], *body]).strip()))
+    return sections
+
+
+def ensure_heading(section_text: str, heading: str) -> str:
+    """Makes sure a separately written section starts with its H2, so stitched output keeps the outline's hierarchy."""
+    text = (section_text or "").strip()
+    if text.startswith("## ") or text.startswith("##\t"):
+        return text
+    # Demote a stray H1 the model may have used for the section title
+    if text.startswith("# "):
+        return "#" + text
+    return f"## {heading}\n\n{text}"
@@ -0,0 +1,179 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from aeo_blog_engine.config.settings import Config
+
+
+def normalize_topic(topic: str) -> str:
+    """Cache key for a topic: case, surrounding punctuation and whitespace runs are ignored."""
+    key = re.sub(r"\s+", " ", (topic or "").strip().lower())
+    return key.strip(" .!?\"'")
+
+
+class InMemoryResearchBackend:
+    """Per-process LRU store of key -> (value, stored_at)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries.move_to_end(key)
+            return item
+
+    def set(self, key: str, value: str, stored_at: float) -> int:
+        """Stores the value and returns the number of entries evicted to make room."""
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteResearchBackend:
+    """SQLite store, so every worker process on a box shares the same research results."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS research_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the backend safe to use from any thread
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM research_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE research_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+            return row
+
+    def set(self, key: str, value: str, stored_at: float) -> int:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO research_cache (key, value, stored_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, stored_at, time.time()),
+            )
+            cursor = conn.execute(
+                "DELETE FROM research_cache WHERE key IN ("
+                "SELECT key FROM research_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            return cursor.rowcount
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM research_cache WHERE key = ?", (key,))
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM research_cache").fetchone()[0]
+
+
+class ResearchCache:
+    """TTL + LRU cache of research summaries keyed by normalized topic."""
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, topic: str) -> Optional[str]:
+        key = normalize_topic(topic)
+        item = self.backend.get(key)
+        if item is None:
+            self._count("misses")
+            return None
+
+        value, stored_at = item
+        if self.ttl and time.time() - stored_at > self.ttl:
+            self.backend.delete(key)
+            self._count("expired")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return value
+
+    def set(self, topic: str, summary: str):
+        if not summary:
+            return
+        evicted = self.backend.set(normalize_topic(topic), summary, time.time())
+        if evicted:
+            self._count("evictions", evicted)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        counters["size"] = self.backend.size()
+        counters["ttl"] = self.ttl
+        counters["backend"] = type(self.backend).__name__
+        return counters
+
+
+_cached_research_cache: Optional[ResearchCache] = None
+_research_cache_lock = threading.Lock()
+
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """
+    Returns the process-wide research cache, or None when RESEARCH_CACHE_BACKEND=none.
+    """
+    global _cached_research_cache
+    if Config.RESEARCH_CACHE_BACKEND == "none":
+        return None
+
+    with _research_cache_lock:
+        if _cached_research_cache is None:
+            if Config.RESEARCH_CACHE_BACKEND == "sqlite":
+                backend = SQLiteResearchBackend(Config.RESEARCH_CACHE_PATH, Config.RESEARCH_CACHE_MAX_ENTRIES)
+            elif Config.RESEARCH_CACHE_BACKEND == "memory":
+                backend = InMemoryResearchBackend(Config.RESEARCH_CACHE_MAX_ENTRIES)
+            else:
+                raise ValueError(f"Unsupported RESEARCH_CACHE_BACKEND: {Config.RESEARCH_CACHE_BACKEND}")
+            _cached_research_cache = ResearchCache(backend, Config.RESEARCH_CACHE_TTL)
+        return _cached_research_cache
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from aeo_blog_engine.config.settings import Config
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    depends_on: Tuple[str, ...] = ()
+
+
+# Each profile is a small DAG. The last stage listed produces the published blog.
+PROFILES: Dict[str, Tuple[Stage, ...]] = {
+    # One research pass, an outline and a draft: three LLM round trips
+    "fast": (
+        Stage("research"),
+        Stage("plan", ("research",)),
+        Stage("write", ("research", "plan")),
+    ),
+    # Today's chain: topic -> research -> plan -> write -> optimize -> finalize
+    "standard": (
+        Stage("research"),
+        Stage("plan", ("research",)),
+        Stage("write", ("research", "plan")),
+        Stage("optimize", ("write",)),
+        Stage("finalize", ("write", "optimize")),
+    ),
+    # Adds a QA review of the draft, run alongside the optimizer; the finalizer applies both
+    "thorough": (
+        Stage("research"),
+        Stage("plan", ("research",)),
+        Stage("write", ("research", "plan")),
+        Stage("optimize", ("write",)),
+        Stage("qa", ("research", "write")),
+        Stage("finalize", ("write", "optimize", "qa")),
+    ),
+}
+
+
+def get_profile(name: str = None) -> Tuple[Stage, ...]:
+    name = name or Config.PIPELINE_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown pipeline profile: '{name}'. Choose one of: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def execution_waves(stages: Tuple[Stage, ...]) -> List[List[Stage]]:
+    """
+    Groups stages into waves: every stage in a wave depends only on earlier waves,
+    so the stages within a wave can run concurrently.
+    """
+    names = {stage.name for stage in stages}
+    done = set()
+    pending = list(stages)
+    waves = []
+    while pending:
+        wave = [stage for stage in pending if all(dep in done for dep in stage.depends_on)]
+        if not wave:
+            missing = {dep for stage in pending for dep in stage.depends_on if dep not in names}
+            raise ValueError(f"Stage graph has a cycle or unknown dependencies: {missing or pending}")
+        waves.append(wave)
+        done.update(stage.name for stage in wave)
+        pending = [stage for stage in pending if stage.name not in done]
+    return waves
@@ -0,0 +1,148 @@
+import argparse
+import json
+import time
+
+from sqlalchemy import Text, cast, select, update
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.database import Blog, BlogEntry, get_session, init_db
+from aeo_blog_engine.database.compression import storage_codec
+
+BATCH_SIZE = 200
+
+
+class _Totals:
+    """Row, byte and timing counters for one of the two passes."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.rows = self.changed = self.bytes_before = self.bytes_after = 0
+        self.decode_seconds = self.encode_seconds = 0.0
+
+    def report(self):
+        if not self.rows:
+            print(f"No {self.label} to rewrite.")
+            return
+        saved = self.bytes_before - self.bytes_after
+        print(
+            f"Done with {self.label}: {self.changed} of {self.rows} rows rewritten; "
+            f"{self.bytes_before} -> {self.bytes_after} bytes ({saved} saved, {saved / max(self.bytes_before, 1):.1%})."
+        )
+        print(
+            f"Per row: {self.bytes_before / self.rows:.0f} -> {self.bytes_after / self.rows:.0f} bytes, "
+            f"decode {self.decode_seconds * 1000 / self.rows:.3f} ms, encode {self.encode_seconds * 1000 / self.rows:.3f} ms."
+        )
+
+
+def _recompress_columns(batch_size: int, dry_run: bool) -> _Totals:
+    """Blog bodies kept in the blogs.blog JSON column ("columns" storage mode)."""
+    totals = _Totals("blog columns")
+    column = Blog.__table__.c.blog
+    blog_type = column.type
+    last_id = 0
+    while True:
+        with get_session() as session:
+            dialect = session.get_bind().dialect
+            batch = session.execute(
+                select(Blog.id, cast(column, Text))
+                .where(Blog.id > last_id)
+                .order_by(Blog.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+
+            for blog_id, stored in batch:
+                stored = stored or ""
+                start = time.perf_counter()
+                entries = blog_type.process_result_value(stored, dialect)
+                totals.decode_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                encoded = blog_type._to_entries(entries)
+                rewritten = json.dumps(encoded)
+                totals.encode_seconds += time.perf_counter() - start
+
+                totals.rows += 1
+                before = len(stored.encode("utf-8"))
+                totals.bytes_before += before
+                try:
+                    current = json.loads(stored)
+                except json.JSONDecodeError:
+                    current = None
+                # Compared as data: Postgres prints JSONB with its own key order and spacing
+                if encoded == current:
+                    totals.bytes_after += before
+                    continue
+                totals.changed += 1
+                totals.bytes_after += len(rewritten.encode("utf-8"))
+                if not dry_run:
+                    session.execute(update(Blog).where(Blog.id == blog_id).values(blogs=entries))
+            last_id = batch[-1].id
+        print(f"Processed blogs up to id {last_id}: {totals.rows} rows, {totals.bytes_before - totals.bytes_after} bytes saved so far.")
+    return totals
+
+
+def _recompress_entries(batch_size: int, dry_run: bool) -> _Totals:
+    """Blog bodies kept as blog_entries rows ("table" storage mode)."""
+    totals = _Totals("blog entries")
+    last_id = 0
+    while True:
+        with get_session() as session:
+            batch = (
+                session.query(BlogEntry)
+                .filter(BlogEntry.id > last_id, BlogEntry.kind.in_(BlogEntry.COMPRESSED_KINDS))
+                .order_by(BlogEntry.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+
+            for row in batch:
+                start = time.perf_counter()
+                content = row.get_content()
+                totals.decode_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                rewritten = BlogEntry(kind=row.kind)
+                rewritten.set_content(content)
+                totals.encode_seconds += time.perf_counter() - start
+
+                totals.rows += 1
+                totals.bytes_before += len(row.content.encode("utf-8"))
+                totals.bytes_after += len(rewritten.content.encode("utf-8"))
+                if (rewritten.content, rewritten.compressed) == (row.content, row.compressed):
+                    continue
+                totals.changed += 1
+                if not dry_run:
+                    row.content, row.compressed = rewritten.content, rewritten.compressed
+            last_id = batch[-1].id
+        print(f"Processed blog entries up to id {last_id}: {totals.rows} rows, {totals.bytes_before - totals.bytes_after} bytes saved so far.")
+    return totals
+
+
+def recompress(batch_size: int = BATCH_SIZE, dry_run: bool = False):
+    """
+    Rewrites stored blog bodies in the current BLOG_COMPRESSION mode, both the blogs.blog column
+    and blog_entries rows, so rows written before it was enabled are compressed, or, with
+    BLOG_COMPRESSION=none, decompressed again. Each batch is its own transaction and rewriting a
+    row twice changes nothing, so the script can be stopped and re-run at any point. Reports the
+    bytes saved and the time spent decoding and encoding per row.
+    """
+    codec = storage_codec() or "none"
+    print(f"Rewriting blog bodies with compression '{codec}'{' (dry run)' if dry_run else ''}...")
+    init_db()
+
+    for totals in (_recompress_columns(batch_size, dry_run), _recompress_entries(batch_size, dry_run)):
+        totals.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=recompress.__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Measure and report without writing")
+    args = parser.parse_args()
+    if Config.BLOG_COMPRESSION == "none" and not args.dry_run:
+        print("Note: BLOG_COMPRESSION is 'none', so compressed rows will be written back uncompressed.")
+    recompress(batch_size=args.batch_size, dry_run=args.dry_run)
@@ -1,19 +1,55 @@
-from typing import Dict
+import contextvars
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from aeo_blog_engine.config.settings import Config
 from aeo_blog_engine.database import (
-    Blog,
+    add_topic_if_new,
     append_social_post,
+    claim_blog_for_resume,
     create_blog_entry,
+    create_blog_job,
+    delete_pipeline_checkpoints,
     get_blog_by_id,
+    get_blog_job,
     get_session,
     get_blog_by_user_and_company,
+    get_blog_history,
+    get_pipeline_checkpoints,
+    init_db,
+    save_pipeline_checkpoint,
+    update_blog_job,
     update_blog_status,
 )
 from aeo_blog_engine.pipeline.blog_workflow import AEOBlogPipeline
+from aeo_blog_engine.pipeline.stages import get_profile
 
 
 pipeline = AEOBlogPipeline()
 
+_locks_guard = threading.Lock()
+# Weak values: an entry lives only while some request holds it, so the maps stay bounded
+_blog_row_locks: "weakref.WeakValueDictionary[Tuple[str, str], threading.Lock]" = weakref.WeakValueDictionary()
+_user_semaphores: "weakref.WeakValueDictionary[str, threading.BoundedSemaphore]" = weakref.WeakValueDictionary()
+
+
+def _blog_row_lock(user_id: str, company_url: str) -> threading.Lock:
+    with _locks_guard:
+        lock = _blog_row_locks.get((user_id, company_url))
+        if lock is None:
+            lock = _blog_row_locks[(user_id, company_url)] = threading.Lock()
+        return lock
+
+
+def _user_slots(user_id: str) -> threading.BoundedSemaphore:
+    with _locks_guard:
+        slots = _user_semaphores.get(user_id)
+        if slots is None:
+            slots = _user_semaphores[user_id] = threading.BoundedSemaphore(Config.BATCH_PER_USER_LIMIT)
+        return slots
+
 
 def _get_or_create_blog(session, *, user_id: str, company_url: str, topic: str, email_id=None, brand_name=None, is_prompt="false"):
     blog = get_blog_by_user_and_company(session, user_id=user_id, company_url=company_url)
@@ -25,12 +61,8 @@ def _get_or_create_blog(session, *, user_id: str, company_url: str, topic: str,
             blog.brand_name = brand_name
             
         # Ensure topic is tracked
-        topics = Blog.ensure_entries(blog.topic)
-        contents = Blog.entry_contents(topics)
-        if topic and topic not in contents:
+        if topic and add_topic_if_new(session, blog, topic, is_prompt):
             print(f"Appending new topic to existing blog: '{topic}'")
-            topics.append(Blog.make_entry(topic, is_prompt=is_prompt))
-            blog.topic = topics
         session.add(blog)
         session.flush()
         return blog
@@ -47,7 +79,7 @@ def _get_or_create_blog(session, *, user_id: str, company_url: str, topic: str,
     )
 
 
-def generate_and_store_blog(payload: Dict) -> Dict:
+def _validate_payload(payload: Dict):
     # Allow prompt instead of topic
     if not payload.get("topic") and not payload.get("prompt"):
         raise ValueError("Missing required field: 'topic' or 'prompt'")
@@ -58,6 +90,11 @@ def generate_and_store_blog(payload: Dict) -> Dict:
     if not payload.get("user_id"):
         raise ValueError("Missing required field: 'user_id'")
 
+    if payload.get("profile"):
+        get_profile(payload["profile"])
+
+
+def _resolve_topic(payload: Dict) -> str:
     topic = payload.get("topic")
     prompt = payload.get("prompt")
 
@@ -71,46 +108,334 @@ def generate_and_store_blog(payload: Dict) -> Dict:
     if not topic or not str(topic).strip():
         raise ValueError("Topic is missing or could not be generated from prompt.")
 
-    topic = topic.strip()
+    return topic.strip()
+
+
+class _DatabaseCheckpoints:
+    """Pipeline checkpoint store backed by the pipeline_checkpoints table."""
+
+    def __init__(self, blog_id: int, topic: str):
+        init_db()
+        self.blog_id = blog_id
+        self.topic = topic
+
+    def load(self) -> Dict[str, str]:
+        with get_session() as session:
+            return {
+                checkpoint.stage: checkpoint.content
+                for checkpoint in get_pipeline_checkpoints(session, blog_id=self.blog_id, topic=self.topic)
+            }
+
+    def save(self, stage: str, content: str):
+        with get_session() as session:
+            save_pipeline_checkpoint(session, blog_id=self.blog_id, topic=self.topic, stage=stage, content=content)
+
+
+def _store_completed_blog(blog_id: int, topic: str, blog_content: str, is_prompt="false") -> Dict:
+    with get_session() as session:
+        updated = update_blog_status(
+            session,
+            blog_id,
+            status="COMPLETED",
+            blog_content=blog_content,
+            topic=topic,
+            is_prompt=is_prompt,
+        )
+        # The run succeeded, so its stage outputs must not be reused by the next request
+        delete_pipeline_checkpoints(session, blog_id=blog_id, topic=topic)
+        return updated.to_dict()
+
+
+def _mark_running(blog_id: int):
+    # Blogs with a run in progress are neither reset by new jobs nor claimed by resume_blog
+    with get_session() as session:
+        update_blog_status(session, blog_id, status="RUNNING")
+
+
+def _mark_failed(blog_id: int):
+    try:
+        with get_session() as session:
+            update_blog_status(session, blog_id, status="FAILED")
+    except Exception as e:
+        print(f"Could not mark blog {blog_id} as FAILED: {e}")
+
+
+def _run_and_store(blog_id: int, topic: str, is_prompt="false", on_stage=None, profile: str = None) -> Dict:
+    try:
+        _mark_running(blog_id)
+        # Run the pipeline with the finalized topic, resuming any stages a failed run completed
+        blog_content = pipeline.run(
+            topic, on_stage=on_stage, checkpoints=_DatabaseCheckpoints(blog_id, topic), profile=profile
+        )
+        return _store_completed_blog(blog_id, topic, blog_content, is_prompt)
+    except Exception as exc:
+        _mark_failed(blog_id)
+        raise exc
+
+
+def _prepare_blog(payload: Dict) -> Tuple[int, str, str]:
+    """Validates the payload, resolves the topic and finds or creates the blog row."""
+    _validate_payload(payload)
+    topic = _resolve_topic(payload)
+
     company_url = payload["company_url"].strip()
     user_id = payload["user_id"].strip()
     email_id = payload.get("email_id")
     brand_name = payload.get("brand_name")
     is_prompt = payload.get("is_prompt", "false")
 
-    with get_session() as session:
+    # Concurrent requests for the same user/company must not create duplicate rows
+    with _blog_row_lock(user_id, company_url):
+        with get_session() as session:
+            blog_entry = _get_or_create_blog(
+                session,
+                user_id=user_id,
+                topic=topic,
+                company_url=company_url,
+                email_id=email_id,
+                brand_name=brand_name,
+                is_prompt=is_prompt,
+            )
+            blog_id = blog_entry.id
+
+    return blog_id, topic, is_prompt
+
+
+def generate_and_store_blog(payload: Dict) -> Dict:
+    blog_id, topic, is_prompt = _prepare_blog(payload)
+    return _run_and_store(blog_id, topic, is_prompt, profile=payload.get("profile"))
+
+
+def generate_and_store_blogs(payloads: List[Dict], max_concurrency: int = None) -> List[Dict]:
+    """
+    Runs the blog pipeline over many payloads with at most `max_concurrency` pipelines
+    in flight, and at most BATCH_PER_USER_LIMIT per user. Each blog is stored as soon as
+    it finishes. Returns one status dict per payload, in input order.
+    """
+    if len(payloads) > Config.BATCH_MAX_ITEMS:
+        raise ValueError(f"Batch too large: {len(payloads)} items (max {Config.BATCH_MAX_ITEMS})")
+
+    max_concurrency = min(max_concurrency or Config.BATCH_MAX_CONCURRENCY, Config.BATCH_MAX_CONCURRENCY)
+
+    def run_item(index: int, payload: Dict) -> Dict:
+        try:
+            blog_id, topic, is_prompt = _prepare_blog(payload)
+        except Exception as exc:
+            return {"index": index, "status": "FAILED", "error": str(exc)}
+
+        with _user_slots(payload["user_id"].strip()):
+            try:
+                blog = _run_and_store(blog_id, topic, is_prompt, profile=payload.get("profile"))
+            except Exception as exc:
+                return {"index": index, "status": "FAILED", "blog_id": blog_id, "topic": topic, "error": str(exc)}
+        return {"index": index, "status": "COMPLETED", "blog_id": blog_id, "topic": topic, "blog": blog}
+
+    if not payloads:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(payloads)))) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_item, index, payload)
+            for index, payload in enumerate(payloads)
+        ]
+        return [future.result() for future in futures]
+
+
+def stream_and_store_blog(payload: Dict) -> Iterator[Dict]:
+    """
+    Validates the payload up front, then returns a generator of pipeline events
+    (see `AEOBlogPipeline.run_stream`). The final blog is persisted before the
+    closing {"event": "done"} event is yielded.
+    """
+    _validate_payload(payload)
+
+    def events():
+        # The response headers are already sent, so setup failures must arrive as an event too
+        try:
+            topic = payload.get("topic")
+            if payload.get("prompt") and not topic:
+                yield {"event": "stage", "stage": "topic"}
+            topic = _resolve_topic(payload)
+            is_prompt = payload.get("is_prompt", "false")
+
+            user_id = payload["user_id"].strip()
+            company_url = payload["company_url"].strip()
+            with _blog_row_lock(user_id, company_url), get_session() as session:
+                blog_entry = _get_or_create_blog(
+                    session,
+                    user_id=user_id,
+                    topic=topic,
+                    company_url=company_url,
+                    email_id=payload.get("email_id"),
+                    brand_name=payload.get("brand_name"),
+                    is_prompt=is_prompt,
+                )
+                blog_id = blog_entry.id
+        except Exception as exc:
+            yield {"event": "error", "error": str(exc)}
+            return
+
+        settled = False
+        try:
+            yield {"event": "blog", "blog_id": blog_id, "topic": topic}
+
+            _mark_running(blog_id)
+            blog_content = None
+            checkpoints = _DatabaseCheckpoints(blog_id, topic)
+            for event in pipeline.run_stream(topic, checkpoints=checkpoints, profile=payload.get("profile")):
+                if event["event"] == "complete":
+                    blog_content = event["content"]
+                    continue
+                yield event
+
+            result = _store_completed_blog(blog_id, topic, blog_content, is_prompt)
+            settled = True
+        except Exception as exc:
+            _mark_failed(blog_id)
+            settled = True
+            yield {"event": "error", "blog_id": blog_id, "error": str(exc)}
+            return
+        finally:
+            if not settled:
+                # The client went away mid-run (GeneratorExit), so nothing will finish this blog
+                _mark_failed(blog_id)
+
+        yield {"event": "done", "blog": result}
+
+    return events()
+
+
+def submit_blog_job(payload: Dict) -> Dict:
+    """
+    Queues a blog for asynchronous generation. The blog row is created (or reset) in
+    PENDING state right away, unless another job is generating it; topic generation from
+    a prompt is deferred to the worker.
+    """
+    _validate_payload(payload)
+    init_db()
+
+    topic = (payload.get("topic") or "").strip() or None
+    user_id = payload["user_id"].strip()
+    company_url = payload["company_url"].strip()
+
+    with _blog_row_lock(user_id, company_url), get_session() as session:
         blog_entry = _get_or_create_blog(
             session,
             user_id=user_id,
             topic=topic,
             company_url=company_url,
-            email_id=email_id,
-            brand_name=brand_name,
-            is_prompt=is_prompt,
+            email_id=payload.get("email_id"),
+            brand_name=payload.get("brand_name"),
+            is_prompt=payload.get("is_prompt", "false"),
         )
-        blog_id = blog_entry.id
+        if blog_entry.status != "RUNNING":
+            blog_entry.status = "PENDING"
+        job = create_blog_job(session, blog_id=blog_entry.id, payload=payload)
+        return {"job_id": job.id, "blog_id": blog_entry.id, "status": job.status}
 
-    try:
-        # Run the pipeline with the finalized topic
-        blog_content = pipeline.run(topic)
+
+def submit_blog_jobs(payloads: List[Dict]) -> List[Dict]:
+    """Queues one blog job per payload; returns one dict per payload, in input order."""
+    if len(payloads) > Config.BATCH_MAX_ITEMS:
+        raise ValueError(f"Batch too large: {len(payloads)} items (max {Config.BATCH_MAX_ITEMS})")
+
+    results = []
+    for index, payload in enumerate(payloads):
+        try:
+            results.append({"index": index, **submit_blog_job(payload)})
+        except Exception as exc:
+            results.append({"index": index, "status": "FAILED", "error": str(exc)})
+    return results
+
+
+def run_blog_job(job_id: int, payload: Dict, blog_id: int) -> Dict:
+    """Executes a claimed job, recording stage progress on the job row."""
+
+    def on_stage(stage: str):
         with get_session() as session:
-            updated = update_blog_status(
-                session,
-                blog_id,
-                status="COMPLETED",
-                blog_content=blog_content,
-                topic=topic,
-                is_prompt=is_prompt,
-            )
-            return updated.to_dict()
+            update_blog_job(session, job_id, stage=stage)
+
+    try:
+        _mark_running(blog_id)
+        if payload.get("prompt") and not payload.get("topic"):
+            on_stage("topic")
+        try:
+            topic = _resolve_topic(payload)
+        except Exception:
+            with get_session() as session:
+                update_blog_status(session, blog_id, status="FAILED")
+            raise
+
+        result = _run_and_store(
+            blog_id, topic, payload.get("is_prompt", "false"), on_stage=on_stage, profile=payload.get("profile")
+        )
     except Exception as exc:
         with get_session() as session:
-            update_blog_status(
-                session,
-                blog_id,
-                status="FAILED",
+            update_blog_job(session, job_id, status="FAILED", error=str(exc))
+        raise
+
+    with get_session() as session:
+        update_blog_job(session, job_id, status="COMPLETED", stage="done")
+    return result
+
+
+def fetch_blog_job(job_id: int) -> Optional[Dict]:
+    with get_session() as session:
+        job = get_blog_job(session, job_id)
+        if not job:
+            return None
+        return job.to_dict()
+
+
+class BlogNotResumable(ValueError):
+    """The blog exists but has no failed run to resume, or a run is in progress."""
+
+
+def _unfinished_topic(checkpoints, output_stage: str) -> Optional[str]:
+    """Topic of the latest checkpointed run that never reached `output_stage`."""
+    finished = {checkpoint.topic for checkpoint in checkpoints if checkpoint.stage == output_stage}
+    return next((checkpoint.topic for checkpoint in reversed(checkpoints) if checkpoint.topic not in finished), None)
+
+
+def resume_blog(blog_id: int, profile: str = None, topic: str = None) -> Dict:
+    """
+    Re-runs a failed topic of a blog, restarting from the last stage its previous run
+    completed. The topic defaults to the latest run that left checkpoints without reaching
+    the profile's final stage; without checkpoints the latest topic of a FAILED blog is
+    regenerated from scratch. Checkpoints outlive a later topic's success, so such a run
+    can be resumed on a COMPLETED blog too. The claim is atomic, so two resume requests
+    cannot both start a run, and blogs with a run in progress are refused.
+    """
+    output_stage = get_profile(profile)[-1].name
+    init_db()
+    with get_session() as session:
+        blog = get_blog_by_id(session, blog_id)
+        if not blog:
+            raise ValueError(f"Blog with id {blog_id} not found")
+
+        topics = blog.entries_for("topic")
+        checkpoints = get_pipeline_checkpoints(session, blog_id=blog_id)
+        if topic is None:
+            topic = _unfinished_topic(checkpoints, output_stage)
+        elif topic not in {entry["content"] for entry in topics} | {checkpoint.topic for checkpoint in checkpoints}:
+            raise ValueError(f"Blog with id {blog_id} has no topic '{topic}'")
+        if topic is None:
+            if not topics:
+                raise ValueError(f"Blog with id {blog_id} has no topic to resume")
+            topic = topics[-1]["content"]
+        # Keep the flag the topic was stored with (whether it came from a prompt)
+        is_prompt = next(
+            (entry.get("is_prompt") or "false" for entry in reversed(topics) if entry["content"] == topic), "false"
+        )
+
+        checkpointed = any(checkpoint.topic == topic for checkpoint in checkpoints)
+        if not claim_blog_for_resume(session, blog_id, ("FAILED", "COMPLETED") if checkpointed else ("FAILED",)):
+            raise BlogNotResumable(
+                f"Blog with id {blog_id} is {blog.status}; only FAILED blogs, or topics left "
+                "unfinished by a failed run, can be resumed"
             )
-        raise exc
+
+    return _run_and_store(blog_id, topic, is_prompt, profile=profile)
 
 
 def fetch_blog(blog_id: int) -> Dict:
@@ -129,6 +454,17 @@ def fetch_blog_by_user(user_id: str, company_url: str) -> Dict:
         return blog.to_dict()
 
 
+def fetch_blog_history(user_id: str, company_url: str, kinds, limit: Optional[int] = None, since=None) -> Optional[Dict]:
+    """
+    Only the requested history lists (e.g. ("topic",)) of the latest blog, optionally the
+    newest `limit` entries of each and/or those since an ISO-8601 time. None when not found.
+    """
+    with get_session() as session:
+        return get_blog_history(
+            session, user_id=user_id, company_url=company_url, kinds=kinds, limit=limit, since=since
+        )
+
+
 def store_social_post(user_id: str, company_url: str, topic: str, platform: str, content: str) -> Dict:
     """
     Finds or creates the blog entry for the given user/company and updates it with the social post.
@@ -142,3 +478,19 @@ def store_social_post(user_id: str, company_url: str, topic: str, platform: str,
         )
         append_social_post(session, blog, platform, content)
         return blog.to_dict()
+
+
+def store_social_posts(user_id: str, company_url: str, topic: str, posts: Dict[str, str]) -> Dict:
+    """
+    Same as `store_social_post`, but persists several platform posts in one session.
+    """
+    with get_session() as session:
+        blog = _get_or_create_blog(
+            session,
+            user_id=user_id,
+            company_url=company_url,
+            topic=topic,
+        )
+        for platform, content in posts.items():
+            append_social_post(session, blog, platform, content)
+        return blog.to_dict()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from aeo_blog_engine.config.settings import Config
+
+# Importing the database package opens an engine for DATABASE_URL (Postgres by default).
+# The tests use their own SQLite engines, so none of them needs that server or its driver.
+with patch.object(Config, "DATABASE_URL", "sqlite://"):
+    import aeo_blog_engine.database  # noqa: F401
+
+from aeo_blog_engine.database.models import Base  # noqa: E402
+
+
+class TempDatabase:
+    """A throwaway SQLite file with the full schema, plus a get_session() bound to it."""
+
+    def __init__(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self._tmp.name, 'blogs.sqlite3')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+
+    @contextmanager
+    def get_session(self):
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def close(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+
+def import_services():
+    """
+    Imports the services module without network access: the agents module builds its
+    knowledge base at import time, so point it at the in-memory KB with a placeholder key.
+    """
+    with patch.object(Config, "GEMINI_API_KEY", Config.GEMINI_API_KEY or "test-key"), \
+            patch.object(Config, "QDRANT_URL", ":memory:"):
+        from aeo_blog_engine import services
+    return services
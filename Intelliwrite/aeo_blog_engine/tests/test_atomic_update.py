@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import sessionmaker
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.database import repository
+from aeo_blog_engine.database.models import Base, Blog, JSONBList
+from aeo_blog_engine.database.repository import (
+    add_topic_if_new,
+    append_social_post,
+    clear_schema_cache,
+    create_blog_entry,
+    update_blog_status,
+)
+
+
+class TestAtomicUpdateSQLite(unittest.TestCase):
+    """History appends in "columns" storage mode, done as a single JSON1 UPDATE on SQLite."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self._tmp.name, 'blogs.sqlite3')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+        patcher = patch.object(Config, "BLOG_ENTRY_STORAGE", "columns")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with self.Session() as session:
+            blog = create_blog_entry(session, user_id="u1", topic="First topic", company_url="https://example.com")
+            session.commit()
+            self.blog_id = blog.id
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def _contents(self, kind):
+        with self.Session() as session:
+            return Blog.entry_contents(getattr(session.get(Blog, self.blog_id), kind))
+
+    def test_concurrent_appends_are_both_kept(self):
+        stale_session = self.Session()
+        stale = stale_session.get(Blog, self.blog_id)
+        self.assertEqual(stale.linkedin_post, [])
+
+        with self.Session() as session:
+            append_social_post(session, session.get(Blog, self.blog_id), "linkedin", "Post one")
+            session.commit()
+        # The stale copy never saw "Post one"; a read-modify-write would drop it
+        append_social_post(stale_session, stale, "linkedin", "Post two")
+        stale_session.commit()
+        stale_session.close()
+
+        self.assertEqual(self._contents("linkedin_post"), ["Post one", "Post two"])
+
+    def test_unique_append_is_deduplicated_in_sql(self):
+        stale_session = self.Session()
+        stale = stale_session.get(Blog, self.blog_id)
+        stale.topic  # loaded before the other writer adds the topic
+
+        with self.Session() as session:
+            self.assertTrue(add_topic_if_new(session, session.get(Blog, self.blog_id), "Second topic"))
+            session.commit()
+        add_topic_if_new(stale_session, stale, "Second topic")
+        stale_session.commit()
+        stale_session.close()
+
+        self.assertEqual(self._contents("topic"), ["First topic", "Second topic"])
+
+    def test_status_update_appends_body_and_refreshes_loaded_blog(self):
+        with self.Session() as session:
+            loaded = session.get(Blog, self.blog_id)
+            self.assertEqual(loaded.status, "PENDING")
+            blog = update_blog_status(session, self.blog_id, status="COMPLETED", blog_content="Body", topic="First topic")
+            session.commit()
+
+            self.assertIs(blog, loaded)
+            self.assertEqual(loaded.status, "COMPLETED")
+            self.assertEqual(Blog.entry_contents(loaded.blogs), ["Body"])
+        self.assertEqual(self._contents("topic"), ["First topic"])
+
+    def test_legacy_value_falls_back_to_read_modify_write(self):
+        with self.engine.begin() as connection:
+            connection.execute(text("UPDATE blogs SET reddit_post = 'plain legacy text' WHERE id = :id"), {"id": self.blog_id})
+
+        with self.Session() as session:
+            append_social_post(session, session.get(Blog, self.blog_id), "reddit", "New post")
+            session.commit()
+
+        self.assertEqual(self._contents("reddit_post"), ["plain legacy text", "New post"])
+
+    def test_missing_blog(self):
+        with self.Session() as session:
+            with self.assertRaises(ValueError):
+                update_blog_status(session, self.blog_id + 1, status="FAILED")
+
+
+class TestJSONBList(unittest.TestCase):
+    def test_binds_jsonb_on_postgres_and_text_elsewhere(self):
+        column = JSONBList()
+        items = [{"content": "Post", "timestamp": "t1"}]
+
+        self.assertIsInstance(column.load_dialect_impl(postgresql.dialect()), JSONB)
+        self.assertEqual(column.process_bind_param(items, postgresql.dialect()), items)
+        self.assertEqual(column.process_bind_param(items, sqlite.dialect()), '[{"content": "Post", "timestamp": "t1"}]')
+
+
+class TestNativeJsonColumnsCache(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        clear_schema_cache()
+        self.addCleanup(clear_schema_cache)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _lookups(self, ttl, calls=2):
+        with patch.object(Config, "SCHEMA_CACHE_TTL", ttl), \
+                patch.object(repository, "inspect", wraps=repository.inspect) as inspect:
+            for _ in range(calls):
+                repository._native_json_columns(self.session)
+        return inspect.call_count
+
+    def test_column_types_are_cached_until_the_ttl_or_a_clear(self):
+        self.assertEqual(self._lookups(ttl=300), 1)
+        self.assertEqual(self._lookups(ttl=300), 0)
+        clear_schema_cache()
+        self.assertEqual(self._lookups(ttl=300), 1)
+        self.assertEqual(self._lookups(ttl=0), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from aeo_blog_engine.knowledge.chunking import chunk_pages, chunk_text
+
+
+class TestChunkText(unittest.TestCase):
+    def test_short_text_is_one_chunk(self):
+        chunks = chunk_text("Answer first. Then explain.", size=100, overlap=10, markdown=False)
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].text, "Answer first. Then explain.")
+        self.assertEqual((chunks[0].index, chunks[0].offset), (0, 0))
+
+    def test_chunks_respect_size_and_overlap(self):
+        text = " ".join(f"Sentence number {i} is here." for i in range(60))
+        chunks = chunk_text(text, size=200, overlap=40, markdown=False)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.text), 200)
+            self.assertEqual(text[chunk.offset:chunk.offset + len(chunk.text)], chunk.text)
+        for previous, current in zip(chunks, chunks[1:]):
+            # Each window starts inside the previous one, on a word boundary
+            self.assertLess(current.offset, previous.offset + len(previous.text))
+            self.assertEqual(text[current.offset - 1], " ")
+        self.assertEqual([chunk.index for chunk in chunks], list(range(len(chunks))))
+
+    def test_headings_start_chunks_and_are_recorded(self):
+        text = "Intro line.\n\n## What is AEO?\nAEO means answer engine optimization.\n\n## Why it matters\nAnswers get cited."
+        chunks = chunk_text(text, size=500, overlap=50)
+
+        self.assertEqual([chunk.heading for chunk in chunks], [None, "What is AEO?", "Why it matters"])
+        self.assertTrue(chunks[1].text.startswith("## What is AEO?"))
+        self.assertEqual(chunks[2].meta()["heading"], "Why it matters")
+
+    def test_heading_stays_with_its_section(self):
+        chunks = chunk_text("# Title\n## Section\nBody text.", size=500, overlap=0)
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].heading, "Title")
+
+    def test_blank_text_has_no_chunks(self):
+        self.assertEqual(chunk_text("  \n\n  ", size=100, overlap=10), [])
+
+
+class TestChunkPages(unittest.TestCase):
+    def test_pages_are_chunked_separately_and_numbered(self):
+        chunks = chunk_pages(["First page.", "", "Third page."], size=100, overlap=10)
+
+        self.assertEqual([chunk.text for chunk in chunks], ["First page.", "Third page."])
+        self.assertEqual([chunk.page for chunk in chunks], [1, 3])
+        self.assertEqual([chunk.index for chunk in chunks], [0, 1])
+        self.assertEqual(chunks[1].meta()["page"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
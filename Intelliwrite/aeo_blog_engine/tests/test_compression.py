@@ -0,0 +1,147 @@
+import base64
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.database.compression import (
+    COMPRESSED_KEY,
+    compress_entry,
+    compress_text,
+    decompress_entry,
+    decompress_text,
+    storage_codec,
+    zstandard,
+)
+from aeo_blog_engine.database.models import BlogEntry, JSONList
+from aeo_blog_engine.database.repository import add_blog_entry, create_blog_entry, get_blog_history
+from aeo_blog_engine import recompress_blogs
+from aeo_blog_engine.tests import TempDatabase
+
+BODY = "## What is AEO?\n\nAnswer engine optimization puts the answer first. " * 40
+
+
+class TestCompressText(unittest.TestCase):
+    def test_zlib_round_trip(self):
+        packed = compress_text(BODY, "zlib")
+
+        self.assertTrue(packed.startswith("1:zlib:"))
+        self.assertLess(len(packed), len(BODY))
+        self.assertEqual(decompress_text(packed), BODY)
+
+    @unittest.skipUnless(zstandard, "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        packed = compress_text(BODY, "zstd")
+
+        self.assertTrue(packed.startswith("1:zstd:"))
+        self.assertEqual(decompress_text(packed), BODY)
+
+    def test_non_ascii_round_trip(self):
+        text = "Résumé – naïve café ✓ " * 50
+        self.assertEqual(decompress_text(compress_text(text, "zlib")), text)
+
+    def test_unknown_format_or_codec(self):
+        with self.assertRaises(ValueError):
+            decompress_text("2:zlib:abc")
+        with self.assertRaises(ValueError):
+            decompress_text("1:lz4:abc")
+
+
+class TestCompressEntry(unittest.TestCase):
+    def test_entry_round_trip_keeps_other_fields(self):
+        entry = {"content": BODY, "timestamp": "2026-01-01T00:00:00+00:00", "is_prompt": "false"}
+        packed = compress_entry(entry, "zlib")
+
+        self.assertNotIn("content", packed)
+        self.assertIn(COMPRESSED_KEY, packed)
+        self.assertEqual(packed["timestamp"], entry["timestamp"])
+        self.assertEqual(decompress_entry(packed), entry)
+
+    def test_short_or_incompressible_content_is_left_alone(self):
+        short = {"content": "Short.", "timestamp": None}
+        random_text = {"content": base64.b85encode(os.urandom(600)).decode("ascii"), "timestamp": None}
+
+        self.assertIs(compress_entry(short, "zlib"), short)
+        self.assertEqual(compress_entry({"content": BODY}, None), {"content": BODY})
+        with patch.object(Config, "BLOG_COMPRESSION_MIN_CHARS", 10):
+            self.assertIs(compress_entry(random_text, "zlib"), random_text)
+
+    def test_plain_items_pass_through(self):
+        self.assertEqual(decompress_entry({"content": "x"}), {"content": "x"})
+        self.assertEqual(decompress_entry("legacy string"), "legacy string")
+
+
+class TestStorageCodec(unittest.TestCase):
+    def test_setting(self):
+        with patch.object(Config, "BLOG_COMPRESSION", "none"):
+            self.assertIsNone(storage_codec())
+        with patch.object(Config, "BLOG_COMPRESSION", "zlib"):
+            self.assertEqual(storage_codec(), "zlib")
+        with patch.object(Config, "BLOG_COMPRESSION", "brotli"):
+            with self.assertRaises(ValueError):
+                storage_codec()
+
+
+class TestCompressedColumn(unittest.TestCase):
+    def test_column_round_trip(self):
+        column = JSONList(compress=True)
+        items = [{"content": BODY, "timestamp": "t1"}, {"content": "Short.", "timestamp": "t2"}]
+        with patch.object(Config, "BLOG_COMPRESSION", "zlib"):
+            stored = column.process_bind_param(items, None)
+
+        self.assertIn(COMPRESSED_KEY, json.loads(stored)[0])
+        self.assertLess(len(stored), len(json.dumps(items)))
+        # Reads decode whatever the current setting is
+        with patch.object(Config, "BLOG_COMPRESSION", "none"):
+            self.assertEqual(column.process_result_value(stored, None), items)
+
+
+class TestCompressedEntryRows(unittest.TestCase):
+    """Blog bodies stored as blog_entries rows ("table" storage mode)."""
+
+    def setUp(self):
+        self.db = TempDatabase()
+        self.addCleanup(self.db.close)
+        for name, value in (("BLOG_ENTRY_STORAGE", "table"), ("BLOG_COMPRESSION", "zlib")):
+            patcher = patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_blog_bodies_are_compressed_and_topics_are_not(self):
+        with self.db.get_session() as session:
+            blog_id = create_blog_entry(session, user_id="u1", topic="First topic", company_url="https://example.com").id
+            add_blog_entry(session, blog_id=blog_id, kind="blogs", content=BODY)
+            add_blog_entry(session, blog_id=blog_id, kind="topic", content=BODY)
+
+        with self.db.get_session() as session:
+            rows = {row.kind: row for row in session.query(BlogEntry).filter(BlogEntry.content != "First topic")}
+            self.assertTrue(rows["blogs"].compressed)
+            self.assertTrue(rows["blogs"].content.startswith("1:zlib:"))
+            self.assertFalse(rows["topic"].compressed)
+
+            with patch.object(Config, "BLOG_COMPRESSION", "none"):
+                history = get_blog_history(session, user_id="u1", company_url="https://example.com", kinds=["blogs", "topic"])
+        self.assertEqual([entry["content"] for entry in history["blogs"]], [BODY])
+        self.assertEqual([entry["content"] for entry in history["topic"]], ["First topic", BODY])
+
+    def test_recompress_rewrites_entry_rows(self):
+        with patch.object(Config, "BLOG_COMPRESSION", "none"), self.db.get_session() as session:
+            blog_id = create_blog_entry(session, user_id="u1", topic="First topic", company_url="https://example.com").id
+            add_blog_entry(session, blog_id=blog_id, kind="blogs", content=BODY)
+
+        with patch.object(recompress_blogs, "get_session", self.db.get_session), \
+                patch.object(recompress_blogs, "init_db", lambda: None):
+            recompress_blogs.recompress(dry_run=True)
+            with self.db.get_session() as session:
+                self.assertFalse(session.query(BlogEntry).filter(BlogEntry.kind == "blogs").one().compressed)
+
+            recompress_blogs.recompress()
+            with self.db.get_session() as session:
+                row = session.query(BlogEntry).filter(BlogEntry.kind == "blogs").one()
+                self.assertTrue(row.compressed)
+                self.assertEqual(row.get_content(), BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from aeo_blog_engine.pipeline.context_budget import ContextBudgeter, deduplicate, estimate_tokens
+
+
+def _lines(prefix, count):
+    return "\n".join(f"{prefix} fact {i}: answer engines cite {i * 7} sources." for i in range(count))
+
+
+class TestContextBudgeter(unittest.TestCase):
+    def test_within_budget_is_unchanged(self):
+        budgeter = ContextBudgeter({"write": 1000}, enabled=True)
+        parts = {"research": "Short research.", "rules": "Short rules."}
+
+        self.assertEqual(budgeter.fit("write", parts), parts)
+        self.assertEqual(budgeter.report()["tokens_saved"], 0)
+
+    def test_disabled_does_nothing(self):
+        budgeter = ContextBudgeter({"write": 10}, enabled=False)
+        parts = {"research": _lines("r", 50)}
+
+        self.assertEqual(budgeter.fit("write", parts), parts)
+
+    def test_shrinks_most_expendable_part_first(self):
+        budgeter = ContextBudgeter({"write": 600}, enabled=True)
+        parts = {"research": _lines("research", 60), "rules": _lines("rule", 10)}
+        fitted = budgeter.fit("write", parts, query="answer engines")
+
+        self.assertLessEqual(sum(estimate_tokens(text) for text in fitted.values()), 600)
+        self.assertEqual(fitted["rules"], parts["rules"])
+        self.assertLess(len(fitted["research"]), len(parts["research"]))
+        self.assertGreater(budgeter.report()["tokens_saved"], 0)
+        self.assertEqual(budgeter.report()["overflow"], 0)
+
+    def test_oversized_fixed_part_keeps_a_minimum_and_reports_overflow(self):
+        budgeter = ContextBudgeter({"optimize": 500}, enabled=True, min_part_tokens=100)
+        parts = {"research": _lines("research", 60), "rules": _lines("rule", 60)}
+        fitted = budgeter.fit("optimize", parts, fixed={"draft": "x" * 4000})
+
+        for name in parts:
+            self.assertGreater(estimate_tokens(fitted[name]), 50)
+            self.assertLessEqual(estimate_tokens(fitted[name]), 100)
+        stage = budgeter.report()["stages"]["optimize"]
+        self.assertEqual(stage["overflow"], stage["tokens_after"] - 500)
+        self.assertGreater(budgeter.report()["overflow"], 0)
+
+    def test_lines_repeated_across_parts_are_dropped_from_the_expendable_one(self):
+        budgeter = ContextBudgeter({}, enabled=True)
+        shared = "AEO means answering the question in the first sentence."
+        fitted = budgeter.fit("plan", {"research": f"{shared}\nOnly in research.", "rules": shared})
+
+        self.assertEqual(fitted, {"research": "Only in research.", "rules": shared})
+
+
+class TestDeduplicate(unittest.TestCase):
+    def test_keeps_headings_and_drops_repeats(self):
+        text = "## Heading\nSame line.\nsame line!\n## Heading\nOther line."
+
+        self.assertEqual(deduplicate(text), "## Heading\nSame line.\n## Heading\nOther line.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agno.knowledge.document import Document
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.hybrid import HybridKnowledge, reciprocal_rank_fusion
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+    def test_scores_sum_over_rankings(self):
+        scores = reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60)
+
+        self.assertAlmostEqual(scores["a"], 1 / 61)
+        self.assertAlmostEqual(scores["b"], 1 / 62 + 1 / 61)
+        self.assertAlmostEqual(scores["c"], 1 / 62)
+        self.assertEqual(max(scores, key=scores.get), "b")
+
+    def test_empty_rankings(self):
+        self.assertEqual(reciprocal_rank_fusion([]), {})
+        self.assertEqual(reciprocal_rank_fusion([[], []]), {})
+
+
+class _FakeVectorDb:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def search(self, query, limit=5, filters=None):
+        return self.documents[:limit]
+
+
+class TestHybridKnowledge(unittest.TestCase):
+    def test_fuses_dense_and_lexical_hits_by_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = Path(tmp, "docs")
+            docs.mkdir()
+            (docs / "a.txt").write_text("Zebra crossings slow traffic.", encoding="utf-8")
+            (docs / "b.txt").write_text("Answer engines quote short answers.", encoding="utf-8")
+            dense = [
+                Document(content="Answer engines quote short answers.", name="b.txt"),
+                Document(content="Unrelated dense hit.", name="c.txt"),
+            ]
+            knowledge = HybridKnowledge(_FakeVectorDb(dense), docs_dir=str(docs), candidates=5, rrf_k=60)
+            with patch.object(Config, "LEXICAL_INDEX_PATH", str(Path(tmp, "index.npz"))):
+                results = knowledge.search("answer engines", limit=3)
+
+        contents = [document.content for document in results]
+        # Found by both retrievers, so it is ranked first and listed once
+        self.assertEqual(contents[0], "Answer engines quote short answers.")
+        self.assertEqual(contents.count("Answer engines quote short answers."), 1)
+        self.assertIn("Unrelated dense hit.", contents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from aeo_blog_engine.database.models import Blog, BlogJob
+from aeo_blog_engine.database.repository import (
+    claim_next_blog_job,
+    create_blog_entry,
+    create_blog_job,
+    requeue_stale_blog_jobs,
+)
+from aeo_blog_engine.tests import TempDatabase, import_services
+
+services = import_services()
+
+
+class BlogJobTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db = TempDatabase()
+        self.addCleanup(self.db.close)
+        with self.db.get_session() as session:
+            blog = create_blog_entry(session, user_id="u1", topic="First topic", company_url="https://example.com")
+            self.blog_id = blog.id
+
+    def _queue(self, count=1, blog_id=None):
+        with self.db.get_session() as session:
+            return [create_blog_job(session, blog_id=blog_id or self.blog_id, payload={"n": n}).id for n in range(count)]
+
+    def _job(self, job_id):
+        with self.db.get_session() as session:
+            job = session.get(BlogJob, job_id)
+            return job.status, job.attempts
+
+    def _claim(self, per_user_limit=None):
+        with self.db.get_session() as session:
+            job = claim_next_blog_job(session, per_user_limit=per_user_limit)
+            return job.id if job else None
+
+
+class TestClaimAndRequeue(BlogJobTestCase):
+    def test_claims_oldest_queued_job_once(self):
+        first, second = self._queue(2)
+
+        self.assertEqual(self._claim(), first)
+        self.assertEqual(self._job(first), ("RUNNING", 1))
+        self.assertEqual(self._claim(), second)
+        self.assertIsNone(self._claim())
+
+    def test_stale_running_jobs_go_back_on_the_queue(self):
+        (job_id,) = self._queue()
+        self._claim()
+
+        with self.db.get_session() as session:
+            self.assertEqual(requeue_stale_blog_jobs(session, older_than=datetime(2000, 1, 1, tzinfo=timezone.utc)), 0)
+        with self.db.get_session() as session:
+            future = datetime.now(timezone.utc) + timedelta(days=1)
+            self.assertEqual(requeue_stale_blog_jobs(session, older_than=future), 1)
+
+        self.assertEqual(self._job(job_id), ("QUEUED", 1))
+        self.assertEqual(self._claim(), job_id)
+        self.assertEqual(self._job(job_id), ("RUNNING", 2))
+
+    def test_per_user_limit_skips_users_at_capacity(self):
+        first, second, third = self._queue(3)
+        with self.db.get_session() as session:
+            other_blog_id = create_blog_entry(session, user_id="u2", topic="Other", company_url="https://example.org").id
+        (other,) = self._queue(blog_id=other_blog_id)
+
+        self.assertEqual([self._claim(per_user_limit=2) for _ in range(3)], [first, second, other])
+        self.assertIsNone(self._claim(per_user_limit=2))
+
+        with self.db.get_session() as session:
+            session.get(BlogJob, first).status = "COMPLETED"
+        self.assertEqual(self._claim(per_user_limit=2), third)
+
+
+class TestSubmitBlogJob(BlogJobTestCase):
+    PAYLOAD = {"user_id": "u1", "company_url": "https://example.com", "topic": "Second topic"}
+
+    def setUp(self):
+        super().setUp()
+        for name, value in (("get_session", self.db.get_session), ("init_db", lambda: None)):
+            patcher = patch.object(services, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _set_status(self, status):
+        with self.db.get_session() as session:
+            session.get(Blog, self.blog_id).status = status
+
+    def _status(self):
+        with self.db.get_session() as session:
+            return session.get(Blog, self.blog_id).status
+
+    def test_resets_an_idle_blog_to_pending(self):
+        self._set_status("COMPLETED")
+        result = services.submit_blog_job(dict(self.PAYLOAD))
+
+        self.assertEqual(result["blog_id"], self.blog_id)
+        self.assertEqual(result["status"], "QUEUED")
+        self.assertEqual(self._status(), "PENDING")
+
+    def test_keeps_a_blog_another_job_is_running(self):
+        self._set_status("RUNNING")
+        services.submit_blog_job(dict(self.PAYLOAD))
+
+        self.assertEqual(self._status(), "RUNNING")
+
+
+if __name__ == "__main__":
+    unittest.main()
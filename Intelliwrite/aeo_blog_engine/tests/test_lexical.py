@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from aeo_blog_engine.knowledge.lexical import BM25Index, CachedLexicalIndex, load_or_build_index, tokenize
+
+PASSAGES = [
+    {"text": "FAQ schema helps answer engines understand question and answer pairs."},
+    {"text": "Keep each direct answer under fifty words."},
+    {"text": "Internal links spread authority between related pages."},
+]
+
+
+class TestTokenize(unittest.TestCase):
+    def test_drops_stopwords_and_folds_plurals(self):
+        self.assertEqual(tokenize("What are the Answers for FAQs?"), ["answer", "faq"])
+        self.assertEqual(tokenize("class"), ["class"])
+
+
+class TestBM25Index(unittest.TestCase):
+    def test_ranks_matching_passages(self):
+        index = BM25Index.build(PASSAGES)
+        results = index.search("direct answers", limit=3)
+
+        self.assertEqual(results[0][0], 1)
+        # Only passages sharing a term get a score
+        self.assertEqual({position for position, _ in results}, {0, 1})
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_no_match_and_empty_index(self):
+        self.assertEqual(BM25Index.build(PASSAGES).search("zebra"), [])
+        self.assertEqual(BM25Index.build([]).search("answer"), [])
+
+    def test_save_and_load_round_trip(self):
+        index = BM25Index.build(PASSAGES, signature="sig")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            index.save(path)
+            loaded = BM25Index.load(path)
+
+        self.assertEqual(loaded.signature, "sig")
+        self.assertEqual(loaded.passages, PASSAGES)
+        self.assertEqual(loaded.search("schema pages"), index.search("schema pages"))
+
+
+class TestLoadOrBuildIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.docs = Path(self._tmp.name, "docs")
+        self.docs.mkdir()
+        self.cache_path = os.path.join(self._tmp.name, "index.npz")
+        (self.docs / "rules.md").write_text("# Rules\nAnswer the question first.", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_passages_carry_file_and_chunk_meta(self):
+        passage = load_or_build_index(self.docs, self.cache_path).passages[0]
+
+        self.assertEqual(passage["name"], "rules.md")
+        self.assertEqual(passage["meta"]["file_path"], str(self.docs / "rules.md"))
+        self.assertEqual(passage["meta"]["heading"], "Rules")
+
+    def test_cached_index_follows_doc_changes(self):
+        cached = CachedLexicalIndex(self.docs, self.cache_path, check_interval=0)
+        first = cached.get()
+        self.assertIs(cached.get(), first)
+        self.assertEqual(first.search("zebra"), [])
+
+        (self.docs / "animals.txt").write_text("Zebra stripes are unique.", encoding="utf-8")
+        self.assertEqual(len(cached.get().search("zebra")), 1)
+
+        (self.docs / "animals.txt").unlink()
+        self.assertEqual(cached.get().search("zebra"), [])
+
+    def test_freshness_check_is_throttled(self):
+        cached = CachedLexicalIndex(self.docs, self.cache_path, check_interval=3600)
+        first = cached.get()
+        (self.docs / "animals.txt").write_text("Zebra stripes are unique.", encoding="utf-8")
+
+        self.assertIs(cached.get(), first)
+        cached.check_interval = 0
+        self.assertEqual(len(cached.get().search("zebra")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
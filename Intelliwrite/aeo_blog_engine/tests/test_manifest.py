@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from aeo_blog_engine.config.settings import Config
+from aeo_blog_engine.knowledge.manifest import IngestManifest, chunk_hash, file_hash, point_id
+
+
+class TestIds(unittest.TestCase):
+    def test_point_ids_are_deterministic(self):
+        content_hash = chunk_hash("Answer first.")
+
+        self.assertEqual(point_id("docs/a.md", content_hash), point_id("docs/a.md", content_hash))
+        self.assertNotEqual(point_id("docs/a.md", content_hash), point_id("docs/b.md", content_hash))
+        self.assertNotEqual(point_id("docs/a.md", content_hash, 0), point_id("docs/a.md", content_hash, 1))
+
+    def test_file_hash_follows_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.md")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write("one")
+            first = file_hash(path)
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write("two")
+
+            self.assertNotEqual(file_hash(path), first)
+
+
+class TestIngestManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "manifest.json")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _saved(self):
+        manifest = IngestManifest("kb", self.path)
+        manifest.set("a.md", "hash-a", [{"id": "p1", "hash": "c1"}, {"id": "p2", "hash": "c2"}])
+        manifest.reconciled = True
+        manifest.save()
+        return manifest
+
+    def test_round_trip(self):
+        self._saved()
+        loaded = IngestManifest("kb", self.path).load()
+
+        self.assertTrue(loaded.loaded)
+        self.assertTrue(loaded.reconciled)
+        self.assertEqual(loaded.get("a.md")["hash"], "hash-a")
+        self.assertEqual(IngestManifest.point_ids(loaded.get("a.md")), ["p1", "p2"])
+        self.assertEqual(IngestManifest.point_ids(loaded.get("missing.md")), [])
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_other_collection_or_chunking_is_ignored(self):
+        self._saved()
+
+        self.assertFalse(IngestManifest("other", self.path).load().loaded)
+        with patch.object(Config, "CHUNK_SIZE", Config.CHUNK_SIZE + 1):
+            self.assertFalse(IngestManifest("kb", self.path).load().loaded)
+
+    def test_missing_or_corrupt_file_starts_empty(self):
+        self.assertFalse(IngestManifest("kb", self.path).load().loaded)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            handle.write("{not json")
+
+        manifest = IngestManifest("kb", self.path).load()
+        self.assertFalse(manifest.loaded)
+        self.assertEqual(manifest.files, {})
+
+    def test_remove_and_reset(self):
+        manifest = self._saved()
+        manifest.remove("a.md")
+        manifest.save()
+
+        with open(self.path, encoding="utf-8") as handle:
+            self.assertEqual(json.load(handle)["files"], {})
+        manifest.reset()
+        self.assertFalse(manifest.loaded)
+        self.assertFalse(manifest.reconciled)
+        self.assertEqual(manifest.files, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
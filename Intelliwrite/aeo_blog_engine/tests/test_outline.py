@@ -0,0 +1,44 @@
+import unittest
+
+from aeo_blog_engine.pipeline.outline import ensure_heading, split_sections
+
+
+class TestSplitSections(unittest.TestCase):
+    def test_inline_h2_labels(self):
+        outline = (
+            "Title Options\n- AEO in 2026\n\n"
+            "- **H2:** What is AEO?\n  - H3: Definition\n  - Q: How is it different from SEO?\n"
+            "- **H2:** How do I start?\n  - H3: Audit your FAQs\n\n"
+            "**Notes for the Writer:** keep it short"
+        )
+        sections = split_sections(outline)
+
+        self.assertEqual([section.heading for section in sections], ["What is AEO?", "How do I start?"])
+        self.assertIn("Definition", sections[0].outline)
+        self.assertNotIn("Audit", sections[0].outline)
+        # The trailing notes block belongs to no section
+        self.assertNotIn("Notes for the Writer", sections[1].outline)
+
+    def test_markdown_headings_skip_meta_blocks(self):
+        outline = "## Blog Outline\n## Why answers win\n### Snippets\n## Measuring results\nTrack citations."
+        sections = split_sections(outline)
+
+        self.assertEqual([section.heading for section in sections], ["Why answers win", "Measuring results"])
+        self.assertEqual(sections[1].outline, "## Measuring results\nTrack citations.")
+
+    def test_no_h2_structure(self):
+        self.assertEqual(split_sections("Just a paragraph of notes."), [])
+        self.assertEqual(split_sections(None), [])
+
+
+class TestEnsureHeading(unittest.TestCase):
+    def test_adds_missing_heading(self):
+        self.assertEqual(ensure_heading("Body.", "What is AEO?"), "## What is AEO?\n\nBody.")
+
+    def test_keeps_h2_and_demotes_h1(self):
+        self.assertEqual(ensure_heading("## Own heading\nBody.", "Ignored"), "## Own heading\nBody.")
+        self.assertEqual(ensure_heading("# Title\nBody.", "Ignored"), "## Title\nBody.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch
+
+from aeo_blog_engine.database.models import Blog
+from aeo_blog_engine.database.repository import (
+    create_blog_entry,
+    get_pipeline_checkpoints,
+    save_pipeline_checkpoint,
+    update_blog_status,
+)
+from aeo_blog_engine.tests import TempDatabase, import_services
+
+services = import_services()
+
+
+class _FakePipeline:
+    """Records what each run was given; fails when `fail` is set."""
+
+    def __init__(self):
+        self.runs = []
+        self.fail = False
+
+    def run(self, topic, on_stage=None, checkpoints=None, profile=None):
+        self.runs.append((topic, checkpoints.load()))
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return f"Blog about {topic}"
+
+
+class TestResumeBlog(unittest.TestCase):
+    def setUp(self):
+        self.db = TempDatabase()
+        self.addCleanup(self.db.close)
+        self.pipeline = _FakePipeline()
+        for name, value in (("get_session", self.db.get_session), ("init_db", lambda: None), ("pipeline", self.pipeline)):
+            patcher = patch.object(services, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        with self.db.get_session() as session:
+            self.blog_id = create_blog_entry(
+                session, user_id="u1", topic="Topic A", company_url="https://example.com"
+            ).id
+            update_blog_status(session, self.blog_id, status="FAILED", topic="Topic B")
+            # Topic A's run failed after planning; Topic B's run got as far as the final stage
+            for topic, stage in (("Topic A", "research"), ("Topic A", "plan"), ("Topic B", "research"), ("Topic B", "finalize")):
+                save_pipeline_checkpoint(session, blog_id=self.blog_id, topic=topic, stage=stage, content=f"{topic} {stage}")
+
+    def _blog(self):
+        with self.db.get_session() as session:
+            blog = session.get(Blog, self.blog_id)
+            checkpoints = get_pipeline_checkpoints(session, blog_id=self.blog_id)
+            return blog.status, sorted({checkpoint.topic for checkpoint in checkpoints})
+
+    def test_resumes_the_unfinished_topic_from_its_checkpoints(self):
+        services.resume_blog(self.blog_id, profile="standard")
+
+        self.assertEqual(self.pipeline.runs, [("Topic A", {"research": "Topic A research", "plan": "Topic A plan"})])
+        self.assertEqual(self._blog(), ("COMPLETED", ["Topic B"]))
+
+    def test_failed_run_stays_resumable_after_another_topic_completes(self):
+        services.resume_blog(self.blog_id, profile="standard", topic="Topic B")
+        self.assertEqual(self._blog(), ("COMPLETED", ["Topic A"]))
+
+        services.resume_blog(self.blog_id, profile="standard")
+        self.assertEqual([topic for topic, _ in self.pipeline.runs], ["Topic B", "Topic A"])
+        self.assertEqual(self._blog(), ("COMPLETED", []))
+
+        with self.assertRaises(services.BlogNotResumable):
+            services.resume_blog(self.blog_id, profile="standard")
+
+    def test_running_blog_or_unknown_topic_is_refused(self):
+        with self.assertRaises(ValueError):
+            services.resume_blog(self.blog_id, topic="Topic C")
+        with self.db.get_session() as session:
+            update_blog_status(session, self.blog_id, status="RUNNING")
+        with self.assertRaises(services.BlogNotResumable):
+            services.resume_blog(self.blog_id)
+        self.assertEqual(self.pipeline.runs, [])
+
+    def test_failed_resume_marks_the_blog_failed_and_keeps_checkpoints(self):
+        self.pipeline.fail = True
+        with self.assertRaises(RuntimeError):
+            services.resume_blog(self.blog_id, profile="standard")
+
+        self.assertEqual(self._blog(), ("FAILED", ["Topic A", "Topic B"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
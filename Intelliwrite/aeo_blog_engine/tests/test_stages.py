@@ -0,0 +1,40 @@
+import unittest
+
+from aeo_blog_engine.pipeline.stages import PROFILES, Stage, execution_waves, get_profile
+
+
+def _names(waves):
+    return [[stage.name for stage in wave] for wave in waves]
+
+
+class TestExecutionWaves(unittest.TestCase):
+    def test_standard_profile_is_a_chain(self):
+        self.assertEqual(
+            _names(execution_waves(PROFILES["standard"])),
+            [["research"], ["plan"], ["write"], ["optimize"], ["finalize"]],
+        )
+
+    def test_independent_stages_share_a_wave(self):
+        self.assertEqual(
+            _names(execution_waves(PROFILES["thorough"])),
+            [["research"], ["plan"], ["write"], ["optimize", "qa"], ["finalize"]],
+        )
+
+    def test_unknown_dependency_is_rejected(self):
+        with self.assertRaises(ValueError):
+            execution_waves((Stage("write", ("plan",)),))
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaises(ValueError):
+            execution_waves((Stage("a", ("b",)), Stage("b", ("a",))))
+
+
+class TestGetProfile(unittest.TestCase):
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_profile("nonexistent")
+        self.assertIs(get_profile("fast"), PROFILES["fast"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from aeo_blog_engine.knowledge.vector_store import LocalVectorStore
+
+
+def _payload(content, **meta):
+    return {"content": content, "name": "doc.md", "meta_data": meta}
+
+
+def _write_points(path, prefix, count):
+    # Runs in a separate process
+    store = LocalVectorStore(path)
+    for i in range(count):
+        store.write(upserts={f"{prefix}{i}": ([1.0, float(i)], _payload(f"{prefix}{i}"))})
+
+
+class TestLocalVectorStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = self._tmp.name
+        self.store = LocalVectorStore(self.path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _current(self):
+        with open(os.path.join(self.path, "CURRENT"), encoding="utf-8") as handle:
+            return handle.read()
+
+    def test_empty_store(self):
+        self.assertFalse(self.store.exists())
+        self.assertEqual(self.store.search_vector([1.0, 0.0]), [])
+
+    def test_write_and_search(self):
+        self.store.write(upserts={
+            "a": ([1.0, 0.0], _payload("east", page=1)),
+            "b": ([0.0, 2.0], _payload("north", page=2)),
+            "c": ([1.0, 1.0], _payload("north-east", page=1)),
+        })
+        results = self.store.search_vector([0.0, 1.0], limit=2)
+
+        self.assertEqual([document.content for document in results], ["north", "north-east"])
+        self.assertAlmostEqual(results[0].reranking_score, 1.0, places=5)
+        self.assertEqual(results[0].id, "b")
+        filtered = self.store.search_vector([0.0, 1.0], limit=2, filters={"page": 1})
+        self.assertEqual([document.content for document in filtered], ["north-east", "east"])
+
+    def test_upsert_payload_update_and_delete(self):
+        self.store.write(upserts={"a": ([1.0, 0.0], _payload("old")), "b": ([0.0, 1.0], _payload("keep"))})
+        self.store.write(upserts={"a": ([0.0, 1.0], _payload("new"))})
+        self.store.write(payloads={"b": _payload("renamed")})
+        self.store.write(deletes={"a"})
+
+        self.assertEqual(self.store.ids(), ["b"])
+        self.assertEqual(self.store.search_vector([0.0, 1.0])[0].content, "renamed")
+
+    def test_batch_writes_one_version(self):
+        with self.store.batch():
+            self.store.write(upserts={"a": ([1.0, 0.0], _payload("a"))})
+            self.store.write(upserts={"b": ([0.0, 1.0], _payload("b"))})
+            self.store.write(payloads={"a": _payload("a2")})
+            self.store.write(deletes={"b"})
+            self.assertFalse(os.path.exists(os.path.join(self.path, "CURRENT")))
+
+        self.assertEqual(self._current(), "v1")
+        self.assertEqual(self.store.ids(), ["a"])
+        self.assertEqual(self.store.search_vector([1.0, 0.0])[0].content, "a2")
+
+    def test_other_instances_see_new_versions(self):
+        reader = LocalVectorStore(self.path)
+        self.store.write(upserts={"a": ([1.0, 0.0], _payload("a"))})
+        self.assertEqual(len(reader), 1)
+
+        self.store.write(upserts={"b": ([0.0, 1.0], _payload("b"))})
+        self.assertEqual(reader.search_vector([0.0, 1.0])[0].content, "b")
+        self.assertEqual(self._current(), "v2")
+
+    def test_async_search(self):
+        self.store.embedder = SimpleNamespace(get_embedding=lambda text: [0.0, 1.0])
+        self.store.write(upserts={"a": ([1.0, 0.0], _payload("a")), "b": ([0.0, 1.0], _payload("b"))})
+
+        results = asyncio.run(self.store.async_search("north", limit=1))
+        self.assertEqual([document.content for document in results], ["b"])
+
+    def test_writers_in_several_processes_keep_every_write(self):
+        context = multiprocessing.get_context("spawn")
+        writers = [context.Process(target=_write_points, args=(self.path, prefix, 5)) for prefix in "xyz"]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join(60)
+            self.assertEqual(writer.exitcode, 0)
+
+        self.assertEqual(sorted(self.store.ids()), sorted(f"{prefix}{i}" for prefix in "xyz" for i in range(5)))
+        self.assertEqual(self._current(), "v15")
+
+
+if __name__ == "__main__":
+    unittest.main()
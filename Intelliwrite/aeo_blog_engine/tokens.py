@@ -0,0 +1,8 @@
+import math
+
+# Rough Gemini tokenizer ratio for English prose; good enough for budgeting and stats
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)